@@ -7,7 +7,7 @@ from pathlib import Path
 
 import pytest
 
-from utils.cache import DemoCache, GlobalCache
+from utils.cache import DemoCache, GlobalCache, link_or_copy
 
 
 class TestDemoCache:
@@ -98,6 +98,42 @@ class TestDemoCache:
         # (this is by design - we use text hash only)
         assert path1 == path2
 
+    def test_get_audio_many(self, cache):
+        """Should classify hits and misses in one call."""
+        cache.cache_audio("Hello", b"audio", voice_id="v1", duration=1.5)
+
+        found = cache.get_audio_many([("Hello", "v1"), ("Missing", "v1")])
+
+        assert found[("Hello", "v1")]["path"] == cache.get_audio("Hello", "v1")
+        assert found[("Hello", "v1")]["duration"] == 1.5
+        assert found[("Missing", "v1")] is None
+
+    def test_link_from_path(self, cache, tmp_path):
+        """Should cache an existing file without copying its bytes."""
+        src = tmp_path / "generated.mp3"
+        src.write_bytes(b"audio")
+
+        path = cache.link_from_path("Hello", src, voice_id="v1", duration=2.0)
+
+        assert path.stat().st_ino == src.stat().st_ino
+        assert cache.get_audio("Hello", "v1") == path
+        assert cache.get_audio_many([("Hello", "v1")])[("Hello", "v1")]["duration"] == 2.0
+
+    def test_link_from_path_concurrently(self, cache, tmp_path):
+        """Should record entries from many threads without losing any."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        def link(i):
+            src = tmp_path / f"generated_{i}.mp3"
+            src.write_bytes(b"audio %d" % i)
+            cache.link_from_path(f"Text {i}", src, voice_id="v1", duration=1.0)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(link, range(200)))
+
+        on_disk = json.loads(cache._metadata_path.read_text())
+        assert len(on_disk["entries"]) == 200
+
     # Key-value cache tests
 
     def test_get_not_set(self, cache):
@@ -222,3 +258,78 @@ class TestGlobalCache:
 
         # Should be expired
         assert global_cache.get_voice_samples() is None
+
+
+class TestLinkOrCopy:
+    """Tests for link_or_copy helper."""
+
+    def test_regenerating_output_keeps_cached_audio(self, tmp_path):
+        """Writing new audio to a linked output should not change the cache."""
+        from unittest.mock import MagicMock
+
+        from utils.elevenlabs_client import ElevenLabsClient
+
+        cache = DemoCache("test-demo", base_path=str(tmp_path))
+        output = tmp_path / "audio_scene_1.mp3"
+        output.write_bytes(b"old narration")
+        cached = cache.link_from_path("Old text", output)
+
+        session = MagicMock()
+        session.post.return_value.content = b"new narration"
+        client = ElevenLabsClient(api_key="key", voice_id="voice", session=session)
+        client.generate_audio("New text", str(output))
+
+        assert output.read_bytes() == b"new narration"
+        assert cached.read_bytes() == b"old narration"
+
+    def test_recaching_audio_keeps_linked_output(self, tmp_path):
+        """Re-caching a key should not write through to a linked output."""
+        cache = DemoCache("test-demo", base_path=str(tmp_path))
+        output = tmp_path / "audio_scene_1.mp3"
+        output.write_bytes(b"delivered narration")
+        cached = cache.link_from_path("Same text", output)
+
+        cache.cache_audio("Same text", b"regenerated narration")
+
+        assert cached.read_bytes() == b"regenerated narration"
+        assert output.read_bytes() == b"delivered narration"
+        assert not list(cache.cache_dir.glob("*.tmp"))
+
+    def test_links_on_same_filesystem(self, tmp_path):
+        """Should hard-link when possible."""
+        src = tmp_path / "src.mp3"
+        src.write_bytes(b"audio")
+        dst = tmp_path / "dst.mp3"
+
+        link_or_copy(src, dst)
+
+        assert dst.read_bytes() == b"audio"
+        assert dst.stat().st_ino == src.stat().st_ino
+
+    def test_replaces_existing_destination(self, tmp_path):
+        """Should replace dst instead of writing through it."""
+        src = tmp_path / "src.mp3"
+        src.write_bytes(b"new")
+        dst = tmp_path / "dst.mp3"
+        dst.write_bytes(b"old")
+
+        link_or_copy(src, dst)
+
+        assert dst.read_bytes() == b"new"
+
+    def test_falls_back_to_copy(self, tmp_path, monkeypatch):
+        """Should copy when linking fails."""
+        import os
+
+        def fail_link(*args):
+            raise OSError("cross-device link")
+
+        monkeypatch.setattr(os, "link", fail_link)
+        src = tmp_path / "src.mp3"
+        src.write_bytes(b"audio")
+        dst = tmp_path / "dst.mp3"
+
+        link_or_copy(src, dst)
+
+        assert dst.read_bytes() == b"audio"
+        assert dst.stat().st_ino != src.stat().st_ino
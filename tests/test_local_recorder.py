@@ -7,10 +7,14 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from utils.local_recorder import (
+    _HIGHLIGHT_JS,
     LocalRecorder,
     RecordingConfig,
     RecordingResult,
+    _find_first_file,
+    _find_scene_screenshots,
     convert_webm_to_mp4,
+    convert_webms_to_mp4_batch,
 )
 
 
@@ -23,6 +27,8 @@ class TestRecordingConfig:
 
         assert config.viewport_width == 1920
         assert config.viewport_height == 1080
+        assert config.video_width == 1280
+        assert config.video_height == 720
         assert config.frame_rate == 30
         assert config.headless is True
         assert config.timeout == 30000
@@ -119,8 +125,28 @@ class TestLocalRecorder:
             "url": "http://localhost:3000",
         })
 
-        mock_page.goto.assert_called_once_with("http://localhost:3000")
-        mock_page.wait_for_load_state.assert_called_once_with("networkidle")
+        mock_page.goto.assert_called_once_with(
+            "http://localhost:3000",
+            wait_until="domcontentloaded",
+            timeout=30000,
+        )
+        mock_page.wait_for_load_state.assert_not_called()
+
+    def test_execute_action_goto_wait_until(self, recorder):
+        """Should let the action opt into a different load state."""
+        mock_page = MagicMock()
+
+        recorder._execute_action(mock_page, {
+            "type": "goto",
+            "url": "http://localhost:3000",
+            "wait_until": "networkidle",
+        })
+
+        mock_page.goto.assert_called_once_with(
+            "http://localhost:3000",
+            wait_until="networkidle",
+            timeout=30000,
+        )
 
     def test_execute_action_click(self, recorder):
         """Should handle click action."""
@@ -228,9 +254,140 @@ class TestLocalRecorder:
             "duration": 2000,
         })
 
-        mock_page.evaluate.assert_called_once()
+        mock_page.evaluate.assert_called_once_with(
+            _HIGHLIGHT_JS, [".important", 2000]
+        )
+        mock_page.wait_for_timeout.assert_not_called()
+
+    def test_execute_action_highlight_wait_after(self, recorder):
+        """Should block for the highlight duration when wait_after is set."""
+        mock_page = MagicMock()
+
+        recorder._execute_action(mock_page, {
+            "type": "highlight",
+            "selector": ".important",
+            "duration": 2000,
+            "wait_after": True,
+        })
+
         mock_page.wait_for_timeout.assert_called_once_with(2000)
 
+    def test_execute_action_accepts_action_key(self, recorder):
+        """Should dispatch on the legacy "action" key."""
+        mock_page = MagicMock()
+
+        recorder._execute_action(mock_page, {
+            "action": "click",
+            "selector": "a.link",
+        })
+
+        mock_page.click.assert_called_once_with("a.link")
+
+    def test_execute_action_unknown_is_ignored(self, recorder):
+        """Should ignore unknown action types."""
+        mock_page = MagicMock()
+
+        recorder._execute_action(mock_page, {"type": "teleport"})
+
+        assert mock_page.method_calls == []
+
+
+class TestScriptLogs:
+    """Tests for streaming script output to a log file."""
+
+    @pytest.fixture
+    def recorder(self):
+        """Create a recorder that skips the Playwright install check."""
+        recorder = LocalRecorder()
+        recorder._ensure_playwright_installed = MagicMock(return_value=True)
+        recorder._get_video_duration = MagicMock(return_value=12.0)
+        return recorder
+
+    def test_record_script_writes_log_file(self, recorder, tmp_path):
+        """Should stream output to run.log and keep only its tail."""
+        def fake_run(cmd, stdout, **kwargs):
+            stdout.write(b"".join(b"line %d\n" % i for i in range(500)))
+            (tmp_path / "recordings" / "abc.webm").write_bytes(b"")
+            return MagicMock(returncode=0)
+
+        with patch("subprocess.run", side_effect=fake_run):
+            result = recorder.record_script(tmp_path / "script.py", tmp_path)
+
+        assert result.status == "success"
+        assert result.log_path == tmp_path / "run.log"
+        assert result.video_path == tmp_path / "demo_recording.webm"
+        assert result.logs.splitlines()[-1] == "line 499"
+        assert len(result.logs.splitlines()) == 200
+
+    def test_record_script_keeps_webm_by_default(self, recorder, tmp_path):
+        """Should not transcode to MP4 unless emit_mp4 is set."""
+        def fake_run(cmd, stdout, **kwargs):
+            (tmp_path / "recordings" / "abc.webm").write_bytes(b"")
+            return MagicMock(returncode=0)
+
+        with patch("subprocess.run", side_effect=fake_run) as mock_run:
+            result = recorder.record_script(tmp_path / "script.py", tmp_path)
+
+        assert result.video_path.suffix == ".webm"
+        assert mock_run.call_count == 1
+
+    def test_record_script_emit_mp4(self, recorder, tmp_path):
+        """Should transcode to MP4 when emit_mp4 is set."""
+        recorder.config.emit_mp4 = True
+
+        def fake_run(cmd, stdout=None, **kwargs):
+            if cmd[0] != "ffmpeg":
+                (tmp_path / "recordings" / "abc.webm").write_bytes(b"")
+            return MagicMock(returncode=0)
+
+        with patch("subprocess.run", side_effect=fake_run) as mock_run:
+            result = recorder.record_script(tmp_path / "script.py", tmp_path)
+
+        assert result.video_path == tmp_path / "demo_recording.mp4"
+        assert mock_run.call_args[0][0][0] == "ffmpeg"
+
+    def test_validate_script_failure_uses_log_tail(self, recorder, tmp_path):
+        """Should report the end of the log as the error on failure."""
+        def fake_run(cmd, stdout, **kwargs):
+            stdout.write(b"Traceback...\nTimeoutError: boom\n")
+            return MagicMock(returncode=1)
+
+        script_path = tmp_path / "script.py"
+        with patch("subprocess.run", side_effect=fake_run):
+            result = recorder.validate_script(script_path, "http://localhost")
+
+        assert result.status == "failed"
+        assert "TimeoutError: boom" in result.error
+        assert result.log_path == tmp_path / "validate.log"
+
+
+class TestDirectoryScan:
+    """Tests for the scandir-based file lookup helpers."""
+
+    def test_find_first_file(self, tmp_path):
+        """Should return a matching file and ignore others."""
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "video.webm").write_bytes(b"")
+
+        assert _find_first_file(tmp_path, ".webm") == tmp_path / "video.webm"
+
+    def test_find_first_file_missing(self, tmp_path):
+        """Should return None when nothing matches."""
+        (tmp_path / "notes.txt").write_text("x")
+
+        assert _find_first_file(tmp_path, ".webm") is None
+
+    def test_find_scene_screenshots(self, tmp_path):
+        """Should only pick up scene_*.png files."""
+        (tmp_path / "scene_1.png").write_bytes(b"")
+        (tmp_path / "scene_2.png").write_bytes(b"")
+        (tmp_path / "other.png").write_bytes(b"")
+        (tmp_path / "scene_3.jpg").write_bytes(b"")
+
+        found = sorted(p.name for p in _find_scene_screenshots(tmp_path))
+
+        assert found == ["scene_1.png", "scene_2.png"]
+
 
 class TestConvertWebmToMp4:
     """Tests for convert_webm_to_mp4 function."""
@@ -273,3 +430,38 @@ class TestConvertWebmToMp4:
 
         call_args = mock_run.call_args[0][0]
         assert "23" in call_args
+
+
+class TestConvertWebmsToMp4Batch:
+    """Tests for convert_webms_to_mp4_batch function."""
+
+    @patch("subprocess.run")
+    def test_single_ffmpeg_process(self, mock_run):
+        """Should convert all inputs with one ffmpeg call."""
+        mock_run.return_value = MagicMock(returncode=0)
+
+        inputs = [Path("/tmp/a.webm"), Path("/tmp/b.webm"), Path("/tmp/c.webm")]
+        result = convert_webms_to_mp4_batch(inputs)
+
+        assert result == [Path("/tmp/a.mp4"), Path("/tmp/b.mp4"), Path("/tmp/c.mp4")]
+        mock_run.assert_called_once()
+
+        call_args = mock_run.call_args[0][0]
+        assert call_args.count("-i") == 3
+        assert "2:v" in call_args
+        assert call_args[-1] == "/tmp/c.mp4"
+
+    @patch("subprocess.run")
+    def test_custom_output_dir(self, mock_run, tmp_path):
+        """Should place outputs in the given directory."""
+        mock_run.return_value = MagicMock(returncode=0)
+
+        result = convert_webms_to_mp4_batch([Path("/tmp/a.webm")], out_dir=tmp_path)
+
+        assert result == [tmp_path / "a.mp4"]
+
+    @patch("subprocess.run")
+    def test_empty_input(self, mock_run):
+        """Should not start ffmpeg for an empty batch."""
+        assert convert_webms_to_mp4_batch([]) == []
+        mock_run.assert_not_called()
@@ -84,6 +84,22 @@ class TestManifest:
         assert 1 not in manifest.data["failed_stages"]
         assert 1 in manifest.data["completed_stages"]
 
+    def test_stage_lists_saved_sorted(self, manifest):
+        """Stage sets should be written to disk as sorted, deduplicated lists."""
+        manifest.initialize()
+        manifest.complete_stage(3, {})
+        manifest.complete_stage(1, {})
+        manifest.complete_stage(3, {})
+
+        with open(manifest.manifest_path) as f:
+            on_disk = json.load(f)
+
+        assert on_disk["completed_stages"] == [1, 3]
+
+        manifest2 = Manifest("test-demo", base_path=str(manifest.base_path))
+        assert manifest2.is_stage_completed(3)
+        assert not manifest2.is_stage_completed(2)
+
     def test_fail_stage(self, manifest):
         """fail_stage should record failure details."""
         manifest.initialize()
@@ -104,6 +120,88 @@ class TestManifest:
         assert error["error_type"] == "ElementNotFound"
         assert error["suggested_fix"] == "Update selector"
 
+    def test_fail_stage_saves_json(self, manifest):
+        """fail_stage should be visible to readers of manifest.json."""
+        manifest.initialize()
+
+        manifest.fail_stage(2, "TimeoutError", "Timed out")
+
+        with open(manifest.manifest_path) as f:
+            on_disk = json.load(f)
+        assert on_disk["failed_stages"] == [2]
+        assert on_disk["errors"][0]["error_type"] == "TimeoutError"
+        assert not manifest.events_path.exists()
+
+    def test_brand_voice_refresh_appends_event(self, manifest):
+        """update_brand_voice_cache should append to the event log."""
+        manifest.initialize()
+        before = manifest.manifest_path.read_text()
+
+        manifest.update_brand_voice_cache("2025-01-01T00:00:00Z")
+
+        assert manifest.manifest_path.read_text() == before
+        lines = manifest.events_path.read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["refreshed_at"] == "2025-01-01T00:00:00Z"
+
+    def test_load_replays_events(self, manifest):
+        """load should apply pending events and fold them into the JSON."""
+        manifest.initialize()
+        manifest.update_brand_voice_cache("2025-01-01T00:00:00Z")
+
+        manifest2 = Manifest("test-demo", base_path=str(manifest.base_path))
+        data = manifest2.load()
+
+        assert data["brand_voice_cache"]["last_refreshed"] == "2025-01-01T00:00:00Z"
+        assert not manifest.events_path.exists()
+
+        with open(manifest.manifest_path) as f:
+            on_disk = json.load(f)
+        assert on_disk["brand_voice_cache"]["last_refreshed"] == "2025-01-01T00:00:00Z"
+
+    def test_load_replays_events_after_direct_rewrite(self, manifest):
+        """load should replay the event log even if manifest.json is newer."""
+        import os
+
+        manifest.initialize()
+        manifest.update_brand_voice_cache("2025-01-01T00:00:00Z")
+
+        # An agent rewrites manifest.json directly after the event was logged
+        data = json.loads(manifest.manifest_path.read_text())
+        data["custom"] = True
+        manifest.manifest_path.write_text(json.dumps(data))
+        events_mtime = manifest.events_path.stat().st_mtime_ns
+        os.utime(manifest.manifest_path, ns=(events_mtime + 10**9, events_mtime + 10**9))
+
+        manifest2 = Manifest("test-demo", base_path=str(manifest.base_path))
+        loaded = manifest2.load()
+
+        assert loaded["custom"] is True
+        assert loaded["brand_voice_cache"]["last_refreshed"] == "2025-01-01T00:00:00Z"
+
+    def test_save_clears_event_log(self, manifest):
+        """A full save should include logged events exactly once."""
+        manifest.initialize()
+        manifest.update_brand_voice_cache("2025-01-01T00:00:00Z")
+        manifest.fail_stage(1, "TestError", "boom")
+        manifest.complete_stage(2, {})
+
+        assert not manifest.events_path.exists()
+
+        manifest2 = Manifest("test-demo", base_path=str(manifest.base_path))
+        assert len(manifest2.load()["errors"]) == 1
+
+    def test_clear_failed_stage(self, manifest):
+        """clear_failed_stage should remove the stage from failed_stages on disk."""
+        manifest.initialize()
+        manifest.fail_stage(2, "TimeoutError", "Timed out")
+
+        manifest.clear_failed_stage(2)
+
+        manifest2 = Manifest("test-demo", base_path=str(manifest.base_path))
+        assert manifest2.load()["failed_stages"] == []
+        assert manifest.data["failed_stages"] == []
+
     def test_get_stage_output(self, manifest):
         """get_stage_output should return stage outputs."""
         manifest.initialize()
@@ -1,5 +1,6 @@
 """Tests for parallel audio generation utilities."""
 
+import asyncio
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -9,7 +10,9 @@ from utils.parallel_audio import (
     AudioResult,
     AudioSegment,
     ParallelAudioGenerator,
+    _split_audio_on_silence,
     generate_audio_parallel,
+    generate_audio_parallel_async,
 )
 
 
@@ -72,6 +75,16 @@ class TestAudioResult:
         assert d["status"] == "success"
         assert d["path"] == "/tmp/audio_1.mp3"
 
+    def test_is_immutable(self):
+        """Results should be frozen and slotted."""
+        import dataclasses
+
+        result = AudioResult(scene_id=1, status="success")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.status = "failed"
+        assert not hasattr(result, "__dict__")
+
 
 class TestParallelAudioGenerator:
     """Tests for ParallelAudioGenerator class."""
@@ -156,6 +169,9 @@ class TestParallelAudioGenerator:
 
         results = generator.generate_segments(segments)
 
+        # All workers share one client
+        mock_client_class.assert_called_once()
+
         assert len(results) == 3
         # Results should be sorted by scene_id
         assert results[0].scene_id == 1
@@ -183,6 +199,341 @@ class TestParallelAudioGenerator:
         assert progress_calls[0][1] == 1  # total
 
 
+class TestResultOrder:
+    """Tests for the order of returned results."""
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_results_in_scene_order(self, mock_client_class, tmp_path):
+        """Results should come back sorted by scene_id, including failures."""
+        mock_client = MagicMock()
+
+        def generate(text, output_path):
+            if text == "Text 2":
+                raise RuntimeError("boom")
+            return {"duration": 1.0}
+
+        mock_client.generate_audio.side_effect = generate
+        mock_client_class.return_value = mock_client
+
+        generator = ParallelAudioGenerator(
+            api_key="key", voice_id="voice", max_workers=3, use_cache=False
+        )
+        segments = [
+            AudioSegment(scene_id=i, text=f"Text {i}", output_path=tmp_path / f"{i}.mp3")
+            for i in (4, 2, 1, 3)
+        ]
+
+        results = generator.generate_segments(segments)
+
+        assert [r.scene_id for r in results] == [1, 2, 3, 4]
+        assert results[1].status == "failed"
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_longest_segments_start_first(self, mock_client_class, tmp_path):
+        """Long clips should be requested before short ones so they don't finish last."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 1.0}
+        mock_client_class.return_value = mock_client
+
+        generator = ParallelAudioGenerator(
+            api_key="key", voice_id="voice", max_workers=1, use_cache=False
+        )
+        texts = ["Hi", "A much longer narration line", "Medium line"]
+        segments = [
+            AudioSegment(scene_id=i, text=text, output_path=tmp_path / f"{i}.mp3")
+            for i, text in enumerate(texts)
+        ]
+
+        results = generator.generate_segments(segments)
+
+        requested = [c.kwargs["text"] for c in mock_client.generate_audio.call_args_list]
+        assert requested == sorted(texts, key=len, reverse=True)
+        assert [r.scene_id for r in results] == [0, 1, 2]
+
+
+class TestCacheWrite:
+    """Tests for caching freshly generated audio."""
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_links_generated_file_into_cache(self, mock_client_class, tmp_path):
+        """Should cache the generated file by path, not by re-reading it."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 3.0}
+        mock_client_class.return_value = mock_client
+
+        generator = ParallelAudioGenerator(api_key="key", voice_id="voice", use_cache=False)
+        generator.use_cache = True
+        generator.cache = MagicMock()
+        generator.cache.get_audio_many.side_effect = lambda keys: dict.fromkeys(keys)
+
+        segments = [AudioSegment(scene_id=1, text="Hi", output_path=tmp_path / "a.mp3")]
+        generator.generate_segments(segments)
+
+        generator.cache.link_from_path.assert_called_once_with(
+            "Hi", tmp_path / "a.mp3", "voice", 3.0
+        )
+        generator.cache.cache_audio.assert_not_called()
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_cache_write_failure_does_not_fail_segment(self, mock_client_class, tmp_path):
+        """Background cache errors should be logged, not reported as failures."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 3.0}
+        mock_client_class.return_value = mock_client
+
+        generator = ParallelAudioGenerator(api_key="key", voice_id="voice", use_cache=False)
+        generator.use_cache = True
+        generator.cache = MagicMock()
+        generator.cache.get_audio_many.side_effect = lambda keys: dict.fromkeys(keys)
+        generator.cache.link_from_path.side_effect = OSError("disk full")
+
+        segments = [AudioSegment(scene_id=1, text="Hi", output_path=tmp_path / "a.mp3")]
+        results = generator.generate_segments(segments)
+
+        assert results[0].status == "success"
+
+
+class TestCacheHits:
+    """Tests for serving segments from the audio cache."""
+
+    @pytest.fixture
+    def generator(self, tmp_path):
+        """Create a generator backed by a real cache."""
+        from utils.cache import DemoCache
+
+        generator = ParallelAudioGenerator(api_key="key", voice_id="voice", use_cache=False)
+        generator.use_cache = True
+        generator.cache = DemoCache("demo", base_path=str(tmp_path))
+        return generator
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_cached_segments_skip_generation(self, mock_client_class, generator, tmp_path):
+        """Should copy cached audio and only generate misses."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 2.0}
+        mock_client_class.return_value = mock_client
+        generator.cache.cache_audio("Cached", b"old-audio", "voice", 4.0)
+
+        segments = [
+            AudioSegment(scene_id=1, text="Cached", output_path=tmp_path / "out" / "1.mp3"),
+            AudioSegment(scene_id=2, text="Fresh", output_path=tmp_path / "out" / "2.mp3"),
+        ]
+        results = generator.generate_segments(segments)
+
+        assert results[0].status == "cached"
+        assert results[0].duration == 4.0
+        assert (tmp_path / "out" / "1.mp3").read_bytes() == b"old-audio"
+        assert results[1].status == "success"
+        assert mock_client.generate_audio.call_count == 1
+
+
+class TestBatching:
+    """Tests for batching several segments into one request."""
+
+    SILENCEDETECT_STDERR = (
+        "  Duration: 00:00:10.00, start: 0.000000, bitrate: 128 kb/s\n"
+        "[silencedetect @ 0x1] silence_start: 2.5\n"
+        "[silencedetect @ 0x1] silence_end: 4 | silence_duration: 1.5\n"
+        "[silencedetect @ 0x1] silence_start: 5.0\n"
+        "[silencedetect @ 0x1] silence_end: 5.2 | silence_duration: 0.2\n"
+        "[silencedetect @ 0x1] silence_start: 7\n"
+        "[silencedetect @ 0x1] silence_end: 8.5 | silence_duration: 1.5\n"
+    )
+
+    @patch("utils.parallel_audio.subprocess.run")
+    def test_split_on_longest_silences(self, mock_run, tmp_path):
+        """Should cut at the longest pauses and return part durations."""
+        mock_run.return_value = MagicMock(stderr=self.SILENCEDETECT_STDERR)
+        outputs = [tmp_path / f"{i}.mp3" for i in range(3)]
+
+        durations = _split_audio_on_silence(tmp_path / "batch.mp3", outputs)
+
+        assert durations == pytest.approx([2.5, 3.0, 1.5])
+        cut_cmd = mock_run.call_args_list[1][0][0]
+        assert cut_cmd.count("-ss") == 3
+        assert str(outputs[2]) == cut_cmd[-1]
+
+    @patch("utils.parallel_audio.subprocess.run")
+    def test_split_requires_enough_silences(self, mock_run, tmp_path):
+        """Should refuse to split when pauses are missing."""
+        mock_run.return_value = MagicMock(stderr=self.SILENCEDETECT_STDERR)
+        outputs = [tmp_path / f"{i}.mp3" for i in range(5)]
+
+        with pytest.raises(ValueError):
+            _split_audio_on_silence(tmp_path / "batch.mp3", outputs)
+
+    @patch("utils.parallel_audio._split_audio_on_silence")
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_batched_generation(self, mock_client_class, mock_split, tmp_path):
+        """Should send one request per batch."""
+        mock_client = MagicMock()
+        mock_client_class.return_value = mock_client
+
+        def fake_split(batch_path, output_paths):
+            for path in output_paths:
+                path.write_bytes(b"part")
+            return [1.0] * len(output_paths)
+
+        mock_split.side_effect = fake_split
+
+        generator = ParallelAudioGenerator(
+            api_key="key", voice_id="voice", use_cache=False, batch_size=2
+        )
+        segments = [
+            AudioSegment(scene_id=i, text=f"Text {i}", output_path=tmp_path / f"{i}.mp3")
+            for i in range(1, 4)
+        ]
+        progress = []
+        results = generator.generate_segments(segments, lambda c, t: progress.append(c))
+
+        assert [r.scene_id for r in results] == [1, 2, 3]
+        assert all(r.status == "success" for r in results)
+        assert mock_client.generate_audio.call_count == 2
+        texts = [c[1]["text"] for c in mock_client.generate_audio.call_args_list]
+        assert any("Text 1" in t and "<break" in t and "Text 2" in t for t in texts)
+        assert progress[-1] == 3
+
+    @patch("utils.parallel_audio._split_audio_on_silence")
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_batch_falls_back_to_single_requests(self, mock_client_class, mock_split, tmp_path):
+        """Should generate individually when the split fails."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 1.0}
+        mock_client_class.return_value = mock_client
+        mock_split.side_effect = ValueError("no pauses")
+
+        generator = ParallelAudioGenerator(
+            api_key="key", voice_id="voice", use_cache=False, batch_size=2
+        )
+        segments = [
+            AudioSegment(scene_id=i, text=f"Text {i}", output_path=tmp_path / f"{i}.mp3")
+            for i in range(1, 3)
+        ]
+        results = generator.generate_segments(segments)
+
+        assert all(r.status == "success" for r in results)
+        assert mock_client.generate_audio.call_count == 3
+
+
+class TestClientLifecycle:
+    """Tests for closing the shared ElevenLabs client."""
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_context_manager_closes_client(self, mock_client_class, tmp_path):
+        """Leaving the context should close the shared client once."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 1.0}
+        mock_client_class.return_value = mock_client
+
+        with ParallelAudioGenerator(api_key="key", voice_id="voice", use_cache=False) as generator:
+            generator.generate_segments([
+                AudioSegment(scene_id=i, text=f"Text {i}", output_path=tmp_path / f"{i}.mp3")
+                for i in range(3)
+            ])
+
+        mock_client_class.assert_called_once()
+        mock_client.close.assert_called_once()
+
+    def test_close_without_client(self):
+        """Closing before any request should be a no-op."""
+        generator = ParallelAudioGenerator(use_cache=False)
+        generator.close()
+
+
+class TestAsyncGeneration:
+    """Tests for the asyncio generation path."""
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_shares_one_client(self, mock_client_class, tmp_path):
+        """Should build a single client for all segments."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 2.0}
+        mock_client_class.return_value = mock_client
+
+        generator = ParallelAudioGenerator(
+            api_key="key", voice_id="voice", max_workers=2, use_cache=False
+        )
+        segments = [
+            AudioSegment(scene_id=i, text=f"Text {i}", output_path=tmp_path / f"{i}.mp3")
+            for i in (3, 1, 2)
+        ]
+
+        results = asyncio.run(generator.agenerate_segments(segments))
+
+        assert [r.scene_id for r in results] == [1, 2, 3]
+        assert all(r.status == "success" for r in results)
+        mock_client_class.assert_called_once()
+        assert mock_client.generate_audio.call_count == 3
+
+    def test_without_credentials_fails_segments(self, tmp_path):
+        """Should report failures instead of raising without credentials."""
+        generator = ParallelAudioGenerator(use_cache=False)
+        segments = [AudioSegment(scene_id=1, text="Hi", output_path=tmp_path / "a.mp3")]
+
+        results = asyncio.run(generator.agenerate_segments(segments))
+
+        assert results[0].status == "failed"
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_generate_audio_parallel_async(self, mock_client_class, tmp_path):
+        """Should run natively on the caller's event loop."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 1.0}
+        mock_client_class.return_value = mock_client
+
+        progress_calls = []
+
+        results = asyncio.run(generate_audio_parallel_async(
+            [{"scene": 1, "text": "Hello"}],
+            tmp_path,
+            api_key="key",
+            voice_id="voice",
+            use_cache=False,
+            progress_callback=lambda done, total: progress_calls.append((done, total)),
+        ))
+
+        assert len(results) == 1
+        assert results[0].path == tmp_path / "audio_scene_1.mp3"
+        assert progress_calls == [(1, 1)]
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_async_serves_cache_hits(self, mock_client_class, tmp_path):
+        """Cache hits should be installed without calling the API."""
+        from utils.cache import DemoCache
+
+        mock_client_class.return_value = MagicMock()
+        generator = ParallelAudioGenerator(api_key="key", voice_id="voice", use_cache=False)
+        generator.use_cache = True
+        generator.cache = DemoCache("demo", base_path=str(tmp_path))
+        generator.cache.cache_audio("Cached", b"old-audio", "voice", 4.0)
+
+        segments = [AudioSegment(scene_id=1, text="Cached", output_path=tmp_path / "1.mp3")]
+        results = asyncio.run(generator.agenerate_segments(segments))
+
+        assert results[0].status == "cached"
+        assert (tmp_path / "1.mp3").read_bytes() == b"old-audio"
+        mock_client_class.return_value.generate_audio.assert_not_called()
+
+
+    @patch("utils.parallel_audio.ElevenLabsClient")
+    def test_async_cache_write_failure_does_not_fail_segment(self, mock_client_class, tmp_path):
+        """Any cache error should be logged, not fail the generated segment."""
+        mock_client = MagicMock()
+        mock_client.generate_audio.return_value = {"duration": 3.0}
+        mock_client_class.return_value = mock_client
+
+        generator = ParallelAudioGenerator(api_key="key", voice_id="voice", use_cache=False)
+        generator.use_cache = True
+        generator.cache = MagicMock()
+        generator.cache.get_audio_many.side_effect = lambda keys: dict.fromkeys(keys)
+        generator.cache.link_from_path.side_effect = RuntimeError("metadata busy")
+
+        segments = [AudioSegment(scene_id=1, text="Hi", output_path=tmp_path / "a.mp3")]
+        results = asyncio.run(generator.agenerate_segments(segments))
+
+        assert results[0].status == "success"
+
+
 class TestGenerateAudioParallel:
     """Tests for generate_audio_parallel convenience function."""
 
@@ -198,3 +549,4 @@ class TestGenerateAudioParallel:
 
         mock_generator_class.assert_called_once()
         mock_generator.generate_segments.assert_called_once()
+        mock_generator.close.assert_called_once()
@@ -50,6 +50,20 @@ class TestStageProgress:
         assert "2m" in stage.elapsed_str
 
 
+    def test_elapsed_str_frozen_when_finished(self):
+        """Finished stages should keep the elapsed string they ended with."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("Stage 1")
+        pipeline.start_stage(0)
+        stage = pipeline.stages[0]
+        stage.start_time = time.time() - 125
+
+        pipeline.complete_stage(0)
+        stage.start_time = time.time() - 5
+
+        assert stage.elapsed_str == "2m 5s"
+
+
 class TestPipelineProgress:
     """Tests for PipelineProgress class."""
 
@@ -121,6 +135,28 @@ class TestPipelineProgress:
         remaining = pipeline.estimated_remaining
         assert remaining is not None
 
+    def test_estimated_remaining_tracks_transitions(self):
+        """Estimate should follow stage status changes."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("Stage 1", estimated_duration=60)
+        pipeline.add_stage("Stage 2", estimated_duration=120)
+        pipeline.add_stage("Stage 3")
+
+        assert pipeline.estimated_remaining == 180
+
+        pipeline.start_stage(0)
+        pipeline.complete_stage(0)
+        pipeline.skip_stage(1)
+        assert pipeline.estimated_remaining is None
+
+    def test_estimated_remaining_with_initial_stages(self):
+        """Stages passed to the constructor should be counted."""
+        pipeline = PipelineProgress(stages=[
+            StageProgress(name="Stage 1", estimated_duration=30),
+        ])
+
+        assert pipeline.estimated_remaining == 30
+
 
 class TestProgressDisplay:
     """Tests for ProgressDisplay class."""
@@ -174,6 +210,27 @@ class TestProgressDisplay:
         assert "✗" in output  # Failed symbol
         assert "FAILED" in output
 
+    def test_render_is_repeatable(self):
+        """Reusing the line buffer should not leak lines between renders."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("Stage 1")
+        display = ProgressDisplay(pipeline, use_rich=False)
+
+        assert display.render() == display.render()
+
+    def test_render_picks_up_added_stages(self):
+        """Should rebuild cached labels when stages are added."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("First", estimated_duration=90)
+
+        display = ProgressDisplay(pipeline, use_rich=False)
+        assert "(~1m 30s)" in display.render()
+
+        pipeline.add_stage("Second")
+        output = display.render()
+
+        assert "Stage 2: Second" in output
+
     def test_output_callback(self):
         """Should use custom output callback."""
         pipeline = PipelineProgress()
@@ -191,6 +248,83 @@ class TestProgressDisplay:
         assert "Stage 1" in outputs[0]
 
 
+class TestUpdateRateLimit:
+    """Tests for coalescing redraws in ProgressDisplay.update."""
+
+    def test_coalesces_rapid_updates(self):
+        """Should skip redraws within min_interval."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("Stage 1")
+        outputs = []
+        display = ProgressDisplay(
+            pipeline, use_rich=False, output_callback=outputs.append, min_interval=60
+        )
+
+        display.update()
+        display.update()
+        display.update()
+
+        assert len(outputs) == 1
+
+    def test_force_bypasses_limit(self):
+        """Forced updates should always redraw."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("Stage 1")
+        outputs = []
+        display = ProgressDisplay(
+            pipeline, use_rich=False, output_callback=outputs.append, min_interval=60
+        )
+
+        display.update()
+        display.update(force=True)
+
+        assert len(outputs) == 2
+
+    def test_context_forces_transitions(self):
+        """Stage start and end should always be drawn."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("Stage 1", substeps=["a", "b"])
+        outputs = []
+        display = ProgressDisplay(
+            pipeline, use_rich=False, output_callback=outputs.append, min_interval=60
+        )
+
+        with ProgressContext(pipeline, 0, display) as ctx:
+            ctx.update_substep(1)
+
+        assert len(outputs) == 2
+        assert "✓" in outputs[-1]
+
+
+class TestUpdateCursor:
+    """Tests for cursor positioning in ProgressDisplay.update."""
+
+    def test_first_update_skips_clear(self):
+        """Nothing has been drawn yet, so no cursor movement."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("Stage 1")
+        outputs = []
+        display = ProgressDisplay(pipeline, output_callback=outputs.append)
+
+        display.update(force=True)
+
+        assert not outputs[0].startswith("\033[")
+
+    def test_moves_up_by_previous_line_count(self):
+        """Should move up exactly the number of lines previously drawn."""
+        pipeline = PipelineProgress()
+        pipeline.add_stage("Stage 1", substeps=["a", "b", "c"])
+        pipeline.start_stage(0)
+        outputs = []
+        display = ProgressDisplay(pipeline, output_callback=outputs.append)
+
+        display.update(force=True)
+        lines = outputs[0].count("\n") + 1
+        display.update(force=True)
+
+        assert outputs[1].startswith(f"\033[{lines}A\033[J")
+
+
 class TestProgressContext:
     """Tests for ProgressContext manager."""
 
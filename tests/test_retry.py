@@ -1,15 +1,25 @@
 """Tests for retry utilities."""
 
+import asyncio
+import random
+import subprocess
+import threading
 import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from utils.retry import (
+    K8S_EXCEPTIONS,
     RetryError,
     RetryContext,
     calculate_backoff,
+    _backoff_plain,
+    _iter_attempts,
+    _make_backoff,
+    is_retryable_exception,
     retry,
+    retry_async,
 )
 
 
@@ -42,8 +52,63 @@ class TestCalculateBackoff:
         ]
         # With jitter, not all delays should be the same
         assert len(set(delays)) > 1
-        # All delays should be within expected range (0.75 to 1.25 of base)
-        assert all(0.75 <= d <= 1.25 for d in delays)
+        # Full jitter spreads delays between zero and the base delay
+        assert all(0.0 <= d <= 1.0 for d in delays)
+
+    def test_equal_jitter_range(self):
+        """Equal jitter should keep at least half of the delay."""
+        delays = [
+            calculate_backoff(attempt=2, base_delay=1.0, jitter_mode="equal")
+            for _ in range(100)
+        ]
+        assert all(2.0 <= d <= 4.0 for d in delays)
+
+    def test_decorrelated_jitter_range(self):
+        """Decorrelated jitter should grow from the previous delay."""
+        delays = [
+            calculate_backoff(
+                attempt=0, base_delay=1.0, max_delay=10.0,
+                jitter_mode="decorrelated", prev_delay=2.0,
+            )
+            for _ in range(100)
+        ]
+        assert all(1.0 <= d <= 6.0 for d in delays)
+
+    def test_jitter_mode_overrides_flag(self):
+        """An explicit jitter_mode should win over the jitter flag."""
+        delay = calculate_backoff(attempt=1, base_delay=1.0, jitter=True, jitter_mode="none")
+        assert delay == 2.0
+
+    def test_seeded_rng_is_deterministic(self):
+        """A seeded generator should reproduce the same jitter."""
+        first = [
+            calculate_backoff(attempt=i, rng=random.Random(42)) for i in range(3)
+        ]
+        second = [
+            calculate_backoff(attempt=i, rng=random.Random(42)) for i in range(3)
+        ]
+        assert first == second
+
+    def test_unknown_jitter_mode(self):
+        """Unknown modes should be rejected."""
+        with pytest.raises(ValueError):
+            calculate_backoff(attempt=0, jitter_mode="sideways")
+
+
+class TestIsRetryableException:
+    """Tests for is_retryable_exception."""
+
+    def test_exact_type(self):
+        """Exact type matches should be retryable."""
+        assert is_retryable_exception(TimeoutError(), (ConnectionError, TimeoutError))
+
+    def test_subclass(self):
+        """Subclasses of retryable types should be retryable."""
+        assert is_retryable_exception(ConnectionRefusedError(), (ConnectionError,))
+
+    def test_unrelated_type(self):
+        """Other exceptions should not be retried."""
+        assert not is_retryable_exception(ValueError(), (ConnectionError, TimeoutError))
 
 
 class TestRetryDecorator:
@@ -112,6 +177,146 @@ class TestRetryDecorator:
         assert isinstance(call_args[0][1], ValueError)  # exception
 
 
+    @patch("utils.retry.time.sleep")
+    def test_sleeps_follow_backoff_schedule(self, mock_sleep):
+        """Delays should follow the exponential schedule and respect max_delay."""
+        mock_func = MagicMock(side_effect=ValueError("fail"))
+        decorated = retry(
+            max_attempts=5, base_delay=1.0, max_delay=5.0, jitter=False
+        )(mock_func)
+
+        with pytest.raises(RetryError):
+            decorated()
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0, 4.0, 5.0]
+        assert mock_func.call_count == 5
+
+    @patch("utils.retry.time.sleep")
+    def test_jitter_applied_per_retry(self, mock_sleep):
+        """Full-jittered delays should stay below the scheduled delay."""
+        mock_func = MagicMock(side_effect=ValueError("fail"))
+        decorated = retry(max_attempts=3, base_delay=1.0, jitter=True)(mock_func)
+
+        with pytest.raises(RetryError):
+            decorated()
+
+        first, second = (c.args[0] for c in mock_sleep.call_args_list)
+        assert 0.0 <= first <= 1.0
+        assert 0.0 <= second <= 2.0
+
+
+    @patch("utils.retry.time.sleep")
+    def test_rng_drives_jitter(self, mock_sleep):
+        """Decorated functions should draw jitter from the given generator."""
+        mock_func = MagicMock(side_effect=ValueError("fail"))
+        decorated = retry(max_attempts=3, rng=random.Random(7))(mock_func)
+
+        with pytest.raises(RetryError):
+            decorated()
+
+        expected = random.Random(7)
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [
+            expected.random() * 1.0,
+            expected.random() * 2.0,
+        ]
+
+    def test_cancel_event_interrupts_backoff(self):
+        """Setting the cancel event should stop the wait and the retries."""
+        cancel = threading.Event()
+        mock_func = MagicMock(side_effect=ValueError("fail"))
+        decorated = retry(max_attempts=3, base_delay=30.0, cancel_event=cancel)(mock_func)
+
+        threading.Timer(0.05, cancel.set).start()
+        start = time.monotonic()
+        with pytest.raises(RetryError) as exc_info:
+            decorated()
+
+        assert time.monotonic() - start < 5
+        assert mock_func.call_count == 1
+        assert exc_info.value.attempts == 1
+
+
+    def test_exhausted_error_chains_original_exception(self):
+        """The final RetryError should chain the last attempt's exception."""
+        original = ValueError("boom")
+        decorated = retry(max_attempts=1)(MagicMock(side_effect=original))
+
+        with pytest.raises(RetryError) as exc_info:
+            decorated()
+
+        assert exc_info.value.__cause__ is original
+        assert exc_info.value.last_exception is original
+
+    def test_zero_attempts_raises(self):
+        """With no attempts allowed the function should never be called."""
+        mock_func = MagicMock()
+
+        with pytest.raises(RetryError):
+            retry(max_attempts=0)(mock_func)()
+
+        mock_func.assert_not_called()
+
+
+class TestIterAttempts:
+    """Tests for the attempt generator shared by the retry helpers."""
+
+    def test_yields_schedule_then_none(self):
+        assert list(_iter_attempts(3, (1.0, 2.0))) == [(1, 1.0), (2, 2.0), (3, None)]
+
+    def test_no_attempts(self):
+        assert list(_iter_attempts(0, ())) == []
+
+
+class TestMakeBackoff:
+    """Tests for choosing the per-retry delay function."""
+
+    def test_no_jitter_uses_plain_backoff(self):
+        rng = MagicMock()
+        backoff = _make_backoff("none", 1.0, 60.0, rng)
+
+        assert backoff is _backoff_plain
+        assert backoff(4.0, 2.0) == 4.0
+        rng.random.assert_not_called()
+
+    def test_jittered_backoff_draws_from_rng(self):
+        backoff = _make_backoff("full", 1.0, 60.0, random.Random(3))
+
+        assert backoff(4.0, None) == random.Random(3).random() * 4.0
+
+
+class TestRetryAsync:
+    """Tests for retry_async."""
+
+    def test_retries_until_success(self):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ValueError("fail")
+            return "ok"
+
+        with patch("asyncio.sleep", fake_sleep):
+            result = asyncio.run(retry_async(flaky, max_attempts=3, jitter=False))
+
+        assert result == "ok"
+        assert delays == [1.0, 2.0]
+
+    def test_exhausted_raises(self):
+        async def failing():
+            raise ValueError("fail")
+
+        with pytest.raises(RetryError) as exc_info:
+            asyncio.run(retry_async(failing, max_attempts=1))
+
+        assert isinstance(exc_info.value.last_exception, ValueError)
+
+
 class TestRetryContext:
     """Tests for RetryContext class."""
 
@@ -162,6 +367,57 @@ class TestRetryContext:
         with pytest.raises(RetryError):
             ctx.raise_if_exhausted()
 
+    def test_decorrelated_jitter_grows_from_previous_delay(self):
+        """Each delay should be drawn from [base, 3 * previous delay], capped."""
+        rng = MagicMock()
+        rng.uniform.side_effect = lambda low, high: high
+        ctx = RetryContext(
+            max_attempts=4, base_delay=1.0, max_delay=20.0,
+            jitter_mode="decorrelated", rng=rng,
+        )
+        ctx._cancel = MagicMock()
+        ctx._cancel.wait.return_value = False
+
+        for _ in range(3):
+            ctx.failed(ValueError("fail"))
+
+        assert [c.args for c in rng.uniform.call_args_list] == [
+            (1.0, 3.0), (1.0, 9.0), (1.0, 27.0),
+        ]
+        assert [c.args[0] for c in ctx._cancel.wait.call_args_list] == [3.0, 9.0, 20.0]
+
+    def test_cancel_interrupts_backoff(self):
+        """cancel() from another thread should end the wait and stop retries."""
+        ctx = RetryContext(max_attempts=3, base_delay=30.0)
+
+        threading.Timer(0.05, ctx.cancel).start()
+        start = time.monotonic()
+        ctx.failed(ValueError("fail"))
+
+        assert time.monotonic() - start < 5
+        assert ctx.cancelled
+        assert not ctx.should_retry()
+
+    def test_cancelled_failure_raises(self):
+        """A cancelled operation that never succeeded should not pass as a success."""
+        error = ValueError("fail")
+        ctx = RetryContext(max_attempts=3, base_delay=0.01)
+        ctx.failed(error)
+        ctx.cancel()
+
+        with pytest.raises(RetryError) as exc_info:
+            ctx.raise_if_exhausted()
+
+        assert exc_info.value.attempts == 1
+        assert exc_info.value.last_exception is error
+
+    def test_cancel_after_success_does_not_raise(self):
+        ctx = RetryContext(max_attempts=3, base_delay=0.01)
+        ctx.success()
+        ctx.cancel()
+
+        ctx.raise_if_exhausted()
+
     def test_last_exception_tracked(self):
         """Last exception should be accessible."""
         original_error = ValueError("the error")
@@ -171,3 +427,12 @@ class TestRetryContext:
                 ctx.failed(original_error)
 
         assert ctx.last_exception is original_error
+
+
+class TestExceptionSets:
+    """Tests for the predefined retryable exception sets."""
+
+    def test_k8s_exceptions_include_subprocess_errors(self):
+        """kubectl/helm failures should be retryable by K8S_EXCEPTIONS."""
+        assert subprocess.SubprocessError in K8S_EXCEPTIONS
+        assert is_retryable_exception(subprocess.TimeoutExpired("kubectl", 5), K8S_EXCEPTIONS)
@@ -0,0 +1,473 @@
+"""Tests for screenenv Kubernetes job utilities."""
+
+import asyncio
+import io
+import subprocess
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utils.screenenv_job import (
+    DEFAULT_HELM_TIMEOUT_MINUTES,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    ScreenenvJobManager,
+    _build_cmd,
+    _parse_counts,
+    create_and_run_recording_async,
+)
+
+
+def completed(stdout: str) -> subprocess.CompletedProcess:
+    """Build a finished kubectl process with the given stdout."""
+    return subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr="")
+
+
+def log_process(text: str) -> MagicMock:
+    """Build a finished kubectl logs process streaming the given text."""
+    proc = MagicMock()
+    proc.stdout = io.StringIO(text)
+    proc.poll.return_value = 0
+    return proc
+
+
+class TestJobLogs:
+    """Tests for streaming job logs."""
+
+    @patch("utils.screenenv_job.subprocess.Popen")
+    def test_iter_job_logs_yields_lines(self, mock_popen):
+        """Should yield log lines as they are read."""
+        mock_popen.return_value = log_process("one\ntwo\n")
+        manager = ScreenenvJobManager()
+
+        lines = list(manager.iter_job_logs("demo", follow=True, tail=5))
+
+        assert lines == ["one\n", "two\n"]
+        cmd = mock_popen.call_args.args[0]
+        assert "job/screenenv-demo" in cmd
+        assert "--follow" in cmd
+        assert "--tail=5" in cmd
+
+    @patch("utils.screenenv_job.subprocess.Popen")
+    def test_stopping_early_kills_process(self, mock_popen):
+        """Abandoning a followed stream should stop kubectl."""
+        proc = log_process("one\ntwo\n")
+        proc.poll.return_value = None
+        mock_popen.return_value = proc
+        manager = ScreenenvJobManager()
+
+        logs = manager.iter_job_logs("demo", follow=True)
+        assert next(logs) == "one\n"
+        logs.close()
+
+        proc.kill.assert_called_once()
+        proc.wait.assert_called_once()
+
+    @patch("utils.screenenv_job.subprocess.Popen")
+    def test_get_job_logs_joins_stream(self, mock_popen):
+        """get_job_logs should return the whole log as one string."""
+        mock_popen.return_value = log_process("one\ntwo\n")
+        manager = ScreenenvJobManager()
+
+        assert manager.get_job_logs("demo") == "one\ntwo\n"
+
+
+class TestKubectlCmd:
+    """Tests for kubectl command construction."""
+
+    def test_prefix_includes_context_and_namespace(self):
+        """Global flags should precede the subcommand."""
+        manager = ScreenenvJobManager(namespace="demo-ns", context="ctx")
+
+        cmd = manager._kubectl_cmd("get", "job", "x")
+
+        assert cmd == [
+            "kubectl", "--context", "ctx", "--namespace", "demo-ns", "get", "job", "x",
+        ]
+
+    def test_returns_fresh_list(self):
+        """Callers may extend the returned command safely."""
+        manager = ScreenenvJobManager(namespace="demo-ns", context="ctx")
+
+        manager._kubectl_cmd("get").append("--watch")
+
+        assert manager._kubectl_cmd("get") == [
+            "kubectl", "--context", "ctx", "--namespace", "demo-ns", "get",
+        ]
+
+    def test_repeated_commands_are_memoized(self):
+        """Managers with the same prefix should share assembled commands."""
+        first = ScreenenvJobManager(namespace="memo-ns", context="ctx")
+        second = ScreenenvJobManager(namespace="memo-ns", context="ctx")
+        hits = _build_cmd.cache_info().hits
+
+        first._kubectl_cmd("get", "job", "memo")
+        second._kubectl_cmd("get", "job", "memo")
+
+        assert _build_cmd.cache_info().hits == hits + 1
+
+
+class TestRetrieveRecording:
+    """Tests for ScreenenvJobManager.retrieve_recording."""
+
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_streams_file_from_pod(self, mock_run, tmp_path):
+        """Should cat the recording from the job's pod in a single call."""
+        def run(cmd, **kwargs):
+            kwargs["stdout"].write(b"mp4-bytes")
+            return subprocess.CompletedProcess(cmd, 0, stderr=b"")
+
+        mock_run.side_effect = run
+        manager = ScreenenvJobManager()
+        output = tmp_path / "out" / "raw.mp4"
+
+        assert manager.retrieve_recording("demo", str(output)) is True
+
+        assert output.read_bytes() == b"mp4-bytes"
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args.args[0]
+        assert cmd[-5:] == [
+            "exec", "job/screenenv-demo", "--", "cat", "/recordings/demo/raw_recording.mp4",
+        ]
+
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_failed_copy_removes_partial_file(self, mock_run, tmp_path):
+        """A failed stream should not leave a truncated recording behind."""
+        def run(cmd, **kwargs):
+            kwargs["stdout"].write(b"partial")
+            return subprocess.CompletedProcess(cmd, 1, stderr=b"no such file")
+
+        mock_run.side_effect = run
+        manager = ScreenenvJobManager()
+        output = tmp_path / "raw.mp4"
+
+        assert manager.retrieve_recording("demo", str(output)) is False
+        assert not output.exists()
+
+
+class TestAdaptivePolling:
+    """Tests for the kubectl round-trip estimator."""
+
+    def test_delay_clamped_to_minimum(self):
+        """Fast clusters should still wait at least the minimum interval."""
+        manager = ScreenenvJobManager(initial_rtt=0.01)
+
+        for _ in range(20):
+            manager._observe_rtt(0.01)
+
+        assert manager._poll_delay() == MIN_POLL_INTERVAL
+
+    def test_delay_clamped_to_maximum(self):
+        """Slow clusters should not wait longer than the maximum interval."""
+        manager = ScreenenvJobManager(initial_rtt=60.0)
+
+        assert manager._poll_delay() == MAX_POLL_INTERVAL
+
+    def test_estimate_tracks_samples(self):
+        """Smoothed RTT should move towards observed latency."""
+        manager = ScreenenvJobManager(initial_rtt=1.0)
+
+        for _ in range(50):
+            manager._observe_rtt(3.0)
+
+        assert manager._srtt == pytest.approx(3.0, abs=0.01)
+        assert manager._poll_delay() == pytest.approx(3.0, abs=0.1)
+
+
+class TestHelmTimeout:
+    """Tests for adapting the helm install timeout to observed install times."""
+
+    def helm_timeout(self, cmd) -> str:
+        return cmd[cmd.index("--timeout") + 1]
+
+    def test_default_without_history(self, tmp_path):
+        manager = ScreenenvJobManager(helm_rtt_path=str(tmp_path / "rtt.json"))
+        assert manager._helm_timeout_minutes() == DEFAULT_HELM_TIMEOUT_MINUTES
+
+    def test_successful_installs_set_timeout(self, tmp_path):
+        manager = ScreenenvJobManager(helm_rtt_path=str(tmp_path / "rtt.json"))
+
+        manager._observe_helm_install(300.0, timed_out=False)
+
+        # srtt 300s + 4 * rttvar 150s = 15 minutes
+        assert manager._helm_timeout_minutes() == 15
+
+    def test_timeout_never_drops_below_default(self, tmp_path):
+        """Fast installs should not shrink the timeout below what a cold pull needs."""
+        manager = ScreenenvJobManager(helm_rtt_path=str(tmp_path / "rtt.json"))
+
+        manager._observe_helm_install(5.0, timed_out=False)
+
+        assert manager._helm_timeout_minutes() == DEFAULT_HELM_TIMEOUT_MINUTES
+
+    def test_timed_out_install_backs_off_without_updating_srtt(self, tmp_path):
+        manager = ScreenenvJobManager(helm_rtt_path=str(tmp_path / "rtt.json"))
+        manager._observe_helm_install(60.0, timed_out=False)
+
+        manager._observe_helm_install(900.0, timed_out=True)
+
+        state = manager._load_helm_rtt()
+        assert state["srtt"] == 60.0
+        assert manager._helm_timeout_minutes() == 30
+
+    def test_corrupt_state_falls_back_to_default(self, tmp_path):
+        path = tmp_path / "rtt.json"
+        path.write_text("not json")
+        manager = ScreenenvJobManager(helm_rtt_path=str(path))
+
+        assert manager._helm_timeout_minutes() == DEFAULT_HELM_TIMEOUT_MINUTES
+
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_create_job_records_install_time(self, mock_run, tmp_path):
+        manager = ScreenenvJobManager(helm_rtt_path=str(tmp_path / "rtt.json"))
+        mock_run.return_value = completed("")
+
+        result = manager.create_job("demo", "http://script")
+
+        assert result["status"] == "success"
+        assert self.helm_timeout(mock_run.call_args.args[0]) == f"{DEFAULT_HELM_TIMEOUT_MINUTES}m"
+        assert manager._load_helm_rtt() is not None
+
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_explicit_timeout_is_not_recorded(self, mock_run, tmp_path):
+        manager = ScreenenvJobManager(helm_rtt_path=str(tmp_path / "rtt.json"))
+        mock_run.return_value = completed("")
+
+        manager.create_job("demo", "http://script", timeout_minutes=7)
+
+        assert self.helm_timeout(mock_run.call_args.args[0]) == "7m"
+        assert manager._load_helm_rtt() is None
+
+    @patch("utils.screenenv_job.time.monotonic")
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_helm_timeout_recorded_as_backoff(self, mock_run, mock_monotonic, tmp_path):
+        """A failure after the full --timeout is a timeout, whatever helm printed."""
+        manager = ScreenenvJobManager(helm_rtt_path=str(tmp_path / "rtt.json"))
+        mock_run.side_effect = subprocess.CalledProcessError(1, "helm", stderr="Fehler")
+        mock_monotonic.side_effect = [0.0, DEFAULT_HELM_TIMEOUT_MINUTES * 60.0]
+
+        result = manager.create_job("demo", "http://script")
+
+        assert result["status"] == "failed"
+        assert manager._helm_timeout_minutes() > DEFAULT_HELM_TIMEOUT_MINUTES
+
+    @patch("utils.screenenv_job.time.monotonic")
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_fast_failure_is_not_a_timeout(self, mock_run, mock_monotonic, tmp_path):
+        manager = ScreenenvJobManager(helm_rtt_path=str(tmp_path / "rtt.json"))
+        mock_run.side_effect = subprocess.CalledProcessError(
+            1, "helm", stderr="Error: chart not found"
+        )
+        mock_monotonic.side_effect = [0.0, 2.0]
+
+        manager.create_job("demo", "http://script")
+
+        assert manager._load_helm_rtt() is None
+
+
+class TestParseCounts:
+    """Tests for _parse_counts helper."""
+
+    def test_empty_fields_are_zero(self):
+        """Missing counts should read as zero."""
+        assert _parse_counts("||1", 3) == [0, 0, 1]
+
+    def test_short_output_padded(self):
+        """Output with fewer fields should be padded with zeros."""
+        assert _parse_counts("", 3) == [0, 0, 0]
+        assert _parse_counts("2|1\n", 3) == [2, 1, 0]
+
+
+class TestWaitForCompletion:
+    """Tests for ScreenenvJobManager.wait_for_completion."""
+
+    @pytest.fixture(autouse=True)
+    def no_kubernetes_client(self):
+        """Exercise the kubectl path regardless of installed packages."""
+        with patch("utils.screenenv_job.KUBERNETES_AVAILABLE", False):
+            yield
+
+    @patch("utils.screenenv_job.time.sleep")
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_completed(self, mock_run, mock_sleep):
+        """Should report completion once the job has succeeded."""
+        mock_run.side_effect = [completed("||1"), completed("1||")]
+        manager = ScreenenvJobManager()
+
+        result = manager.wait_for_completion("demo")
+
+        assert result == {"status": "completed", "demo_id": "demo"}
+        assert mock_sleep.call_count == 1
+        assert mock_run.call_count == 2
+        cmd = mock_run.call_args_list[0].args[0]
+        assert "jsonpath={.status.succeeded}|{.status.failed}|{.status.active}" in cmd
+
+    @patch("utils.screenenv_job.subprocess.Popen")
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_failed_includes_logs(self, mock_run, mock_popen):
+        """Should return the tail of the job logs when the job has failed."""
+        mock_run.return_value = completed("|1|")
+        mock_popen.return_value = log_process("boom\n")
+        manager = ScreenenvJobManager()
+
+        result = manager.wait_for_completion("demo")
+
+        assert result["status"] == "failed"
+        assert result["logs"] == "boom\n"
+        assert "--tail=1000" in mock_popen.call_args.args[0]
+
+    @patch("utils.screenenv_job.time.sleep")
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_fixed_poll_interval(self, mock_run, mock_sleep):
+        """An explicit poll_interval should override the adaptive delay."""
+        mock_run.side_effect = [completed("||1"), completed("1||")]
+        manager = ScreenenvJobManager()
+
+        manager.wait_for_completion("demo", poll_interval=2)
+
+        mock_sleep.assert_called_once_with(2)
+
+    @patch("utils.screenenv_job.subprocess.run")
+    def test_timeout(self, mock_run):
+        """Should time out when the deadline passes."""
+        mock_run.return_value = completed("")
+        manager = ScreenenvJobManager()
+
+        result = manager.wait_for_completion("demo", max_wait=0)
+
+        assert result == {"status": "timeout", "demo_id": "demo"}
+        mock_run.assert_not_called()
+
+
+class TestWatchForCompletion:
+    """Tests for waiting on a job through the Kubernetes watch API."""
+
+    @pytest.fixture
+    def manager(self):
+        """Create a manager with a stubbed BatchV1Api."""
+        manager = ScreenenvJobManager()
+        manager._batch = MagicMock()
+        manager._batch_loaded = True
+        return manager
+
+    @staticmethod
+    def job_event(succeeded=None, failed=None):
+        return {"object": SimpleNamespace(status=SimpleNamespace(succeeded=succeeded, failed=failed))}
+
+    @patch("utils.screenenv_job.subprocess.run")
+    @patch("utils.screenenv_job.k8s_watch", create=True)
+    def test_completed_from_stream(self, mock_watch_module, mock_run, manager):
+        """Should return on the first event reporting success, without kubectl."""
+        watch = mock_watch_module.Watch.return_value
+        watch.stream.return_value = iter([self.job_event(), self.job_event(succeeded=1)])
+
+        result = manager.wait_for_completion("demo")
+
+        assert result == {"status": "completed", "demo_id": "demo"}
+        kwargs = watch.stream.call_args.kwargs
+        assert kwargs["field_selector"] == "metadata.name=screenenv-demo"
+        watch.stop.assert_called_once()
+        mock_run.assert_not_called()
+
+    @patch("utils.screenenv_job.subprocess.Popen")
+    @patch("utils.screenenv_job.k8s_watch", create=True)
+    def test_failed_from_stream(self, mock_watch_module, mock_popen, manager):
+        """Should include logs when the watched job fails."""
+        mock_watch_module.Watch.return_value.stream.return_value = iter([self.job_event(failed=1)])
+        mock_popen.return_value = log_process("boom")
+
+        result = manager.wait_for_completion("demo")
+
+        assert result["status"] == "failed"
+        assert result["logs"] == "boom"
+
+    @patch("utils.screenenv_job.time.sleep")
+    @patch("utils.screenenv_job.subprocess.run")
+    @patch("utils.screenenv_job.k8s_watch", create=True)
+    def test_watch_error_falls_back_to_polling(self, mock_watch_module, mock_run, mock_sleep, manager):
+        """API errors during the watch should fall back to kubectl polling."""
+        mock_watch_module.Watch.return_value.stream.side_effect = RuntimeError("api down")
+        mock_run.return_value = completed("1||")
+
+        result = manager.wait_for_completion("demo")
+
+        assert result["status"] == "completed"
+        assert mock_run.call_count == 1
+
+
+class FakeProcess:
+    """Minimal stand-in for an asyncio subprocess."""
+
+    def __init__(self, stdout: str):
+        self._stdout = stdout.encode()
+
+    async def communicate(self):
+        return self._stdout, b""
+
+
+class TestWaitForCompletionAsync:
+    """Tests for ScreenenvJobManager.wait_for_completion_async."""
+
+    @patch("utils.screenenv_job.asyncio.sleep")
+    @patch("utils.screenenv_job.asyncio.create_subprocess_exec")
+    def test_completed(self, mock_exec, mock_sleep):
+        """Should poll on the event loop until the job succeeds."""
+        outputs = iter(["||1", "1||"])
+
+        async def fake_exec(*cmd, **kwargs):
+            return FakeProcess(next(outputs))
+
+        async def no_sleep(delay):
+            return None
+
+        mock_exec.side_effect = fake_exec
+        mock_sleep.side_effect = no_sleep
+        manager = ScreenenvJobManager()
+
+        result = asyncio.run(manager.wait_for_completion_async("demo"))
+
+        assert result == {"status": "completed", "demo_id": "demo"}
+        assert mock_exec.call_count == 2
+        assert mock_sleep.call_count == 1
+
+    @patch("utils.screenenv_job.asyncio.create_subprocess_exec")
+    def test_failed_includes_logs(self, mock_exec):
+        """Should fetch logs asynchronously when the job fails."""
+        outputs = iter(["|1|", "boom"])
+
+        async def fake_exec(*cmd, **kwargs):
+            return FakeProcess(next(outputs))
+
+        mock_exec.side_effect = fake_exec
+        manager = ScreenenvJobManager()
+
+        result = asyncio.run(manager.wait_for_completion_async("demo"))
+
+        assert result["status"] == "failed"
+        assert result["logs"] == "boom"
+        assert "logs" in mock_exec.call_args.args
+
+    @patch("utils.screenenv_job.ScreenenvJobManager")
+    def test_recordings_run_concurrently(self, mock_manager_class):
+        """Several recordings should share one event loop."""
+        manager = mock_manager_class.return_value
+        manager.create_job.return_value = {"status": "success"}
+        manager.retrieve_recording.return_value = True
+
+        async def wait(demo_id):
+            await asyncio.sleep(0)
+            return {"status": "completed", "demo_id": demo_id}
+
+        manager.wait_for_completion_async.side_effect = wait
+
+        async def run_all():
+            return await asyncio.gather(*(
+                create_and_run_recording_async(f"demo{i}", "url", f"out{i}.mp4")
+                for i in range(3)
+            ))
+
+        results = asyncio.run(run_all())
+
+        assert [r["status"] for r in results] == ["success"] * 3
+        assert manager.cleanup_job.call_count == 3
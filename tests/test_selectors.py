@@ -5,9 +5,18 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from utils.selectors import (
+    _DC_JS_LIB,
+    _DOM_REVISION_JS,
+    _SCAN_CALL_JS,
+    CompiledSelector,
     DiscoveredElement,
     SelectorDiscovery,
+    _css_string,
+    _generate_selector_cached,
+    _xpath_literal,
     discover_selectors,
+    discover_selectors_compiled,
+    discover_selectors_with_metadata,
     suggest_alternative_selectors,
     validate_selector,
 )
@@ -79,7 +88,7 @@ class TestSelectorDiscovery:
             element_type="button",
         )
 
-        assert selector == "button:has-text('Submit')"
+        assert selector == "xpath=//button[normalize-space(.)='Submit']"
         assert selector_type == "text"
         assert priority == SelectorDiscovery.PRIORITY_TEXT
 
@@ -136,6 +145,71 @@ class TestSelectorDiscovery:
         assert "p-4" not in selector
         assert "m-2" not in selector
 
+    def test_generate_selector_filters_layout_prefixes(self, discovery):
+        """Classes starting with flex/grid are utilities too."""
+        selector, _, _ = discovery._generate_selector(
+            tag="div",
+            text="",
+            attributes={"class": "flex-col grid-cols-3 w-full sidebar-panel"},
+            element_type="button",
+        )
+
+        assert selector == "div.sidebar-panel"
+
+    def test_generate_selector_escapes_attribute_quotes(self, discovery):
+        """Quotes inside attribute values should not break the selector."""
+        selector, _, _ = discovery._generate_selector(
+            tag="button",
+            text="",
+            attributes={"aria-label": "Don't save"},
+            element_type="button",
+        )
+
+        assert selector == "[aria-label='Don\\'t save']"
+
+    def test_generate_selector_role_fallback_uses_xpath(self, discovery):
+        """Long button text should fall back to a role selector on a prefix."""
+        text = "Continue to the next step of the onboarding wizard please"
+        selector, selector_type, _ = discovery._generate_selector(
+            tag="div",
+            text=text,
+            attributes={},
+            element_type="button",
+        )
+
+        assert selector_type == "role"
+        assert selector == (
+            "xpath=//*[@role='button'][contains(normalize-space(.), '" + text[:30] + "')]"
+        )
+
+    def test_inputs_never_get_text_selectors(self, discovery):
+        """The input chooser should skip the text and role strategies."""
+        selector, selector_type, _ = SelectorDiscovery._build_chooser("input")(
+            "input", "Search", {"class": "search-box"}, False
+        )
+
+        assert selector == "input.search-box"
+        assert selector_type == "css"
+
+    def test_choosers_built_once_per_element_type(self, discovery):
+        SelectorDiscovery._choose_selector("a", "Docs", {}, "link")
+        chooser = SelectorDiscovery._choosers["link"]
+
+        SelectorDiscovery._choose_selector("a", "Blog", {}, "link")
+
+        assert SelectorDiscovery._choosers["link"] is chooser
+
+    def test_generate_selector_memoizes_repeated_elements(self, discovery):
+        """Identical elements should reuse the cached selector."""
+        attributes = {"class": "row-action memo-test", "type": "button"}
+        discovery._generate_selector("button", "", attributes, "button")
+        hits = _generate_selector_cached.cache_info().hits
+
+        result = discovery._generate_selector("button", "", dict(attributes), "button")
+
+        assert result == ("button.row-action.memo-test", "css", SelectorDiscovery.PRIORITY_CSS_CLASS)
+        assert _generate_selector_cached.cache_info().hits == hits + 1
+
     def test_generate_name_from_text(self, discovery):
         """Should generate semantic name from text."""
         element = DiscoveredElement(
@@ -165,36 +239,398 @@ class TestSelectorDiscovery:
 
         assert name == "button_close_dialog"
 
+    def test_generate_name_strips_punctuation(self, discovery):
+        """Punctuation should be dropped and dashes joined with underscores."""
+        element = DiscoveredElement(
+            tag="button",
+            text="Sign-in  now!",
+            selector="button",
+            selector_type="text",
+            priority=3,
+        )
+
+        assert discovery._generate_name(element, "button") == "button_sign_in_now"
+
+    def test_generate_name_sanitizes_placeholder(self, discovery):
+        """Attribute-based names should be sanitized like text."""
+        element = DiscoveredElement(
+            tag="input",
+            text="",
+            selector="input",
+            selector_type="placeholder",
+            priority=5,
+            attributes={"placeholder": "you@example.com"},
+        )
+
+        assert discovery._generate_name(element, "input") == "input_youexamplecom"
+
+    def test_generate_name_falls_back_to_selector_hash(self, discovery):
+        """Unnamed elements should get a stable 8-digit hex id."""
+        element = DiscoveredElement(
+            tag="div",
+            text="",
+            selector="div.custom-widget",
+            selector_type="css",
+            priority=7,
+        )
+
+        name = discovery._generate_name(element, "button")
+
+        assert name == discovery._generate_name(element, "button")
+        assert len(name) == len("button_") + 8
+        int(name[len("button_"):], 16)
+
+
+class TestCssString:
+    """Tests for quoting CSS attribute values."""
+
+    def test_plain_value(self):
+        assert _css_string("submit-btn") == "'submit-btn'"
+
+    def test_escapes_quotes_and_backslashes(self):
+        assert _css_string("a'b\\c") == "'a\\'b\\\\c'"
+
+    def test_escapes_newlines_as_hex(self):
+        assert _css_string("line1\nline2") == "'line1\\a line2'"
+
+    def test_keeps_non_ascii(self):
+        assert _css_string("café") == "'café'"
+
+
+class TestXPathLiteral:
+    """Tests for quoting XPath string literals."""
+
+    def test_plain_text(self):
+        assert _xpath_literal("Submit") == "'Submit'"
+
+    def test_single_quote(self):
+        assert _xpath_literal("Don't") == '"Don\'t"'
+
+    def test_both_quotes(self):
+        value = 'Say "don\'t"'
+        assert _xpath_literal(value) == """concat('Say "don', "'", 't"')"""
+
+
+def scan_page(results, revision="1:0", url="http://localhost:3000"):
+    """Build a page whose discovery scan returns the given element dicts."""
+    page = MagicMock()
+    page.url = url
+    page.revision = revision
+
+    def evaluate(expression, arg=None):
+        if expression == _SCAN_CALL_JS:
+            return results
+        if expression == _DOM_REVISION_JS:
+            return page.revision
+        return None
+
+    page.evaluate.side_effect = evaluate
+    return page
+
+
+def scan_calls(page):
+    """Calls that ran the discovery scan on a page."""
+    return [c for c in page.evaluate.call_args_list if c.args[0] == _SCAN_CALL_JS]
+
 
 class TestDiscoverSelectors:
     """Tests for discover_selectors convenience function."""
 
     def test_discover_selectors_returns_dict(self):
         """Should return dict of name to selector."""
-        mock_page = MagicMock()
-        mock_page.url = "http://localhost:3000"
-
-        # Mock locators for buttons
-        mock_button = MagicMock()
-        mock_button.is_visible.return_value = True
-        mock_button.evaluate.return_value = "button"
-        mock_button.inner_text.return_value = "Submit"
-        mock_button.get_attribute.side_effect = lambda attr: {
-            "data-testid": "submit-btn",
-            "aria-label": None,
-            "name": None,
-            "placeholder": None,
-            "id": None,
-            "class": "btn",
-            "type": "submit",
-        }.get(attr)
-        mock_button.bounding_box.return_value = {"x": 0, "y": 0, "width": 100, "height": 40}
-
-        mock_page.locator.return_value.all.return_value = [mock_button]
+        mock_page = scan_page([
+            {
+                "kind": "button",
+                "tag": "button",
+                "text": "Submit",
+                "selectorText": "Submit",
+                "inShadow": False,
+                "box": {"x": 0, "y": 0, "width": 100, "height": 40},
+                "attrs": {"data-testid": "submit-btn", "class": "btn", "type": "submit"},
+            },
+        ])
 
         result = discover_selectors(mock_page)
 
         assert isinstance(result, dict)
+        assert result == {"button_submit": "[data-testid='submit-btn']"}
+
+    def test_scans_page_in_one_call(self):
+        """All element kinds should come from a single scan call."""
+        mock_page = scan_page([
+            {"kind": "input", "tag": "input", "text": "", "selectorText": "",
+             "inShadow": False, "box": None, "attrs": {"name": "email"}},
+            {"kind": "link", "tag": "a", "text": "Docs", "selectorText": "Docs",
+             "inShadow": False, "box": None, "attrs": {}},
+        ])
+
+        result = discover_selectors(mock_page, include_hidden=True)
+
+        (scan,) = scan_calls(mock_page)
+        mock_page.locator.assert_not_called()
+        arg = scan.args[1]
+        assert arg["includeHidden"] is True
+        assert [kind for kind, _ in arg["kinds"]] == ["button", "input", "link", "select"]
+        assert result["input_email"] == "input[name='email']"
+        assert result["link_docs"] == "xpath=//a[normalize-space(.)='Docs']"
+        assert "aria-hidden" not in arg["kinds"][0][1]
+
+    def test_bounding_box_comes_from_scan(self):
+        """Boxes should come from the scan rather than per-element calls."""
+        box = {"x": 10, "y": 20, "width": 30, "height": 40}
+        mock_page = scan_page([
+            {"kind": "select", "tag": "select", "text": "", "selectorText": "",
+             "inShadow": False, "box": box, "attrs": {"name": "country"}},
+        ])
+
+        elements = SelectorDiscovery(base_url=mock_page.url).discover_page(mock_page)
+
+        assert elements["select_country"].bounding_box == box
+        mock_page.locator.assert_not_called()
+
+    def test_hidden_elements_filtered_in_query(self):
+        """Without include_hidden, every selector should exclude hidden elements."""
+        mock_page = scan_page([])
+
+        discover_selectors(mock_page)
+
+        arg = scan_calls(mock_page)[0].args[1]
+        assert arg["includeHidden"] is False
+        for _kind, selectors in arg["kinds"]:
+            for selector in selectors.split(", "):
+                assert selector.endswith(":not([hidden]):not([aria-hidden='true'])")
+
+    def test_text_selector_uses_source_text(self):
+        """XPath text should come from textContent, not the CSS-transformed innerText."""
+        mock_page = scan_page([
+            {"kind": "button", "tag": "button", "text": "SAVE DRAFT",
+             "selectorText": "Save draft", "inShadow": False, "box": None, "attrs": {}},
+        ])
+
+        result = discover_selectors(mock_page)
+
+        assert result == {"button_save_draft": "xpath=//button[normalize-space(.)='Save draft']"}
+
+    def test_shadow_dom_text_selector_pierces(self):
+        """Elements inside a shadow root should get selectors that reach into it."""
+        mock_page = scan_page([
+            {"kind": "button", "tag": "button", "text": "Save", "selectorText": "Save",
+             "inShadow": True, "box": None, "attrs": {}},
+            {"kind": "button", "tag": "div", "text": "Open menu", "selectorText": "Open menu",
+             "inShadow": True, "box": None, "attrs": {"role": "button"}},
+        ])
+
+        result = discover_selectors(mock_page)
+
+        assert result == {
+            "button_save": "button:text-is('Save')",
+            "button_open_menu": "div:text-is('Open menu')",
+        }
+
+    def test_scan_walks_open_shadow_roots(self):
+        """The scan should query shadow roots and observe them for mutations."""
+        assert "walk(host.shadowRoot)" in _DC_JS_LIB
+        assert "window.__dc_observe" in _DC_JS_LIB
+
+
+@pytest.mark.integration
+class TestDiscoverSelectorsInBrowser:
+    """Discovered selectors should resolve against a real page."""
+
+    def test_text_transform_uppercase(self):
+        sync_api = pytest.importorskip("playwright.sync_api")
+        with sync_api.sync_playwright() as playwright:
+            try:
+                browser = playwright.chromium.launch()
+            except Exception as e:
+                pytest.skip(f"Chromium unavailable: {e}")
+            try:
+                page = browser.new_page()
+                page.set_content(
+                    '<button style="text-transform: uppercase">Save <span hidden>draft</span>'
+                    "</button>"
+                )
+
+                selectors = discover_selectors(page)
+
+                (selector,) = selectors.values()
+                assert selector.startswith("xpath=")
+                assert page.locator(selector).count() == 1
+            finally:
+                browser.close()
+
+    def test_open_shadow_root(self):
+        sync_api = pytest.importorskip("playwright.sync_api")
+        with sync_api.sync_playwright() as playwright:
+            try:
+                browser = playwright.chromium.launch()
+            except Exception as e:
+                pytest.skip(f"Chromium unavailable: {e}")
+            try:
+                page = browser.new_page()
+                page.set_content(
+                    "<div id='host'></div><script>"
+                    "document.getElementById('host').attachShadow({mode: 'open'})"
+                    ".innerHTML = '<button>Publish</button>';</script>"
+                )
+
+                selectors = discover_selectors(page)
+
+                assert page.locator(selectors["button_publish"]).count() == 1
+            finally:
+                browser.close()
+
+
+class TestInstallHelpers:
+    """Tests for installing the discovery script once per page."""
+
+    def test_installs_once_per_page(self):
+        mock_page = scan_page([])
+        discovery = SelectorDiscovery(base_url="http://localhost:3000")
+
+        discovery.discover_page(mock_page)
+        mock_page.revision = "1:1"
+        discovery.discover_page(mock_page)
+
+        mock_page.add_init_script.assert_called_once_with(script=_DC_JS_LIB)
+        assert len(scan_calls(mock_page)) == 2
+
+    def test_reinstalls_for_new_page(self):
+        discovery = SelectorDiscovery(base_url="http://localhost:3000")
+        first, second = scan_page([]), scan_page([])
+
+        discovery.discover_page(first)
+        discovery.discover_page(second)
+
+        first.add_init_script.assert_called_once()
+        second.add_init_script.assert_called_once()
+
+    def test_convenience_functions_install_once(self):
+        """Each call makes a new SelectorDiscovery; the page is still set up once."""
+        mock_page = scan_page([])
+
+        discover_selectors(mock_page)
+        mock_page.revision = "1:1"
+        discover_selectors_with_metadata(mock_page)
+
+        mock_page.add_init_script.assert_called_once_with(script=_DC_JS_LIB)
+        installs = [c for c in mock_page.evaluate.call_args_list if c.args[0] == _DC_JS_LIB]
+        assert len(installs) == 1
+
+
+class TestScanCache:
+    """Tests for reusing scans while the document is unchanged."""
+
+    RESULTS = [
+        {"kind": "button", "tag": "button", "text": "Save", "selectorText": "Save",
+         "inShadow": False, "box": None, "attrs": {}},
+    ]
+
+    def test_unchanged_document_reuses_scan(self):
+        """Back-to-back discovery calls should scan the page once."""
+        page = scan_page(self.RESULTS)
+
+        selectors = discover_selectors(page)
+        metadata = discover_selectors_with_metadata(page)
+
+        assert len(scan_calls(page)) == 1
+        assert set(selectors) == set(metadata) == {"button_save"}
+
+    def test_mutation_invalidates_scan(self):
+        page = scan_page(self.RESULTS)
+
+        discover_selectors(page)
+        page.revision = "1:5"
+        discover_selectors(page)
+
+        assert len(scan_calls(page)) == 2
+
+    def test_url_and_visibility_are_part_of_the_key(self):
+        page = scan_page(self.RESULTS)
+
+        discover_selectors(page)
+        discover_selectors(page, include_hidden=True)
+        page.url = "http://localhost:3000/other"
+        discover_selectors(page, include_hidden=True)
+
+        assert len(scan_calls(page)) == 3
+
+    def test_revision_covers_scroll_and_viewport(self):
+        """Cached bounding boxes go stale when the page scrolls or resizes."""
+        for name in ("scrollX", "scrollY", "innerWidth", "innerHeight"):
+            assert f"window.{name}" in _DOM_REVISION_JS
+
+    def test_no_revision_disables_cache(self):
+        page = scan_page(self.RESULTS, revision=None)
+
+        discover_selectors(page)
+        discover_selectors(page)
+
+        assert len(scan_calls(page)) == 2
+
+
+class TestDiscoverSelectorsCompiled:
+    """Tests for discover_selectors_compiled."""
+
+    RESULTS = [
+        {"kind": "input", "tag": "input", "text": "", "selectorText": "",
+         "inShadow": False, "box": None, "attrs": {"name": "q"}},
+    ]
+
+    def test_returns_selectors_with_locators(self):
+        page = scan_page(self.RESULTS)
+
+        result = discover_selectors_compiled(page)
+
+        compiled = result["input_q"]
+        assert isinstance(compiled, CompiledSelector)
+        assert compiled.selector == "input[name='q']"
+        assert compiled.locator is page.locator.return_value
+        page.locator.assert_called_once_with("input[name='q']")
+
+    def test_locators_reused_across_calls(self):
+        """Cached elements should hand back the same locator objects."""
+        page = scan_page(self.RESULTS)
+
+        first = discover_selectors_compiled(page)
+        second = discover_selectors_compiled(page)
+
+        assert first["input_q"].locator is second["input_q"].locator
+        page.locator.assert_called_once()
+
+    def test_locator_not_in_dict(self):
+        element = DiscoveredElement(
+            tag="input", text="", selector="input", selector_type="name", priority=4
+        )
+        element.get_locator(MagicMock())
+
+        assert "_locator" not in element.to_dict()
+
+
+class TestAnalyzeElement:
+    """Tests for reading element details from the page."""
+
+    def test_reads_element_in_one_call(self):
+        """Tag, text, box and attributes should come from a single evaluate."""
+        locator = MagicMock()
+        locator.evaluate.return_value = {
+            "tag": "input",
+            "text": "",
+            "selectorText": "",
+            "inShadow": False,
+            "box": None,
+            "attrs": {"name": "email"},
+        }
+        discovery = SelectorDiscovery(base_url="http://localhost:3000")
+
+        element = discovery._analyze_element(locator, "input")
+
+        locator.evaluate.assert_called_once()
+        locator.get_attribute.assert_not_called()
+        locator.bounding_box.assert_not_called()
+        assert element.selector == "input[name='email']"
+        assert element.attributes == {"name": "email"}
+        assert element.bounding_box is None
 
 
 class TestValidateSelector:
@@ -221,3 +657,34 @@ class TestValidateSelector:
         result = validate_selector(mock_page, "[data-testid='nonexistent']")
 
         assert result is False
+
+
+class TestSuggestAlternativeSelectors:
+    """Tests for suggest_alternative_selectors."""
+
+    def test_builds_selectors_from_one_scan(self):
+        """Candidates from a single evaluate should become selectors in order."""
+        mock_page = MagicMock()
+        mock_page.evaluate.return_value = [
+            {"kind": "test-id", "value": "save"},
+            {"kind": "aria-label", "value": "Save draft"},
+            {"kind": "role", "value": "button"},
+        ]
+
+        result = suggest_alternative_selectors(mock_page, "#missing", "Save")
+
+        mock_page.evaluate.assert_called_once()
+        assert mock_page.evaluate.call_args.args[1]["description"] == "save"
+        mock_page.get_by_role.assert_not_called()
+        assert result == [
+            "[data-testid='save']",
+            "[aria-label='Save draft']",
+            'role=button[name="Save"]',
+        ]
+
+    def test_returns_empty_on_error(self):
+        """Evaluation failures should yield no suggestions."""
+        mock_page = MagicMock()
+        mock_page.evaluate.side_effect = Exception("Page closed")
+
+        assert suggest_alternative_selectors(mock_page, "#missing", "Save") == []
@@ -1,12 +1,14 @@
 """Tests for smart waiting utilities."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from utils.smart_wait import (
     DEFAULT_LOADING_SELECTORS,
     smart_wait,
+    smart_wait_async,
     wait_for_element_stable,
     wait_for_idle,
     wait_for_no_animation,
@@ -60,9 +62,18 @@ class TestSmartWait:
         smart_wait(page, loading_selectors=custom_selectors)
 
         call_args = page.wait_for_function.call_args
-        js_code = call_args[0][0]
-        assert ".my-loader" in js_code
-        assert ".custom-spinner" in js_code
+        assert call_args.kwargs["arg"] == ".my-loader, .custom-spinner"
+
+    def test_loading_indicator_script_is_constant(self):
+        """Selectors should be passed as an argument, not baked into the JS."""
+        page = MagicMock()
+
+        smart_wait(page)
+        smart_wait(page, loading_selectors=[".my-loader"])
+
+        first, second = page.wait_for_function.call_args_list
+        assert first.args[0] == second.args[0]
+        assert first.kwargs["arg"] == ", ".join(DEFAULT_LOADING_SELECTORS)
 
     def test_handles_network_idle_timeout(self):
         """Should continue if network idle times out."""
@@ -81,6 +92,52 @@ class TestSmartWait:
         smart_wait(page)
 
 
+class TestSmartWaitAsync:
+    """Tests for smart_wait_async function."""
+
+    def test_runs_network_and_indicator_waits_concurrently(self):
+        """Both waits should be in flight before either finishes."""
+        started = []
+        released = []
+
+        async def run():
+            gate = asyncio.Event()
+
+            def waiter(name):
+                async def wait(*args, **kwargs):
+                    started.append(name)
+                    if len(started) == 2:
+                        gate.set()
+                    await asyncio.wait_for(gate.wait(), timeout=1)
+                    released.append(name)
+                return wait
+
+            page = MagicMock()
+            page.wait_for_load_state = AsyncMock(side_effect=waiter("network"))
+            page.wait_for_function = AsyncMock(side_effect=waiter("indicators"))
+            page.wait_for_timeout = AsyncMock()
+
+            await smart_wait_async(page, animation_settle_ms=100)
+            return page
+
+        page = asyncio.run(run())
+
+        assert sorted(released) == ["indicators", "network"]
+        page.wait_for_load_state.assert_awaited_once()
+        page.wait_for_timeout.assert_awaited_once_with(100)
+
+    def test_continues_after_timeouts(self):
+        """Timeouts in either wait should not raise."""
+        page = MagicMock()
+        page.wait_for_load_state = AsyncMock(side_effect=Exception("Timeout"))
+        page.wait_for_function = AsyncMock(side_effect=Exception("Timeout"))
+        page.wait_for_timeout = AsyncMock()
+
+        asyncio.run(smart_wait_async(page))
+
+        page.wait_for_timeout.assert_awaited_once()
+
+
 class TestWaitForElementStable:
     """Tests for wait_for_element_stable function."""
 
@@ -111,6 +168,7 @@ class TestWaitForElementStable:
         call_args = page.wait_for_function.call_args
         js_code = call_args[0][0]
         assert "querySelector" in js_code
+        assert call_args.kwargs["arg"][0] == ".test-element"
 
     def test_custom_stability_time(self):
         """Should use custom stability time."""
@@ -119,7 +177,19 @@ class TestWaitForElementStable:
         wait_for_element_stable(page, ".my-element", stability_ms=1000)
 
         call_args = page.wait_for_function.call_args
-        assert 1000 in call_args[0][1]
+        assert call_args.kwargs["arg"] == [".my-element", 1000]
+
+    def test_compares_bounding_box_each_frame(self):
+        """Should compare the element's box once per frame to catch any movement."""
+        page = MagicMock()
+
+        wait_for_element_stable(page, ".my-element")
+
+        js_code = page.wait_for_function.call_args[0][0]
+        assert "getBoundingClientRect" in js_code
+        assert "rect.x !== last.x" in js_code
+        assert "requestAnimationFrame" in js_code
+        assert "setTimeout" not in js_code
 
 
 class TestWaitForNoAnimation:
@@ -190,4 +260,13 @@ class TestWaitForIdle:
         wait_for_idle(page, idle_time_ms=1000)
 
         call_args = page.wait_for_function.call_args
-        assert call_args[0][1] == 1000
+        assert call_args.kwargs["arg"] == 1000
+
+    def test_checks_in_idle_callbacks(self):
+        """Should schedule idle checks with requestIdleCallback."""
+        page = MagicMock()
+
+        wait_for_idle(page)
+
+        js_code = page.wait_for_function.call_args[0][0]
+        assert "requestIdleCallback" in js_code
@@ -2,9 +2,11 @@
 
 import json
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from utils import stage_cache
 from utils.stage_cache import (
     CachedStageRunner,
     StageCache,
@@ -63,6 +65,125 @@ class TestStageSignature:
         assert sig.input_hash == "abc123"
 
 
+class TestFingerprint:
+    """Tests for fingerprint hashing."""
+
+    def test_sha256_fallback(self):
+        """Should truncate SHA-256 when BLAKE3 is unavailable."""
+        import hashlib
+
+        with patch.object(stage_cache, "BLAKE3_AVAILABLE", False):
+            result = stage_cache._fingerprint(b"data")
+
+        assert result == hashlib.sha256(b"data").hexdigest()[:16]
+
+    def test_uses_blake3_when_available(self):
+        """Should hash with BLAKE3 and enable threads for large inputs."""
+        hasher = MagicMock()
+        hasher.hexdigest.return_value = "ab" * 32
+        factory = MagicMock(return_value=hasher)
+        factory.AUTO = -1
+
+        with patch.object(stage_cache, "BLAKE3_AVAILABLE", True), \
+             patch.object(stage_cache, "blake3", factory, create=True):
+            result = stage_cache._fingerprint(b"video", parallel=True)
+
+        factory.assert_called_once_with(max_threads=-1)
+        hasher.update.assert_called_once_with(b"video")
+        assert result == "ab" * 8
+
+    def test_keyed_uses_blake3_key(self):
+        """Should pass the stage key to BLAKE3's keyed mode."""
+        factory = MagicMock()
+        factory.return_value.hexdigest.return_value = "cd" * 32
+        key = bytes(32)
+
+        with patch.object(stage_cache, "BLAKE3_AVAILABLE", True), \
+             patch.object(stage_cache, "blake3", factory, create=True):
+            result = stage_cache._keyed_fingerprint(b"inputs", key)
+
+        factory.assert_called_once_with(b"inputs", key=key)
+        assert result == "cd" * 8
+
+    def test_keyed_blake2b_fallback(self):
+        """Should fall back to keyed BLAKE2b."""
+        import hashlib
+
+        key = bytes(range(32))
+        with patch.object(stage_cache, "BLAKE3_AVAILABLE", False):
+            result = stage_cache._keyed_fingerprint(b"inputs", key)
+
+        assert result == hashlib.blake2b(b"inputs", key=key, digest_size=8).hexdigest()
+
+    def test_hash_file_matches_in_memory(self, tmp_path):
+        """Should stream a file to the same fingerprint as its bytes."""
+        data = bytes(range(256)) * 1000
+        path = tmp_path / "video.mp4"
+        path.write_bytes(data)
+
+        result = stage_cache._hash_file(path, chunk_size=4096)
+
+        assert result == stage_cache._fingerprint(data)
+
+    def test_hash_empty_file(self, tmp_path):
+        """Should fingerprint an empty file."""
+        path = tmp_path / "empty.json"
+        path.write_bytes(b"")
+
+        assert stage_cache._hash_file(path) == stage_cache._fingerprint(b"")
+
+
+class TestFileHashCache:
+    """Tests for the stat-keyed file fingerprint cache."""
+
+    def test_skips_unchanged_file(self, tmp_path):
+        """Should not re-hash a file whose stat is unchanged."""
+        path = tmp_path / "outline.md"
+        path.write_text("# Outline")
+        first = stage_cache._FileHashCache(tmp_path / ".cache")
+        expected = first.fingerprint(path)
+        first.save()
+
+        second = stage_cache._FileHashCache(tmp_path / ".cache")
+        with patch.object(stage_cache, "_hash_file") as mock_hash:
+            result = second.fingerprint(path)
+
+        mock_hash.assert_not_called()
+        assert result == expected
+
+    def test_rehashes_modified_file(self, tmp_path):
+        """Should re-hash when size or mtime changes."""
+        import os
+
+        path = tmp_path / "narration.json"
+        path.write_text("{}")
+        cache = stage_cache._FileHashCache(tmp_path / ".cache")
+        before = cache.fingerprint(path)
+
+        path.write_text('{"segments": [1]}')
+        os.utime(path, ns=(1, 1))
+
+        assert cache.fingerprint(path) != before
+
+    def test_save_only_when_dirty(self, tmp_path):
+        """Should not write the cache file when nothing was hashed."""
+        cache = stage_cache._FileHashCache(tmp_path / ".cache")
+
+        cache.save()
+
+        assert not cache.cache_file.exists()
+
+    def test_corrupt_cache_file(self, tmp_path):
+        """Should start empty when the cache file is unreadable."""
+        (tmp_path / "file_fingerprints.json").write_text("not json")
+        path = tmp_path / "outline.md"
+        path.write_text("# Outline")
+
+        cache = stage_cache._FileHashCache(tmp_path)
+
+        assert cache.fingerprint(path) == stage_cache._hash_file(path)
+
+
 class TestStageCache:
     """Tests for StageCache class."""
 
@@ -92,6 +213,88 @@ class TestStageCache:
 
         assert hash1 != hash2
 
+    def test_compute_hash_keyed_by_serializer(self, tmp_path):
+        """Should never compare hashes across orjson and stdlib json."""
+        cache = StageCache(tmp_path)
+        # Even inputs both serializers format alike get distinct hashes
+        inputs = {"key": "value"}
+
+        fast = cache.compute_hash(inputs)
+        with patch("utils.stage_cache.ORJSON_AVAILABLE", False):
+            slow = cache.compute_hash(inputs)
+
+        assert fast != slow
+
+    def test_skip_requires_same_serializer(self, tmp_path):
+        """Should rerun a stage recorded under the other serializer."""
+        with patch("utils.stage_cache.ORJSON_AVAILABLE", False):
+            StageCache(tmp_path).record_completion("test", {"key": "value"})
+
+        cache = StageCache(tmp_path)
+
+        assert cache.should_skip("test", {"key": "value"}) is False
+
+    def test_compute_hash_keyed_by_stage(self, tmp_path):
+        """Should hash the same inputs differently per stage."""
+        cache = StageCache(tmp_path)
+
+        assert cache.compute_hash({"key": "value"}, "script") != cache.compute_hash(
+            {"key": "value"}, "audio"
+        )
+
+    def test_compute_hash_keyed_by_schema_version(self, tmp_path):
+        """Should change every hash when the schema version changes."""
+        cache = StageCache(tmp_path)
+        before = cache.compute_hash({"key": "value"}, "script")
+
+        stage_cache._stage_key.cache_clear()
+        try:
+            with patch.object(stage_cache, "SCHEMA_VERSION", 99):
+                after = cache.compute_hash({"key": "value"}, "script")
+        finally:
+            stage_cache._stage_key.cache_clear()
+
+        assert before != after
+
+    def test_drops_signatures_from_old_schema(self, tmp_path):
+        """Should ignore signatures written under another schema version."""
+        (tmp_path / "stage_signatures.json").write_text(json.dumps({
+            "signatures": {
+                "old": {"stage_name": "old", "input_hash": "abc"},
+                "new": {
+                    "stage_name": "new",
+                    "input_hash": "def",
+                    "schema_version": stage_cache.SCHEMA_VERSION,
+                },
+            },
+        }))
+
+        cache = StageCache(tmp_path)
+
+        assert cache.get_cached_stages() == {"new"}
+
+    def test_saved_signature_matches_to_dict(self, tmp_path):
+        """Should write signatures in the to_dict layout on both paths."""
+        for orjson_available in (True, False):
+            cache_dir = tmp_path / str(orjson_available)
+            with patch("utils.stage_cache.ORJSON_AVAILABLE", orjson_available):
+                cache = StageCache(cache_dir)
+                cache.record_completion("test", {"key": "value"})
+
+            saved = json.loads(cache.cache_file.read_text())["signatures"]["test"]
+            assert saved == cache._signatures["test"].to_dict()
+
+    def test_load_stdlib_written_cache(self, tmp_path):
+        """Should load a cache file written by stdlib json."""
+        with patch("utils.stage_cache.ORJSON_AVAILABLE", False):
+            StageCache(tmp_path).record_completion("test", {"key": "value"})
+
+        cache = StageCache(tmp_path)
+
+        assert cache.get_cached_stages() == {"test"}
+        with patch("utils.stage_cache.ORJSON_AVAILABLE", False):
+            assert cache.should_skip("test", {"key": "value"}) is True
+
     def test_should_skip_no_cache(self, tmp_path):
         """Should not skip when no cache exists."""
         cache = StageCache(tmp_path)
@@ -154,6 +357,26 @@ class TestStageCache:
 
         assert result is True
 
+    def test_length_mismatch_skips_hashing(self, tmp_path):
+        """Should reject changed inputs by length without hashing them."""
+        cache = StageCache(tmp_path)
+        cache.record_completion("test", {"key": "value"})
+
+        with patch.object(stage_cache, "_keyed_fingerprint") as mock_hash:
+            result = cache.should_skip("test", {"key": "value", "extra": 1})
+
+        assert result is False
+        mock_hash.assert_not_called()
+
+    def test_signature_without_length(self, tmp_path):
+        """Should still match signatures recorded without an input length."""
+        cache = StageCache(tmp_path)
+        cache.record_completion("test", {"key": "value"})
+        cache._signatures["test"].input_len = 0
+
+        assert cache.should_skip("test", {"key": "value"}) is True
+        assert cache.should_skip("test", {"key": "other"}) is False
+
     def test_invalidate(self, tmp_path):
         """Should invalidate stage cache."""
         cache = StageCache(tmp_path)
@@ -178,6 +401,37 @@ class TestStageCache:
         assert cache.should_skip("stage2", {"key": "value"}) is False
         assert cache.should_skip("stage3", {"key": "value"}) is False
 
+    def test_invalidate_downstream_unknown_stage(self, tmp_path):
+        """Should ignore a stage that is not in the order."""
+        cache = StageCache(tmp_path)
+        cache.record_completion("stage1", {"key": "value"})
+
+        cache.invalidate_downstream("missing", ["stage1"], {"stage1": 0})
+
+        assert cache.get_cached_stages() == {"stage1"}
+
+    def test_invalidate_downstream_saves_once(self, tmp_path):
+        """Should write the cache file once for the whole invalidation."""
+        cache = StageCache(tmp_path)
+        stages = ["stage1", "stage2", "stage3"]
+        for stage in stages:
+            cache.record_completion(stage, {"key": "value"})
+
+        with patch.object(cache, "_save") as mock_save:
+            cache.invalidate_downstream("stage1", stages)
+
+        mock_save.assert_called_once()
+        assert StageCache(tmp_path).get_cached_stages() == set(stages)
+
+    def test_save_replaces_atomically(self, tmp_path):
+        """Should leave no temp file behind after saving."""
+        cache = StageCache(tmp_path)
+
+        cache.record_completion("test", {"key": "value"})
+
+        assert cache.cache_file.exists()
+        assert not (tmp_path / "stage_signatures.json.tmp").exists()
+
     def test_clear(self, tmp_path):
         """Should clear all cached signatures."""
         cache = StageCache(tmp_path)
@@ -200,6 +454,117 @@ class TestStageCache:
         assert cache2.should_skip("test", {"key": "value"}) is True
 
 
+class TestOutputStore:
+    """Tests for restoring stage outputs by input hash."""
+
+    def test_restores_deleted_output(self, tmp_path):
+        """Should restore a missing output and skip."""
+        cache = StageCache(tmp_path / ".cache")
+        output_file = tmp_path / "script.json"
+        output_file.write_text('{"v": 1}')
+        cache.record_completion("script", {"outline": "a"}, [output_file])
+
+        output_file.unlink()
+
+        assert cache.should_skip("script", {"outline": "a"}, [output_file]) is True
+        assert output_file.read_text() == '{"v": 1}'
+
+    def test_restores_outputs_for_reverted_inputs(self, tmp_path):
+        """Should bring back outputs produced by an earlier run."""
+        cache = StageCache(tmp_path / ".cache")
+        output_file = tmp_path / "script.json"
+
+        output_file.write_text("first")
+        cache.record_completion("script", {"outline": "a"}, [output_file])
+        output_file.unlink()
+        output_file.write_text("second")
+        cache.record_completion("script", {"outline": "b"}, [output_file])
+
+        assert cache.should_skip("script", {"outline": "a"}, [output_file]) is True
+        assert output_file.read_text() == "first"
+        assert cache.should_skip("script", {"outline": "b"}, [output_file]) is True
+        assert output_file.read_text() == "second"
+
+    def test_rejects_output_changed_in_place(self, tmp_path):
+        """Should not restore a stored output that was rewritten."""
+        import os
+
+        cache = StageCache(tmp_path / ".cache")
+        output_file = tmp_path / "script.json"
+        output_file.write_text("first")
+        cache.record_completion("script", {"outline": "a"}, [output_file])
+
+        output_file.write_text("rewritten in place")
+        os.utime(output_file, ns=(1, 1))
+        cache.invalidate("script")
+
+        assert cache.should_skip("script", {"outline": "a"}, [output_file]) is False
+
+    def test_outputs_with_same_basename(self, tmp_path):
+        """Outputs sharing a file name in different directories should both restore."""
+        cache = StageCache(tmp_path / ".cache")
+        first = tmp_path / "a" / "out.json"
+        second = tmp_path / "b" / "out.json"
+        for path, content in ((first, "a"), (second, "b")):
+            path.parent.mkdir()
+            path.write_text(content)
+        cache.record_completion("render", {"v": 1}, [first, second])
+
+        first.unlink()
+        second.unlink()
+
+        assert cache.should_skip("render", {"v": 1}, [first, second]) is True
+        assert first.read_text() == "a"
+        assert second.read_text() == "b"
+
+    def test_prunes_least_recently_used_runs(self, tmp_path):
+        """Only the most recently used input hashes should keep stored outputs."""
+        import os
+
+        from utils.stage_cache import MAX_STORED_RUNS
+
+        cache = StageCache(tmp_path / ".cache")
+        output_file = tmp_path / "script.json"
+        store = tmp_path / ".cache" / "cas" / "script"
+
+        def record(i):
+            output_file.unlink(missing_ok=True)
+            output_file.write_text(str(i))
+            cache.record_completion("script", {"outline": i}, [output_file])
+            # Filesystem timestamps are coarse; give each run its own second
+            entry = store / cache.compute_hash({"outline": i}, "script")
+            os.utime(entry / "outputs.json", ns=(i * 10**9, i * 10**9))
+
+        for i in range(MAX_STORED_RUNS + 1):
+            record(i)
+
+        assert len(list(store.iterdir())) == MAX_STORED_RUNS
+        output_file.unlink()
+        assert cache.should_skip("script", {"outline": 0}, [output_file]) is False
+
+        # Restoring run 1 marks it as used, so run 2 is pruned next instead
+        assert cache.should_skip("script", {"outline": 1}, [output_file]) is True
+        record(MAX_STORED_RUNS + 1)
+
+        output_file.unlink()
+        assert cache.should_skip("script", {"outline": 2}, [output_file]) is False
+        assert cache.should_skip("script", {"outline": 1}, [output_file]) is True
+        assert output_file.read_text() == "1"
+
+    def test_clear_removes_store(self, tmp_path):
+        """Should drop stored outputs on clear."""
+        cache = StageCache(tmp_path / ".cache")
+        output_file = tmp_path / "script.json"
+        output_file.write_text("first")
+        cache.record_completion("script", {"outline": "a"}, [output_file])
+
+        cache.clear()
+        output_file.unlink()
+
+        assert cache.should_skip("script", {"outline": "a"}, [output_file]) is False
+        assert not (tmp_path / ".cache" / "cas").exists()
+
+
 class TestCachedStageRunner:
     """Tests for CachedStageRunner class."""
 
@@ -261,6 +626,47 @@ class TestCachedStageRunner:
 
         assert runner.should_run("test", {"key": "value"}) is False
 
+    def test_run_stage_hashes_inputs_once(self, tmp_path):
+        """Should reuse the skip-check hash when recording completion."""
+        runner = CachedStageRunner(tmp_path)
+
+        with patch.object(
+            stage_cache, "_keyed_fingerprint", wraps=stage_cache._keyed_fingerprint
+        ) as mock_hash:
+            runner.run_stage("test", {"key": "value"}, lambda: {"status": "success"})
+
+        assert mock_hash.call_count == 1
+        assert runner.cache._hash_memo is None
+
+    def test_hash_memo_ignores_other_dicts(self, tmp_path):
+        """Should not reuse a hash for a different inputs dict."""
+        cache = StageCache(tmp_path)
+
+        with cache._hash_memo_scope():
+            first = cache.compute_hash({"key": "a"}, "test")
+            second = cache.compute_hash({"key": "b"}, "test")
+
+        assert first != second
+
+    def test_stage_index_matches_order(self):
+        """Should index every stage by its position in STAGE_ORDER."""
+        for i, name in enumerate(CachedStageRunner.STAGE_ORDER):
+            assert CachedStageRunner.STAGE_INDEX[name] == i
+
+    def test_failure_invalidates_downstream(self, tmp_path):
+        """Should drop the failed stage and everything after it."""
+        runner = CachedStageRunner(tmp_path)
+        for stage in ["outline", "script", "record", "audio"]:
+            runner.mark_complete(stage, {"key": "value"})
+
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            runner.run_stage("record", {"key": "changed"}, failing)
+
+        assert runner.cache.get_cached_stages() == {"outline", "script"}
+
     def test_reset(self, tmp_path):
         """Should reset all stage caches."""
         runner = CachedStageRunner(tmp_path)
@@ -292,6 +698,18 @@ class TestGetStageInputs:
 
         assert "outline_hash" in result
         assert "selectors_hash" in result
+        assert (tmp_path / ".cache" / "file_fingerprints.json").exists()
+        assert result["outline_hash"] == stage_cache._hash_file(tmp_path / "outline.md")
+        assert result["selectors_hash"] == stage_cache._hash_file(tmp_path / "selectors.json")
+
+    def test_script_stage_missing_file(self, tmp_path):
+        """Should leave out inputs whose files do not exist."""
+        (tmp_path / "manifest.json").write_text(json.dumps({"stages": []}))
+        (tmp_path / "outline.md").write_text("# Outline")
+
+        result = get_stage_inputs(tmp_path, "script")
+
+        assert set(result) == {"outline_hash"}
 
     def test_audio_stage(self, tmp_path):
         """Should extract inputs for audio stage."""
@@ -302,3 +720,18 @@ class TestGetStageInputs:
         result = get_stage_inputs(tmp_path, "audio")
 
         assert "narration_hash" in result
+
+    def test_composite_stage(self, tmp_path):
+        """Should fingerprint the recording for composite stage."""
+        manifest = {"stages": []}
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+        (tmp_path / "demo_recording.webm").write_bytes(b"\x1a\x45\xdf\xa3" * 1000)
+        (tmp_path / "audio").mkdir()
+        (tmp_path / "audio" / "segment_1.mp3").write_bytes(b"mp3")
+
+        result = get_stage_inputs(tmp_path, "composite")
+
+        assert result["video_hash"] == stage_cache._fingerprint(
+            b"\x1a\x45\xdf\xa3" * 1000
+        )
+        assert result["audio_count"] == 1
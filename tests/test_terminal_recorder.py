@@ -1,6 +1,7 @@
 """Tests for terminal recorder utilities."""
 
 import json
+import re
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -73,6 +74,21 @@ class TestTerminalAction:
         assert action.action_type == "wait_for"
         assert action.pattern == "Success"
 
+    def test_compiles_pattern_once(self):
+        """Should compile the wait_for pattern on first use and reuse it."""
+        action = TerminalAction(action_type="wait_for", pattern=r"Done in \d+s")
+
+        compiled = action.get_compiled_pattern()
+
+        assert compiled.search("Done in 12s")
+        assert action.get_compiled_pattern() is compiled
+
+    def test_invalid_pattern_does_not_raise_on_construction(self):
+        action = TerminalAction(action_type="wait_for", pattern="Done (")
+
+        with pytest.raises(re.error):
+            action.get_compiled_pattern()
+
 
 class TestTerminalScene:
     """Tests for TerminalScene dataclass."""
@@ -193,6 +209,77 @@ class TestAsciicastWriter:
         # Second event should have later timestamp
         assert event2[0] > event1[0]
 
+    def test_batches_keystrokes(self, tmp_path):
+        """Should combine queued keystrokes into one event."""
+        cast_path = tmp_path / "test.cast"
+
+        with AsciicastWriter(cast_path, width=80, height=24) as writer:
+            for char in "echo":
+                writer.write_output_batched(char, flush_ms=10_000)
+
+        lines = cast_path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])[1:] == ["o", "echo"]
+
+    def test_batch_flushes_at_max_chars(self, tmp_path):
+        """Should flush once max_chars have queued."""
+        cast_path = tmp_path / "test.cast"
+
+        with AsciicastWriter(cast_path, width=80, height=24) as writer:
+            for char in "abcde":
+                writer.write_output_batched(char, flush_ms=10_000, max_chars=2)
+
+        events = [json.loads(line)[2] for line in cast_path.read_text().splitlines()[1:]]
+        assert events == ["ab", "cd", "e"]
+
+    def test_direct_write_flushes_batch_first(self, tmp_path):
+        """Should keep queued keystrokes ahead of later output."""
+        cast_path = tmp_path / "test.cast"
+
+        with AsciicastWriter(cast_path, width=80, height=24) as writer:
+            writer.write_output_batched("ls", flush_ms=10_000)
+            writer.write_output("\n")
+            writer.write_output("file.txt")
+
+        events = [json.loads(line) for line in cast_path.read_text().splitlines()[1:]]
+        assert [e[2] for e in events] == ["ls", "\n", "file.txt"]
+        assert events[0][0] <= events[1][0]
+
+    def test_stdlib_fallback(self, tmp_path):
+        """Should write valid events without orjson."""
+        cast_path = tmp_path / "test.cast"
+
+        with patch("utils.terminal_recorder.ORJSON_AVAILABLE", False):
+            with AsciicastWriter(cast_path, width=80, height=24) as writer:
+                writer.write_output("caf\u00e9\r\n")
+                writer.write_input("ls")
+
+        lines = cast_path.read_text().splitlines()
+        assert json.loads(lines[1])[1:] == ["o", "caf\u00e9\r\n"]
+        assert json.loads(lines[2])[1:] == ["i", "ls"]
+
+    def test_cast_duration_from_last_event(self, tmp_path):
+        """Should read the duration from the final event."""
+        cast_path = tmp_path / "test.cast"
+        cast_path.write_text('{"version": 2}\n[0.5, "o", "a"]\n[2.25, "o", "b"]\n')
+
+        assert TerminalRecorder()._get_cast_duration(cast_path) == 2.25
+
+    def test_cast_duration_long_file(self, tmp_path):
+        """Should find the last event across several read blocks."""
+        cast_path = tmp_path / "test.cast"
+        events = "".join(f'[{i / 10}, "o", "{"x" * 100}"]\n' for i in range(500))
+        cast_path.write_text('{"version": 2}\n' + events)
+
+        assert TerminalRecorder()._get_cast_duration(cast_path) == 49.9
+
+    def test_cast_duration_header_only(self, tmp_path):
+        """Should report zero when there are no events."""
+        cast_path = tmp_path / "test.cast"
+        cast_path.write_text('{"version": 2}\n')
+
+        assert TerminalRecorder()._get_cast_duration(cast_path) == 0
+
 
 class TestParseTerminalScript:
     """Tests for parse_terminal_script function."""
@@ -219,6 +306,25 @@ scenes:
         assert scenes[0].actions[0].text == "npm install"
         assert scenes[0].actions[0].delay_after == 2000
 
+    def test_parses_json_script(self):
+        """Should parse a JSON script without the YAML loader."""
+        script = json.dumps({
+            "scenes": [{"name": "Build", "actions": [{"command": "make"}]}],
+        })
+
+        with patch("yaml.load") as mock_yaml:
+            scenes = parse_terminal_script(script)
+
+        mock_yaml.assert_not_called()
+        assert scenes[0].actions[0].text == "make"
+
+    def test_parses_yaml_flow_style(self):
+        """Should fall back to YAML for flow style that is not JSON."""
+        scenes = parse_terminal_script("{scenes: [{name: Build, actions: [{command: make}]}]}")
+
+        assert scenes[0].name == "Build"
+        assert scenes[0].actions[0].text == "make"
+
     def test_parses_wait_for_action(self):
         """Should parse wait_for actions."""
         yaml_content = """
@@ -235,6 +341,7 @@ scenes:
         action = scenes[0].actions[0]
         assert action.action_type == "wait_for"
         assert action.pattern == "Success"
+        assert action.get_compiled_pattern().pattern == "Success"
 
     def test_parses_complex_script(self):
         """Should parse complex script with multiple action types."""
@@ -286,3 +393,245 @@ class TestTerminalRecorder:
         """Should accept custom config."""
         assert recorder_with_config.config.cols == 80
         assert recorder_with_config.config.mistake_probability == 0.0
+
+    def test_invalid_wait_for_pattern_fails_recording(self, recorder, tmp_path):
+        """A bad regex should give a failed result rather than raise."""
+        scene = TerminalScene(
+            name="Broken",
+            actions=[TerminalAction(action_type="wait_for", pattern="Done (")],
+        )
+
+        with patch.object(recorder, "_start_shell"), \
+             patch.object(recorder, "_stop_shell"), \
+             patch.object(recorder, "_read_output", return_value=""), \
+             patch("utils.terminal_recorder.time.sleep"):
+            result = recorder.record_script([scene], tmp_path / "demo.cast")
+
+        assert result.status == "failed"
+        assert "missing )" in result.error
+
+
+class TestReadOutput:
+    """Tests for draining PTY output."""
+
+    @pytest.fixture
+    def pipe_recorder(self):
+        """Create a recorder reading from a non-blocking pipe."""
+        import fcntl
+        import os
+
+        read_fd, write_fd = os.pipe()
+        flags = fcntl.fcntl(read_fd, fcntl.F_GETFL)
+        fcntl.fcntl(read_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        recorder = TerminalRecorder()
+        recorder._master_fd = read_fd
+        yield recorder, write_fd
+        os.close(read_fd)
+        try:
+            os.close(write_fd)
+        except OSError:
+            pass
+
+    def test_drains_buffered_output(self, pipe_recorder):
+        """Should return everything written before the read."""
+        import os
+
+        recorder, write_fd = pipe_recorder
+        os.write(write_fd, b"line one\n")
+        os.write(write_fd, b"line two\n")
+
+        assert recorder._read_output(timeout=0.05) == "line one\nline two\n"
+
+    def test_empty_after_timeout(self, pipe_recorder):
+        """Should return an empty string when nothing arrives."""
+        recorder, _ = pipe_recorder
+
+        assert recorder._read_output(timeout=0.01) == ""
+
+    def test_decodes_split_multibyte_character(self, pipe_recorder):
+        """Should decode characters split across reads."""
+        import os
+
+        recorder, write_fd = pipe_recorder
+        encoded = "caf\u00e9".encode()
+        os.write(write_fd, encoded[:4])
+        os.write(write_fd, encoded[4:])
+
+        assert recorder._read_output(timeout=0.05) == "caf\u00e9"
+
+    def test_stops_at_eof(self, pipe_recorder):
+        """Should stop when the other end closes."""
+        import os
+
+        recorder, write_fd = pipe_recorder
+        os.write(write_fd, b"bye")
+        os.close(write_fd)
+
+        assert recorder._read_output(timeout=1.0) == "bye"
+
+
+class TestTypeWithSimulation:
+    """Tests for simulated typing."""
+
+    def test_types_each_character(self):
+        """Should send and record every character in order."""
+        recorder = TerminalRecorder(TerminalConfig(mistake_probability=0.0))
+        writer = MagicMock()
+        batches = []
+
+        with patch.object(
+            recorder, "_send_input_parts", side_effect=lambda parts: batches.append(list(parts))
+        ), patch("utils.terminal_recorder.time.sleep"):
+            recorder._type_with_simulation("ls -la", writer)
+
+        assert batches == [[b"l", b"s", b" ", b"-", b"l"], [b"a"]]
+        assert [c.args[0] for c in writer.write_output_batched.call_args_list] == list("ls -la")
+
+    def test_pauses_longer_after_punctuation(self):
+        """Should scale the keystroke delay after punctuation."""
+        config = TerminalConfig(
+            typing_speed_min=0.1,
+            typing_speed_max=0.1,
+            mistake_probability=0.0,
+        )
+        recorder = TerminalRecorder(config)
+        writer = MagicMock()
+
+        with patch.object(recorder, "_send_input_parts"), \
+             patch("utils.terminal_recorder.time.time", return_value=100.0), \
+             patch("utils.terminal_recorder.time.sleep"):
+            recorder._type_with_simulation("a, b.", writer)
+
+        stamps = [c.kwargs["at"] - 100.0 for c in writer.write_output_batched.call_args_list]
+        gaps = [round(b - a, 6) for a, b in zip(stamps, stamps[1:], strict=False)]
+        assert gaps == [0.1, 0.2, 0.15, 0.1]
+
+    def test_sleeps_once_per_keystroke_batch(self):
+        """Should catch up to the typing schedule every few keystrokes."""
+        config = TerminalConfig(
+            typing_speed_min=0.1,
+            typing_speed_max=0.1,
+            mistake_probability=0.0,
+        )
+        recorder = TerminalRecorder(config)
+        now = [100.0]
+
+        def fake_sleep(seconds):
+            now[0] += seconds
+
+        with patch.object(recorder, "_send_input_parts"), \
+             patch("utils.terminal_recorder.time.time", side_effect=lambda: now[0]), \
+             patch("utils.terminal_recorder.time.sleep", side_effect=fake_sleep) as mock_sleep:
+            recorder._type_with_simulation("abcdefghijkl", MagicMock())
+
+        assert mock_sleep.call_count == 3
+        assert now[0] == pytest.approx(101.2)
+
+    def test_corrects_typos(self):
+        """Should type a wrong character and backspace over it."""
+        recorder = TerminalRecorder(TerminalConfig(mistake_probability=1.0))
+        writer = MagicMock()
+        sent = []
+
+        with patch.object(
+            recorder, "_send_input_parts", side_effect=lambda parts: sent.extend(parts)
+        ), patch("utils.terminal_recorder.time.sleep"):
+            recorder._type_with_simulation("ab", writer)
+
+        assert sent[1] == b"\x7f"
+        assert sent[2:] == [b"a", b"b"]
+
+    def test_sends_queued_keystrokes_with_writev(self):
+        """Should hand queued keystrokes to the PTY in one writev call."""
+        recorder = TerminalRecorder()
+        recorder._master_fd = 7
+
+        with patch("utils.terminal_recorder.os.writev", return_value=2) as mock_writev, \
+             patch("utils.terminal_recorder.os.write") as mock_write:
+            recorder._send_input_parts([b"l", b"s"])
+            recorder._send_input_parts([])
+
+        mock_writev.assert_called_once_with(7, [b"l", b"s"])
+        mock_write.assert_not_called()
+
+    def test_finishes_short_writev(self):
+        """Should write whatever a short writev left behind."""
+        recorder = TerminalRecorder()
+        recorder._master_fd = 7
+        written = []
+
+        def fake_write(fd, data):
+            written.append(bytes(data[:2]))
+            return len(written[-1])
+
+        with patch("utils.terminal_recorder.os.writev", return_value=1), \
+             patch("utils.terminal_recorder.os.write", side_effect=fake_write):
+            recorder._send_input_parts([b"ec", b"ho"])
+
+        assert written == [b"ch", b"o"]
+
+    def test_waits_for_full_pty_to_drain(self):
+        """Should select for writability when the PTY input buffer is full."""
+        recorder = TerminalRecorder()
+        recorder._master_fd = 7
+        results = [BlockingIOError(), 3]
+
+        def fake_write(fd, data):
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch("utils.terminal_recorder.os.write", side_effect=fake_write), \
+             patch("utils.terminal_recorder.select.select", return_value=([], [7], [])) as sel:
+            recorder._send_input("ls\n")
+
+        sel.assert_called_once()
+        assert results == []
+
+    def test_gives_up_when_shell_stops_reading(self):
+        recorder = TerminalRecorder()
+        recorder._master_fd = 7
+
+        with patch("utils.terminal_recorder.os.write", side_effect=BlockingIOError), \
+             patch("utils.terminal_recorder.select.select", return_value=([], [], [])):
+            with pytest.raises(TimeoutError):
+                recorder._send_input("ls\n")
+
+
+class TestWaitFor:
+    """Tests for the wait_for action."""
+
+    def test_matches_pattern_split_across_reads(self):
+        """Should find a match that straddles two reads."""
+        recorder = TerminalRecorder()
+        writer = MagicMock()
+        reads = iter(["x" * 1000 + "Build succ", "eeded", "never read"])
+        action = TerminalAction(
+            action_type="wait_for", pattern="Build succeeded", delay_after=5000
+        )
+
+        with patch.object(recorder, "_read_output", side_effect=lambda timeout: next(reads)):
+            recorder._execute_action(action, writer)
+
+        assert writer.write_output.call_count == 2
+
+    def test_matches_long_pattern_split_across_reads(self):
+        """Matches longer than a single read should still be found."""
+        recorder = TerminalRecorder()
+        writer = MagicMock()
+        reads = iter(["BEGIN" + "." * 400, "." * 400 + "END", "never read"])
+        action = TerminalAction(action_type="wait_for", pattern="BEGIN.*END", delay_after=5000)
+
+        with patch.object(recorder, "_read_output", side_effect=lambda timeout: next(reads)):
+            recorder._execute_action(action, writer)
+
+        assert writer.write_output.call_count == 2
+
+    def test_times_out_without_match(self):
+        """Should give up after the timeout."""
+        recorder = TerminalRecorder()
+        action = TerminalAction(action_type="wait_for", pattern="never", delay_after=50)
+
+        with patch.object(recorder, "_read_output", return_value="noise"):
+            recorder._execute_action(action, MagicMock())
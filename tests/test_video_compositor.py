@@ -0,0 +1,372 @@
+"""Tests for video compositing utilities."""
+
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utils.video_compositor import (
+    FFMPEG_ERROR_LINES,
+    SOFTWARE_ENCODER,
+    VideoCompositor,
+    _chunk_boundaries,
+    _run_ffmpeg,
+    _silence_gaps,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_encoder():
+    """Forget the encoder detected by earlier tests."""
+    VideoCompositor._encoder = None
+    yield
+    VideoCompositor._encoder = None
+
+
+def ffmpeg_cmd(mock_run):
+    """Get the compositing ffmpeg command from a patched _run_ffmpeg."""
+    cmds = [
+        c.args[0] for c in mock_run.call_args_list
+        if c.args[0][0] == "ffmpeg" and c.args[0][-1].endswith("final.mp4")
+    ]
+    assert len(cmds) == 1
+    return cmds[0]
+
+
+class TestCompositeFfmpeg:
+    """Tests for the ffmpeg CLI compositing path."""
+
+    @pytest.fixture
+    def demo_dir(self, tmp_path):
+        """Create a demo directory with a recording and two audio clips."""
+        (tmp_path / "demo_recording.mp4").write_bytes(b"video")
+        (tmp_path / "audio_scene_1.mp3").write_bytes(b"audio")
+        (tmp_path / "audio_scene_2.mp3").write_bytes(b"audio")
+        return tmp_path
+
+    @pytest.fixture
+    def clips(self):
+        return [
+            {"scene": 1, "path": "audio_scene_1.mp3"},
+            {"scene": 2, "path": "audio_scene_2.mp3"},
+        ]
+
+    @pytest.fixture
+    def timings(self):
+        return [
+            {"scene": 1, "start": 0, "end": 30},
+            {"scene": 2, "start": 30.5, "end": 60},
+        ]
+
+    def run_composite(
+        self, demo_dir, clips, timings, codec="vp9", cpus=4, durations=("60.0", "60.0")
+    ):
+        compositor = VideoCompositor(use_moviepy=False)
+        durations = iter(durations)
+
+        def probe(cmd, **kwargs):
+            if "format=duration" in cmd:
+                return MagicMock(stdout=f"{next(durations)}\n")
+            return MagicMock(stdout=f"{codec}\n")
+
+        with patch("utils.video_compositor.subprocess.run", side_effect=probe), \
+             patch("utils.video_compositor._run_ffmpeg") as mock_run, \
+             patch("utils.video_compositor.os.cpu_count", return_value=cpus):
+            compositor.composite(
+                str(demo_dir / "demo_recording.mp4"),
+                clips,
+                timings,
+                str(demo_dir / "final.mp4"),
+            )
+        return mock_run
+
+    def test_copies_h264_video(self, demo_dir, clips, timings):
+        """Should copy H.264 video instead of re-encoding it."""
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips, timings, codec="h264"))
+
+        i = cmd.index("-c:v")
+        assert cmd[i + 1] == "copy"
+        assert "libx264" not in cmd
+
+    def test_reencodes_other_codecs(self, demo_dir, clips, timings):
+        """Should re-encode video that is not H.264."""
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips, timings, codec="vp9"))
+
+        assert cmd[cmd.index("-c:v") + 1] == "libx264"
+        assert cmd[cmd.index("-preset") + 1] == "veryfast"
+
+    def test_sets_encoder_threads(self, demo_dir, clips, timings):
+        """Should give the encoder one thread per CPU."""
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips, timings, cpus=12))
+
+        assert cmd[cmd.index("-threads") + 1] == "12"
+
+    def test_offsets_clips_by_scene_start(self, demo_dir, clips, timings):
+        """Should shift each clip input to its scene's start time."""
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips, timings))
+
+        offsets = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-itsoffset"]
+        assert offsets == ["0", "30.5"]
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert "adelay" not in graph
+        assert graph.endswith("[a1][a2]amix=inputs=2[a]")
+
+    def test_skips_clips_without_timing(self, demo_dir, clips, timings):
+        """Should leave clips without a scene timing out of the mix."""
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips, timings[:1]))
+
+        assert cmd.count("-itsoffset") == 1
+
+    def test_single_clip_skips_amix(self, demo_dir, clips, timings):
+        """Should pad a lone clip straight to the output without amix."""
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips[:1], timings))
+
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph == "[1:a]aresample=async=1:first_pts=0[a]"
+        assert cmd[cmd.index("-map", cmd.index("-map") + 1) + 1] == "[a]"
+
+    def test_concats_sequential_clips(self, demo_dir, clips, timings):
+        """Should join non-overlapping clips with silence instead of amix."""
+        clips[0]["duration"] = 28
+        clips[1]["duration"] = 25
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips, timings))
+
+        assert "-itsoffset" not in cmd
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph == (
+            "[1:a]apad=whole_dur=30.500000,atrim=end=30.500000[c1];"
+            "[c1][2:a]concat=n=2:v=0:a=1[a]"
+        )
+
+    def test_concat_pins_clips_to_scene_starts(self, demo_dir, clips, timings):
+        """Should place clips by scene start, not by summed metadata durations."""
+        timings[0]["start"] = 4
+        clips[0]["duration"] = 20  # Estimated; the decoded clip may differ
+        clips[1]["duration"] = 25
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips, timings))
+
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph.startswith("anullsrc=d=4.000000[lead];")
+        assert "[1:a]apad=whole_dur=26.500000,atrim=end=26.500000[c1]" in graph
+        assert graph.endswith("[lead][c1][2:a]concat=n=3:v=0:a=1[a]")
+
+    def test_mixes_overlapping_clips(self, demo_dir, clips, timings):
+        """Should fall back to amix when a clip runs into the next scene."""
+        clips[0]["duration"] = 31
+        clips[1]["duration"] = 25
+        cmd = ffmpeg_cmd(self.run_composite(demo_dir, clips, timings))
+
+        assert cmd.count("-itsoffset") == 2
+        assert "amix=inputs=2" in cmd[cmd.index("-filter_complex") + 1]
+
+    def test_encodes_chunks_in_parallel_on_large_hosts(self, demo_dir, clips, timings):
+        """Should encode scene-aligned chunks and copy the joined video."""
+        mock_run = self.run_composite(demo_dir, clips, timings, cpus=16)
+
+        chunk_cmds = [
+            c.args[0] for c in mock_run.call_args_list
+            if "-an" in c.args[0]
+        ]
+        assert len(chunk_cmds) == 2
+        assert chunk_cmds[0][chunk_cmds[0].index("-to") + 1] == "30.5"
+        assert chunk_cmds[1][chunk_cmds[1].index("-ss") + 1] == "30.5"
+        assert all(c[c.index("-threads") + 1] == "8" for c in chunk_cmds)
+
+        cmd = ffmpeg_cmd(mock_run)
+        assert cmd[2].endswith("video.mp4")
+        assert cmd[cmd.index("-c:v") + 1] == "copy"
+
+    def test_chunks_seek_after_input(self, demo_dir, clips, timings):
+        """Should trim each chunk on the output side for frame-exact cuts."""
+        mock_run = self.run_composite(demo_dir, clips, timings, cpus=16)
+
+        for cmd in (c.args[0] for c in mock_run.call_args_list if "-an" in c.args[0]):
+            assert cmd.index("-i") < cmd.index("-ss")
+            if "-to" in cmd:
+                assert cmd.index("-i") < cmd.index("-to")
+
+    def test_discards_chunks_with_wrong_duration(self, demo_dir, clips, timings):
+        """Should encode in one pass when the joined chunks drift in length."""
+        mock_run = self.run_composite(
+            demo_dir, clips, timings, cpus=16, durations=("60.0", "59.5")
+        )
+
+        cmd = ffmpeg_cmd(mock_run)
+        assert cmd[2].endswith("demo_recording.mp4")
+        assert cmd[cmd.index("-c:v") + 1] == "libx264"
+
+    def test_no_chunks_on_small_hosts(self, demo_dir, clips, timings):
+        """Should encode in one process when there is room for one chunk."""
+        mock_run = self.run_composite(demo_dir, clips, timings, cpus=12)
+
+        assert not any("-an" in c.args[0] for c in mock_run.call_args_list)
+        assert ffmpeg_cmd(mock_run)[2].endswith("demo_recording.mp4")
+
+    def test_no_audio_copies_streams(self, tmp_path):
+        """Should stream-copy when there is no audio to mix."""
+        (tmp_path / "demo_recording.mp4").write_bytes(b"video")
+        cmd = ffmpeg_cmd(self.run_composite(tmp_path, [], []))
+
+        assert cmd[-3:] == ["-c", "copy", str(tmp_path / "final.mp4")]
+
+
+class TestBackendSelection:
+    """Tests for choosing between ffmpeg and moviepy."""
+
+    def test_defaults_to_ffmpeg(self, monkeypatch):
+        """Should use ffmpeg even when moviepy is installed."""
+        monkeypatch.delenv("FORCE_MOVIEPY", raising=False)
+        with patch("utils.video_compositor.MOVIEPY_AVAILABLE", True):
+            assert VideoCompositor().use_moviepy is False
+
+    def test_force_moviepy_env(self, monkeypatch):
+        """Should use moviepy when FORCE_MOVIEPY is set and it is installed."""
+        monkeypatch.setenv("FORCE_MOVIEPY", "1")
+        with patch("utils.video_compositor.MOVIEPY_AVAILABLE", True):
+            assert VideoCompositor().use_moviepy is True
+        with patch("utils.video_compositor.MOVIEPY_AVAILABLE", False):
+            assert VideoCompositor().use_moviepy is False
+
+
+class TestRunFfmpeg:
+    """Tests for running ffmpeg with drained stderr."""
+
+    def test_succeeds_quietly(self):
+        """Should return normally when the command succeeds."""
+        _run_ffmpeg([sys.executable, "-c", "import sys; sys.stderr.write('ok\\n')"])
+
+    def test_failure_keeps_last_lines(self):
+        """Should raise with only the last lines of stderr."""
+        script = (
+            "import sys\n"
+            "for i in range(200): sys.stderr.write(f'line {i}\\n')\n"
+            "sys.exit(3)"
+        )
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            _run_ffmpeg([sys.executable, "-c", script])
+
+        lines = exc_info.value.stderr.splitlines()
+        assert exc_info.value.returncode == 3
+        assert len(lines) == FFMPEG_ERROR_LINES
+        assert lines[-1] == "line 199"
+
+
+class TestSilenceGaps:
+    """Tests for laying out sequential narration clips."""
+
+    def test_gaps_between_clips(self):
+        """Should return the silence before each clip."""
+        assert _silence_gaps([(2, 3), (5, 1), (10, 2)]) == [2, 0, 4]
+
+    def test_overlap_or_unknown_duration(self):
+        """Should give up when clips overlap or a duration is missing."""
+        assert _silence_gaps([(0, 6), (5, 1)]) is None
+        assert _silence_gaps([(0, None), (5, 1)]) is None
+
+
+class TestChunkBoundaries:
+    """Tests for choosing parallel encode cut points."""
+
+    def test_picks_scene_starts_nearest_even_splits(self):
+        """Should cut at the scene starts closest to equal chunk lengths."""
+        timings = [
+            {"scene": 1, "start": 0, "end": 20},
+            {"scene": 2, "start": 20, "end": 35},
+            {"scene": 3, "start": 35, "end": 70},
+            {"scene": 4, "start": 70, "end": 90},
+        ]
+
+        assert _chunk_boundaries(timings, 3) == [35.0, 70.0]
+
+    def test_merges_duplicate_cuts(self):
+        """Should not return the same cut twice when scenes are sparse."""
+        timings = [
+            {"scene": 1, "start": 0, "end": 10},
+            {"scene": 2, "start": 10, "end": 100},
+        ]
+
+        assert _chunk_boundaries(timings, 4) == [10.0]
+
+
+class TestDetectEncoder:
+    """Tests for hardware encoder detection."""
+
+    def test_prefers_working_hardware_encoder(self):
+        """Should use the first listed encoder that passes a test encode."""
+        listing = MagicMock(stdout=" V..... h264_nvenc\n V..... h264_qsv\n")
+
+        def run(cmd, **kwargs):
+            if "-encoders" in cmd:
+                return listing
+            if "h264_nvenc" in cmd:
+                raise OSError("no CUDA device")
+            return MagicMock()
+
+        with patch("utils.video_compositor.subprocess.run", side_effect=run):
+            encoder = VideoCompositor._detect_encoder()
+
+        assert encoder[0] == "h264_qsv"
+
+    def test_falls_back_to_libx264(self):
+        """Should use libx264 when no hardware encoder is listed."""
+        with patch("utils.video_compositor.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout=" V..... libx264\n")
+            encoder = VideoCompositor._detect_encoder()
+
+        assert encoder == SOFTWARE_ENCODER
+
+    def test_detects_once(self):
+        """Should cache the detected encoder on the class."""
+        with patch("utils.video_compositor.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout="")
+            VideoCompositor._detect_encoder()
+            VideoCompositor._detect_encoder()
+
+        assert mock_run.call_count == 1
+
+    def test_ffmpeg_missing(self):
+        """Should use libx264 when ffmpeg cannot be run."""
+        with patch("utils.video_compositor.subprocess.run", side_effect=FileNotFoundError):
+            assert VideoCompositor._detect_encoder() == SOFTWARE_ENCODER
+
+
+class TestCompositeMoviepy:
+    """Tests for the moviepy compositing path."""
+
+    def test_loads_audio_at_scene_starts(self, tmp_path):
+        """Should position every audio clip at its scene start."""
+        (tmp_path / "audio_scene_1.mp3").write_bytes(b"audio")
+        (tmp_path / "audio_scene_2.mp3").write_bytes(b"audio")
+        clips = [
+            {"scene": 1, "path": "audio_scene_1.mp3"},
+            {"scene": 2, "path": "audio_scene_2.mp3"},
+            {"scene": 3, "path": "missing.mp3"},
+        ]
+        timings = [
+            {"scene": 1, "start": 0, "end": 30},
+            {"scene": 2, "start": 30, "end": 60},
+            {"scene": 3, "start": 60, "end": 90},
+        ]
+
+        def load_audio(path):
+            clip = MagicMock(name=path)
+            clip.set_start.side_effect = lambda start: MagicMock(path=path, start=start)
+            return clip
+
+        VideoCompositor._encoder = SOFTWARE_ENCODER
+        with patch("utils.video_compositor.MOVIEPY_AVAILABLE", True), \
+             patch("utils.video_compositor.VideoFileClip", create=True) as mock_video, \
+             patch("utils.video_compositor.AudioFileClip", side_effect=load_audio, create=True), \
+             patch("utils.video_compositor.CompositeAudioClip", create=True) as mock_mix:
+            VideoCompositor()._composite_moviepy(
+                str(tmp_path / "demo_recording.mp4"), clips, timings, str(tmp_path / "final.mp4")
+            )
+
+        mixed = mock_mix.call_args.args[0]
+        assert [(c.path, c.start) for c in mixed] == [
+            (str(tmp_path / "audio_scene_1.mp3"), 0),
+            (str(tmp_path / "audio_scene_2.mp3"), 30),
+        ]
+        mock_video.return_value.set_audio.return_value.write_videofile.assert_called_once()
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from utils.visual_validation import (
+    FILES_API_BETA,
     ValidationResult,
     VisualValidator,
     validate_page_state,
@@ -106,7 +107,7 @@ class TestVisualValidator:
         assert result.passed is False
         assert "not found" in result.explanation.lower()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_validate_with_api(self, mock_post, monkeypatch, tmp_path):
         """Should call API and parse response."""
         monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
@@ -136,7 +137,7 @@ class TestVisualValidator:
         assert result.confidence == 0.95
         mock_post.assert_called_once()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_validate_api_error(self, mock_post, monkeypatch, tmp_path):
         """Should handle API errors gracefully."""
         monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
@@ -152,6 +153,140 @@ class TestVisualValidator:
         assert result.passed is False
         assert "API Error" in result.explanation
 
+    @patch("requests.Session.post")
+    def test_validate_action_result_sends_both_images(self, mock_post, monkeypatch, tmp_path):
+        """Should send the before and after screenshots in order."""
+        import base64
+
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
+        before = tmp_path / "before.png"
+        after = tmp_path / "after.png"
+        before.write_bytes(b"before image")
+        after.write_bytes(b"after image")
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "content": [{"text": json.dumps({"passed": True, "confidence": 0.9})}]
+        }
+        mock_post.return_value = mock_response
+
+        validator = VisualValidator()
+        result = validator.validate_action_result(before, after, "click", "modal opens")
+
+        content = mock_post.call_args.kwargs["json"]["messages"][0]["content"]
+        assert base64.b64decode(content[0]["source"]["data"]) == b"before image"
+        assert base64.b64decode(content[1]["source"]["data"]) == b"after image"
+        assert result.passed is True
+
+    @patch("requests.Session.post")
+    def test_reuses_session_across_calls(self, mock_post, monkeypatch, tmp_path):
+        """Should send every call through one session carrying the API headers."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
+        screenshot = tmp_path / "test.png"
+        screenshot.write_bytes(b"fake image data")
+        mock_post.return_value.json.return_value = {
+            "content": [{"text": json.dumps({"passed": True})}]
+        }
+
+        validator = VisualValidator()
+        validator.validate_screenshot(screenshot, "first")
+        validator.validate_screenshot(screenshot, "second")
+
+        assert mock_post.call_count == 2
+        assert "headers" not in mock_post.call_args.kwargs
+        assert validator._session.headers["x-api-key"] == "test_key"
+        assert validator._session.headers["anthropic-version"] == "2023-06-01"
+
+    def test_validate_batch_keeps_job_order(self, monkeypatch, tmp_path):
+        """Should return one result per job, in job order."""
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        shots = [tmp_path / f"shot_{i}.png" for i in range(3)]
+
+        validator = VisualValidator()
+        results = validator.validate_batch([
+            {"screenshot_path": shot, "expected_state": "loaded"} for shot in shots
+        ])
+
+        assert [r.screenshot_path for r in results] == shots
+
+    def test_validate_batch_limits_concurrency(self, monkeypatch):
+        """Should run at most MAX_CONCURRENT_VALIDATIONS calls at once."""
+        import threading
+        import time
+
+        monkeypatch.setattr("utils.visual_validation.MAX_CONCURRENT_VALIDATIONS", 2)
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def fake_validate(screenshot_path, expected_state):
+            with lock:
+                active.append(screenshot_path)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(screenshot_path)
+            return screenshot_path
+
+        validator = VisualValidator()
+        validator.validate_screenshot = fake_validate
+        results = validator.validate_batch([
+            {"screenshot_path": i, "expected_state": "x"} for i in range(6)
+        ])
+
+        assert results == list(range(6))
+        assert max(peak) <= 2
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_parse_response_with_either_parser(self, monkeypatch, use_orjson):
+        """Should parse JSON and fall back on plain text with either parser."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        monkeypatch.setattr("utils.visual_validation.ORJSON_AVAILABLE", use_orjson)
+        validator = VisualValidator()
+
+        parsed = validator._parse_validation_response(
+            json.dumps({"passed": True, "confidence": 0.8}), Path("shot.png")
+        )
+        fallback = validator._parse_validation_response("Yes, it passed", Path("shot.png"))
+
+        assert parsed.passed is True
+        assert parsed.confidence == 0.8
+        assert fallback.passed is True
+        assert fallback.confidence == 0.5
+
+    @patch("requests.Session.post")
+    def test_files_api_uploads_once_and_references_file(self, mock_post, monkeypatch, tmp_path):
+        """Should upload a screenshot once and send its file_id."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
+        screenshot = tmp_path / "test.png"
+        screenshot.write_bytes(b"fake image data")
+
+        def post(url, **kwargs):
+            response = MagicMock()
+            if url.endswith("/files"):
+                response.json.return_value = {"id": "file_123"}
+            else:
+                response.json.return_value = {
+                    "content": [{"text": json.dumps({"passed": True})}]
+                }
+            return response
+
+        mock_post.side_effect = post
+
+        validator = VisualValidator(use_files_api=True)
+        validator.validate_screenshot(screenshot, "first")
+        validator.validate_screenshot(screenshot, "second")
+
+        urls = [c.args[0] for c in mock_post.call_args_list]
+        assert sum(url.endswith("/files") for url in urls) == 1
+        upload = mock_post.call_args_list[0].kwargs
+        assert upload["headers"] == {"content-type": None}
+        assert upload["files"]["file"][0] == "test.png"
+        content = mock_post.call_args.kwargs["json"]["messages"][0]["content"]
+        assert content[0]["source"] == {"type": "file", "file_id": "file_123"}
+        assert validator._session.headers["anthropic-beta"] == FILES_API_BETA
+
     def test_get_media_type(self, monkeypatch):
         """Should return correct MIME type."""
         monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
@@ -163,6 +298,82 @@ class TestVisualValidator:
         assert validator._get_media_type(Path("test.webp")) == "image/webp"
 
 
+class TestPrepareImage:
+    """Tests for shrinking and encoding screenshots."""
+
+    def test_reuses_encoding_for_unchanged_file(self, tmp_path):
+        """Should not re-read a screenshot that has not changed."""
+        from utils import visual_validation
+
+        screenshot = tmp_path / "test.png"
+        screenshot.write_bytes(b"fake image data")
+
+        first = visual_validation._prepare_image(screenshot)
+        with patch.object(visual_validation.mmap, "mmap") as mock_mmap:
+            second = visual_validation._prepare_image(screenshot)
+
+        mock_mmap.assert_not_called()
+        assert first == second
+
+    def test_encodes_from_memory_map(self, tmp_path):
+        """Should encode the mapped file without reading it into bytes."""
+        import base64
+
+        from utils import visual_validation
+
+        screenshot = tmp_path / "mapped.png"
+        screenshot.write_bytes(b"mapped image data")
+
+        with patch.object(Path, "read_bytes") as mock_read:
+            data, media_type = visual_validation._prepare_image(screenshot)
+
+        mock_read.assert_not_called()
+        assert base64.b64decode(data) == b"mapped image data"
+        assert media_type == "image/png"
+
+    def test_encodes_empty_file(self, tmp_path):
+        """Should handle empty files, which cannot be memory-mapped."""
+        from utils import visual_validation
+
+        screenshot = tmp_path / "empty.png"
+        screenshot.write_bytes(b"")
+
+        assert visual_validation._prepare_image(screenshot) == ("", "image/png")
+
+    def test_sends_unreadable_image_as_is(self, tmp_path):
+        """Should fall back to the original bytes when shrinking fails."""
+        import base64
+
+        from utils import visual_validation
+
+        screenshot = tmp_path / "test.webp"
+        screenshot.write_bytes(b"not really an image")
+
+        with patch.object(visual_validation, "PIL_AVAILABLE", True), \
+             patch.object(visual_validation, "_shrink_image", side_effect=OSError("bad")):
+            data, media_type = visual_validation._prepare_image(screenshot)
+
+        assert base64.b64decode(data) == b"not really an image"
+        assert media_type == "image/webp"
+
+    def test_downscales_large_screenshot(self, tmp_path):
+        """Should downscale large opaque screenshots to JPEG."""
+        Image = pytest.importorskip("PIL.Image")
+        import base64
+        import io
+
+        from utils import visual_validation
+
+        screenshot = tmp_path / "large.png"
+        Image.new("RGB", (3840, 2160), "white").save(screenshot)
+
+        data, media_type = visual_validation._prepare_image(screenshot)
+
+        with Image.open(io.BytesIO(base64.b64decode(data))) as img:
+            assert max(img.size) == visual_validation.MAX_IMAGE_EDGE
+        assert media_type == "image/jpeg"
+
+
 class TestValidatePageState:
     """Tests for validate_page_state convenience function."""
 
@@ -11,9 +11,11 @@ import hashlib
 import json
 import logging
 import os
+import shutil
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +43,8 @@ class DemoCache:
         # Cache metadata file
         self._metadata_path = self.cache_dir / "cache_metadata.json"
         self._metadata: Optional[Dict[str, Any]] = None
+        # Audio generation records entries from worker threads
+        self._metadata_lock = threading.Lock()
 
     def _load_metadata(self) -> Dict[str, Any]:
         """Load cache metadata from disk."""
@@ -53,11 +57,17 @@ class DemoCache:
         return self._metadata
 
     def _save_metadata(self) -> None:
-        """Save cache metadata to disk."""
+        """Save cache metadata to disk. Callers hold _metadata_lock."""
         if self._metadata:
             with open(self._metadata_path, "w") as f:
                 json.dump(self._metadata, f, indent=2)
 
+    def _set_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        """Record a metadata entry and save, safely across threads."""
+        with self._metadata_lock:
+            self._load_metadata()["entries"][key] = entry
+            self._save_metadata()
+
     def _hash_key(self, key: str) -> str:
         """Generate a hash for a cache key."""
         return hashlib.sha256(key.encode()).hexdigest()[:16]
@@ -127,13 +137,11 @@ class DemoCache:
             json.dump(data, f, indent=2)
 
         # Update metadata
-        metadata = self._load_metadata()
-        metadata["entries"][key] = {
+        self._set_entry(key, {
             "type": "selectors",
             "file": cache_file.name,
             "cached_at": data["cached_at"],
-        }
-        self._save_metadata()
+        })
 
         logger.debug(f"Cached {len(selectors)} selectors for {page_url}")
 
@@ -162,6 +170,39 @@ class DemoCache:
 
         return None
 
+    def get_audio_many(
+        self,
+        keys: List[Tuple[str, Optional[str]]],
+    ) -> Dict[Tuple[str, Optional[str]], Optional[Dict[str, Any]]]:
+        """
+        Look up cached audio for many texts with a single directory scan.
+
+        Args:
+            keys: List of (text, voice_id) pairs
+
+        Returns:
+            Dict mapping each key to {"path", "duration"}, or None if not cached
+        """
+        with os.scandir(self.cache_dir) as entries:
+            present = {entry.name for entry in entries}
+
+        entries = self._load_metadata()["entries"]
+        found: Dict[Tuple[str, Optional[str]], Optional[Dict[str, Any]]] = {}
+
+        for text, voice_id in keys:
+            filename = f"audio_{self._hash_content(text)}.mp3"
+            if filename not in present:
+                found[(text, voice_id)] = None
+                continue
+
+            entry = entries.get(f"audio:{voice_id or 'default'}:{text}", {})
+            found[(text, voice_id)] = {
+                "path": self.cache_dir / filename,
+                "duration": entry.get("duration"),
+            }
+
+        return found
+
     def cache_audio(
         self,
         text: str,
@@ -184,24 +225,65 @@ class DemoCache:
         text_hash = self._hash_content(text)
         cache_file = self.cache_dir / f"audio_{text_hash}.mp3"
 
-        with open(cache_file, "wb") as f:
-            f.write(audio_data)
+        # Replace rather than write in place: the cached file may be a hard
+        # link to an output file that has already been delivered
+        tmp_file = cache_file.with_name(f".{cache_file.name}.tmp")
+        tmp_file.write_bytes(audio_data)
+        os.replace(tmp_file, cache_file)
 
-        # Update metadata
+        self._record_audio(text, text_hash, cache_file, voice_id, duration)
+        return cache_file
+
+    def link_from_path(
+        self,
+        text: str,
+        src_path: Path,
+        voice_id: Optional[str] = None,
+        duration: Optional[float] = None,
+    ) -> Path:
+        """
+        Cache an audio file that already exists on disk.
+
+        The file is hard-linked into the cache when possible, so nothing is
+        read back into memory.
+
+        Args:
+            text: The narration text
+            src_path: Path to the generated audio file
+            voice_id: Optional voice ID
+            duration: Optional audio duration in seconds
+
+        Returns:
+            Path to cached audio file
+        """
+        text_hash = self._hash_content(text)
+        cache_file = self.cache_dir / f"audio_{text_hash}.mp3"
+
+        link_or_copy(src_path, cache_file)
+
+        self._record_audio(text, text_hash, cache_file, voice_id, duration)
+        return cache_file
+
+    def _record_audio(
+        self,
+        text: str,
+        text_hash: str,
+        cache_file: Path,
+        voice_id: Optional[str],
+        duration: Optional[float],
+    ) -> None:
+        """Add an audio entry to the cache metadata."""
         key = f"audio:{voice_id or 'default'}:{text}"
-        metadata = self._load_metadata()
-        metadata["entries"][key] = {
+        self._set_entry(key, {
             "type": "audio",
             "file": cache_file.name,
             "text_hash": text_hash,
             "voice_id": voice_id,
             "duration": duration,
             "cached_at": time.time(),
-        }
-        self._save_metadata()
+        })
 
         logger.debug(f"Cached audio for text hash {text_hash}")
-        return cache_file
 
     # =========================================================================
     # Screenshot Caching
@@ -252,15 +334,13 @@ class DemoCache:
             f.write(screenshot_data)
 
         # Update metadata
-        metadata = self._load_metadata()
-        metadata["entries"][key] = {
+        self._set_entry(key, {
             "type": "screenshot",
             "file": cache_file.name,
             "url": page_url,
             "action_id": action_id,
             "cached_at": time.time(),
-        }
-        self._save_metadata()
+        })
 
         return cache_file
 
@@ -320,14 +400,12 @@ class DemoCache:
             json.dump(data, f, indent=2)
 
         # Update metadata
-        metadata = self._load_metadata()
-        metadata["entries"][key] = {
+        self._set_entry(key, {
             "type": "kv",
             "file": cache_file.name,
             "cached_at": data["cached_at"],
             "ttl": ttl,
-        }
-        self._save_metadata()
+        })
 
     # =========================================================================
     # Cache Management
@@ -345,21 +423,22 @@ class DemoCache:
             Number of files deleted
         """
         count = 0
-        metadata = self._load_metadata()
+        with self._metadata_lock:
+            metadata = self._load_metadata()
 
-        keys_to_remove = []
-        for key, entry in metadata["entries"].items():
-            if cache_type is None or entry.get("type") == cache_type:
-                cache_file = self.cache_dir / entry["file"]
-                if cache_file.exists():
-                    cache_file.unlink()
-                    count += 1
-                keys_to_remove.append(key)
+            keys_to_remove = []
+            for key, entry in metadata["entries"].items():
+                if cache_type is None or entry.get("type") == cache_type:
+                    cache_file = self.cache_dir / entry["file"]
+                    if cache_file.exists():
+                        cache_file.unlink()
+                        count += 1
+                    keys_to_remove.append(key)
 
-        for key in keys_to_remove:
-            del metadata["entries"][key]
+            for key in keys_to_remove:
+                del metadata["entries"][key]
 
-        self._save_metadata()
+            self._save_metadata()
         logger.info(f"Cleared {count} cache entries")
         return count
 
@@ -401,23 +480,24 @@ class DemoCache:
             Number of entries removed
         """
         count = 0
-        metadata = self._load_metadata()
         now = time.time()
-
-        keys_to_remove = []
-        for key, entry in metadata["entries"].items():
-            if entry.get("ttl") is not None and entry.get("cached_at") is not None:
-                if now > entry["cached_at"] + entry["ttl"]:
-                    cache_file = self.cache_dir / entry["file"]
-                    if cache_file.exists():
-                        cache_file.unlink()
-                    keys_to_remove.append(key)
-                    count += 1
-
-        for key in keys_to_remove:
-            del metadata["entries"][key]
-
-        self._save_metadata()
+        with self._metadata_lock:
+            metadata = self._load_metadata()
+
+            keys_to_remove = []
+            for key, entry in metadata["entries"].items():
+                if entry.get("ttl") is not None and entry.get("cached_at") is not None:
+                    if now > entry["cached_at"] + entry["ttl"]:
+                        cache_file = self.cache_dir / entry["file"]
+                        if cache_file.exists():
+                            cache_file.unlink()
+                        keys_to_remove.append(key)
+                        count += 1
+
+            for key in keys_to_remove:
+                del metadata["entries"][key]
+
+            self._save_metadata()
         return count
 
 
@@ -461,6 +541,27 @@ class GlobalCache:
 
 # Convenience functions
 
+def link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Place ``src`` at ``dst`` without copying through Python.
+
+    Uses a hard link when both paths share a filesystem and falls back to
+    ``shutil.copyfile`` (sendfile on Linux) otherwise. Any existing ``dst``
+    is replaced rather than written through, so a linked file is never
+    modified in place.
+
+    Args:
+        src: Existing file
+        dst: Destination path
+    """
+    dst = Path(dst)
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
 def get_cache(demo_id: str) -> DemoCache:
     """Get a cache instance for a demo."""
     return DemoCache(demo_id)
@@ -8,6 +8,7 @@ for transient failures (rate limits, timeouts, network issues).
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -48,14 +49,22 @@ class ElevenLabsClient:
         api_key: Optional[str] = None,
         voice_id: Optional[str] = None,
         model_id: str = "eleven_multilingual_v2",
+        pool_size: int = 10,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize ElevenLabs client.
 
+        The client keeps one HTTP session, so it can be shared between
+        threads and reuses connections across requests.
+
         Args:
             api_key: ElevenLabs API key (defaults to env var ELEVENLABS_API_KEY)
             voice_id: Voice ID to use (defaults to env var ELEVENLABS_VOICE_ID)
             model_id: Model ID (default: eleven_multilingual_v2)
+            pool_size: Maximum pooled connections (match concurrent callers)
+            session: Optional session to send requests through. The caller
+                keeps ownership and must close it; pool_size is then ignored.
         """
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         if not self.api_key:
@@ -74,6 +83,18 @@ class ElevenLabsClient:
         self.model_id = model_id
         self.base_url = "https://api.elevenlabs.io/v1"
 
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+        self._session = session
+
+    def close(self) -> None:
+        """Close the HTTP session if this client created it."""
+        if self._owns_session:
+            self._session.close()
+
     def generate_audio(
         self,
         text: str,
@@ -121,7 +142,7 @@ class ElevenLabsClient:
         last_exception = None
         for attempt in range(max_retries):
             try:
-                response = requests.post(url, json=data, headers=headers, timeout=30)
+                response = self._session.post(url, json=data, headers=headers, timeout=30)
                 response.raise_for_status()
                 break  # Success - exit retry loop
 
@@ -151,8 +172,12 @@ class ElevenLabsClient:
         output_path_obj = Path(output_path)
         output_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, "wb") as f:
+        # Write beside the target and swap it in: the output may be a hard
+        # link into the audio cache, which must not be truncated
+        tmp_path = output_path_obj.with_name(f".{output_path_obj.name}.tmp")
+        with open(tmp_path, "wb") as f:
             f.write(response.content)
+        os.replace(tmp_path, output_path)
 
         # Get duration
         duration = self._get_audio_duration(output_path)
@@ -7,9 +7,11 @@ using Playwright's built-in video recording.
 
 import json
 import logging
+import os
 import subprocess
 import sys
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
@@ -18,6 +20,41 @@ from .retry import retry, RetryError
 
 logger = logging.getLogger(__name__)
 
+# Chromium flags for recording: no GPU process, extensions or background
+# services, which are pure overhead when capturing a page to WebM.
+CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-dev-shm-usage",
+    "--disable-software-rasterizer",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+# Outline an element for `duration` ms. Kept constant so the browser can
+# reuse the compiled function; arguments are passed via page.evaluate.
+_HIGHLIGHT_JS = """
+([selector, duration]) => {
+    const el = document.querySelector(selector);
+    if (el) {
+        el.style.outline = '3px solid #ff6b6b';
+        el.style.outlineOffset = '2px';
+        setTimeout(() => {
+            el.style.outline = '';
+            el.style.outlineOffset = '';
+        }, duration);
+    }
+}
+"""
+
+# Lines of script output kept in RecordingResult.logs; the full output
+# stays on disk at RecordingResult.log_path.
+LOG_TAIL_LINES = 200
+
 
 @dataclass
 class RecordingConfig:
@@ -25,11 +62,14 @@ class RecordingConfig:
 
     viewport_width: int = 1920
     viewport_height: int = 1080
+    video_width: int = 1280  # Encoded video size, independent of viewport
+    video_height: int = 720
     frame_rate: int = 30
     headless: bool = True
     slow_mo: int = 0  # Slow down actions by this many ms
     timeout: int = 30000  # Default timeout in ms
     video_dir: str = "./recordings"
+    emit_mp4: bool = False  # Also transcode the WebM recording to MP4
 
 
 @dataclass
@@ -41,7 +81,8 @@ class RecordingResult:
     duration_seconds: Optional[float] = None
     screenshots: List[Path] = None
     error: Optional[str] = None
-    logs: Optional[str] = None
+    logs: Optional[str] = None  # Tail of the run log
+    log_path: Optional[Path] = None
 
     def __post_init__(self):
         if self.screenshots is None:
@@ -54,9 +95,38 @@ class RecordingResult:
             "duration_seconds": self.duration_seconds,
             "screenshots": [str(p) for p in self.screenshots],
             "error": self.error,
+            "log_path": str(self.log_path) if self.log_path else None,
         }
 
 
+def _tail_log(log_path: Path, max_lines: int = LOG_TAIL_LINES) -> str:
+    """Return the last ``max_lines`` lines of a log file."""
+    try:
+        with open(log_path, errors="replace") as f:
+            return "".join(deque(f, maxlen=max_lines))
+    except OSError:
+        return ""
+
+
+def _find_first_file(directory: Path, suffix: str) -> Optional[Path]:
+    """Return the first file in ``directory`` ending with ``suffix``, if any."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(suffix) and entry.is_file():
+                return Path(entry.path)
+    return None
+
+
+def _find_scene_screenshots(directory: Path) -> List[Path]:
+    """Return ``scene_*.png`` files in ``directory`` using a single scan."""
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.startswith("scene_") and entry.name.endswith(".png")
+        ]
+
+
 class LocalRecorder:
     """
     Records demos using local Playwright installation.
@@ -122,60 +192,65 @@ class LocalRecorder:
         recordings_dir = output_dir / "recordings"
         recordings_dir.mkdir(exist_ok=True)
 
-        # Execute the script
+        log_path = output_dir / "run.log"
+
+        # Execute the script, streaming its output to disk
         try:
-            result = subprocess.run(
-                [sys.executable, str(script_path)],
-                capture_output=True,
-                text=True,
-                timeout=600,  # 10 minute timeout
-                cwd=str(output_dir),
-                env={
-                    **subprocess.os.environ,
-                    "PLAYWRIGHT_VIDEO_DIR": str(recordings_dir),
-                },
-            )
+            with open(log_path, "wb") as log_file:
+                result = subprocess.run(
+                    [sys.executable, str(script_path)],
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    timeout=600,  # 10 minute timeout
+                    cwd=str(output_dir),
+                    env={
+                        **os.environ,
+                        "PLAYWRIGHT_VIDEO_DIR": str(recordings_dir),
+                    },
+                )
 
             if result.returncode != 0:
                 return RecordingResult(
                     status="failed",
-                    error=result.stderr,
-                    logs=result.stdout,
+                    error=_tail_log(log_path),
+                    log_path=log_path,
                 )
 
             # Find the video file
-            video_files = list(recordings_dir.glob("*.webm"))
-            if not video_files:
+            video_path = _find_first_file(recordings_dir, ".webm")
+            if video_path is None:
                 return RecordingResult(
                     status="failed",
                     error="No video file generated",
-                    logs=result.stdout,
+                    logs=_tail_log(log_path),
+                    log_path=log_path,
                 )
 
-            video_path = video_files[0]
-
             # Get video duration
             duration = self._get_video_duration(video_path)
 
             # Move video to standard name
             final_video_path = output_dir / "demo_recording.webm"
             video_path.rename(final_video_path)
+            final_video_path = self._finalize_video(final_video_path)
 
             # Find screenshots
-            screenshots = list(output_dir.glob("scene_*.png"))
+            screenshots = _find_scene_screenshots(output_dir)
 
             return RecordingResult(
                 status="success",
                 video_path=final_video_path,
                 duration_seconds=duration,
                 screenshots=screenshots,
-                logs=result.stdout,
+                logs=_tail_log(log_path),
+                log_path=log_path,
             )
 
         except subprocess.TimeoutExpired:
             return RecordingResult(
                 status="timeout",
                 error="Recording timed out after 10 minutes",
+                log_path=log_path,
             )
         except Exception as e:
             return RecordingResult(
@@ -216,6 +291,7 @@ class LocalRecorder:
                 browser = p.chromium.launch(
                     headless=self.config.headless,
                     slow_mo=self.config.slow_mo,
+                    args=CHROMIUM_ARGS,
                 )
                 context = browser.new_context(
                     viewport={
@@ -224,8 +300,8 @@ class LocalRecorder:
                     },
                     record_video_dir=str(recordings_dir),
                     record_video_size={
-                        "width": self.config.viewport_width,
-                        "height": self.config.viewport_height,
+                        "width": self.config.video_width,
+                        "height": self.config.video_height,
                     },
                 )
                 page = context.new_page()
@@ -250,6 +326,7 @@ class LocalRecorder:
                 Path(video_path).rename(final_video_path)
 
                 duration = self._get_video_duration(final_video_path)
+                final_video_path = self._finalize_video(final_video_path)
 
                 return RecordingResult(
                     status="success",
@@ -269,80 +346,100 @@ class LocalRecorder:
     def _execute_action(self, page, action: Dict[str, Any]) -> None:
         """Execute a single action on the page."""
         action_type = action.get("type", action.get("action"))
-
-        if action_type == "goto":
-            url = action.get("url")
-            page.goto(url)
-            page.wait_for_load_state("networkidle")
-
-        elif action_type == "click":
-            selector = action.get("selector")
-            page.click(selector)
-
-        elif action_type == "fill" or action_type == "type":
-            selector = action.get("selector")
-            text = action.get("text", action.get("value", ""))
-            if action.get("human_like"):
-                page.type(selector, text, delay=100)
-            else:
-                page.fill(selector, text)
-
-        elif action_type == "wait":
-            duration = action.get("duration", action.get("ms", 1000))
+        handler = self._ACTIONS.get(action_type)
+        if handler is not None:
+            handler(self, page, action)
+
+    def _do_goto(self, page, action: Dict[str, Any]) -> None:
+        # Waiting for "networkidle" never settles on apps that keep sockets
+        # open, so actions must opt into it via "wait_until".
+        url = action.get("url")
+        wait_until = action.get("wait_until", "domcontentloaded")
+        page.goto(url, wait_until=wait_until, timeout=self.config.timeout)
+
+    def _do_click(self, page, action: Dict[str, Any]) -> None:
+        selector = action.get("selector")
+        page.click(selector)
+
+    def _do_fill(self, page, action: Dict[str, Any]) -> None:
+        selector = action.get("selector")
+        text = action.get("text", action.get("value", ""))
+        if action.get("human_like"):
+            page.type(selector, text, delay=100)
+        else:
+            page.fill(selector, text)
+
+    def _do_wait(self, page, action: Dict[str, Any]) -> None:
+        duration = action.get("duration", action.get("ms", 1000))
+        page.wait_for_timeout(duration)
+
+    def _do_wait_for_selector(self, page, action: Dict[str, Any]) -> None:
+        selector = action.get("selector")
+        page.wait_for_selector(selector, timeout=self.config.timeout)
+
+    def _do_wait_for_idle(self, page, action: Dict[str, Any]) -> None:
+        page.wait_for_load_state("networkidle")
+
+    def _do_hover(self, page, action: Dict[str, Any]) -> None:
+        selector = action.get("selector")
+        page.hover(selector)
+
+    def _do_select(self, page, action: Dict[str, Any]) -> None:
+        selector = action.get("selector")
+        value = action.get("value")
+        page.select_option(selector, value)
+
+    def _do_scroll(self, page, action: Dict[str, Any]) -> None:
+        selector = action.get("selector")
+        if selector:
+            page.locator(selector).scroll_into_view_if_needed()
+        else:
+            direction = action.get("direction", "down")
+            amount = action.get("amount", 300)
+            if direction == "down":
+                page.mouse.wheel(0, amount)
+            elif direction == "up":
+                page.mouse.wheel(0, -amount)
+
+    def _do_assert_visible(self, page, action: Dict[str, Any]) -> None:
+        selector = action.get("selector")
+        assert page.locator(selector).is_visible()
+
+    def _do_highlight(self, page, action: Dict[str, Any]) -> None:
+        selector = action.get("selector")
+        duration = action.get("duration", 1500)
+        page.evaluate(_HIGHLIGHT_JS, [selector, duration])
+        # The outline is cleared in the page; only block when the next
+        # action needs to observe the reset style.
+        if action.get("wait_after", False):
             page.wait_for_timeout(duration)
 
-        elif action_type == "wait_for_selector":
-            selector = action.get("selector")
-            page.wait_for_selector(selector, timeout=self.config.timeout)
-
-        elif action_type == "wait_for_idle":
-            page.wait_for_load_state("networkidle")
-
-        elif action_type == "hover":
-            selector = action.get("selector")
-            page.hover(selector)
-
-        elif action_type == "select":
-            selector = action.get("selector")
-            value = action.get("value")
-            page.select_option(selector, value)
-
-        elif action_type == "scroll":
-            selector = action.get("selector")
-            if selector:
-                page.locator(selector).scroll_into_view_if_needed()
-            else:
-                direction = action.get("direction", "down")
-                amount = action.get("amount", 300)
-                if direction == "down":
-                    page.mouse.wheel(0, amount)
-                elif direction == "up":
-                    page.mouse.wheel(0, -amount)
-
-        elif action_type == "assert_visible":
-            selector = action.get("selector")
-            assert page.locator(selector).is_visible()
-
-        elif action_type == "highlight":
-            selector = action.get("selector")
-            duration = action.get("duration", 1500)
-            page.evaluate(
-                f"""
-                (selector) => {{
-                    const el = document.querySelector(selector);
-                    if (el) {{
-                        el.style.outline = '3px solid #ff6b6b';
-                        el.style.outlineOffset = '2px';
-                        setTimeout(() => {{
-                            el.style.outline = '';
-                            el.style.outlineOffset = '';
-                        }}, {duration});
-                    }}
-                }}
-                """,
-                selector,
-            )
-            page.wait_for_timeout(duration)
+    # Action type -> handler, built once for the class
+    _ACTIONS: Dict[str, Callable[["LocalRecorder", Any, Dict[str, Any]], None]] = {
+        "goto": _do_goto,
+        "click": _do_click,
+        "fill": _do_fill,
+        "type": _do_fill,
+        "wait": _do_wait,
+        "wait_for_selector": _do_wait_for_selector,
+        "wait_for_idle": _do_wait_for_idle,
+        "hover": _do_hover,
+        "select": _do_select,
+        "scroll": _do_scroll,
+        "assert_visible": _do_assert_visible,
+        "highlight": _do_highlight,
+    }
+
+    def _finalize_video(self, webm_path: Path) -> Path:
+        """
+        Return the video to hand downstream.
+
+        WebM is consumed directly by the pipeline; the lossy MP4 re-encode
+        only runs when the config asks for it.
+        """
+        if not self.config.emit_mp4:
+            return webm_path
+        return convert_webm_to_mp4(webm_path)
 
     def _get_video_duration(self, video_path: Path) -> Optional[float]:
         """Get video duration in seconds."""
@@ -395,35 +492,40 @@ class LocalRecorder:
         output_dir = script_path.parent
         screenshots = []
 
+        log_path = output_dir / "validate.log"
+
         try:
-            result = subprocess.run(
-                [sys.executable, str(script_path)],
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout for validation
-                cwd=str(output_dir),
-            )
+            with open(log_path, "wb") as log_file:
+                result = subprocess.run(
+                    [sys.executable, str(script_path)],
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    timeout=300,  # 5 minute timeout for validation
+                    cwd=str(output_dir),
+                )
 
             if result.returncode != 0:
                 return RecordingResult(
                     status="failed",
-                    error=result.stderr,
-                    logs=result.stdout,
+                    error=_tail_log(log_path),
+                    log_path=log_path,
                 )
 
             # Find screenshots
-            screenshots = list(output_dir.glob("scene_*.png"))
+            screenshots = _find_scene_screenshots(output_dir)
 
             return RecordingResult(
                 status="success",
                 screenshots=screenshots,
-                logs=result.stdout,
+                logs=_tail_log(log_path),
+                log_path=log_path,
             )
 
         except subprocess.TimeoutExpired:
             return RecordingResult(
                 status="timeout",
                 error="Validation timed out after 5 minutes",
+                log_path=log_path,
             )
         except Exception as e:
             return RecordingResult(
@@ -505,3 +607,56 @@ def convert_webm_to_mp4(
     )
 
     return mp4_path
+
+
+def convert_webms_to_mp4_batch(
+    webm_paths: List[Path],
+    out_dir: Optional[Path] = None,
+    quality: int = 18,
+) -> List[Path]:
+    """
+    Convert several WebM recordings to MP4 with a single ffmpeg process.
+
+    Each input is mapped to its own output, so ffmpeg startup and codec
+    initialization are paid once for the whole batch.
+
+    Args:
+        webm_paths: Paths to WebM files
+        out_dir: Optional output directory (defaults to each input's directory)
+        quality: CRF quality (lower = better, 18-28 recommended)
+
+    Returns:
+        Paths to MP4 files, in the same order as ``webm_paths``
+    """
+    if not webm_paths:
+        return []
+
+    cmd = ["ffmpeg", "-y"]
+    for webm_path in webm_paths:
+        cmd.extend(["-i", str(webm_path)])
+
+    mp4_paths = []
+    for i, webm_path in enumerate(webm_paths):
+        webm_path = Path(webm_path)
+        if out_dir is None:
+            mp4_path = webm_path.with_suffix(".mp4")
+        else:
+            mp4_path = Path(out_dir) / webm_path.with_suffix(".mp4").name
+        cmd.extend([
+            "-map", f"{i}:v",
+            "-map", f"{i}:a?",
+            "-c:v", "libx264",
+            "-crf", str(quality),
+            "-preset", "slow",
+            "-c:a", "aac",
+            "-b:a", "192k",
+            str(mp4_path),
+        ])
+        mp4_paths.append(mp4_path)
+
+    if out_dir is not None:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    subprocess.run(cmd, check=True, capture_output=True)
+
+    return mp4_paths
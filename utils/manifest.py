@@ -9,7 +9,7 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 
 class Manifest:
@@ -22,6 +22,12 @@ class Manifest:
     - Stage outputs (file paths, metadata)
     - Error information for failed stages
     - Brand voice cache
+
+    Stage transitions, including failures, rewrite manifest.json
+    atomically so direct readers of the file always see them. Brand
+    voice refreshes are only appended to an events.ndjson sidecar;
+    ``load`` replays the sidecar whenever it exists, and every full save
+    folds it into manifest.json and clears it.
     """
 
     def __init__(self, demo_id: str, base_path: str = ".demo"):
@@ -29,7 +35,11 @@ class Manifest:
         self.base_path = Path(base_path)
         self.demo_dir = self.base_path / demo_id
         self.manifest_path = self.demo_dir / "manifest.json"
+        self.events_path = self.demo_dir / "events.ndjson"
         self._data: Optional[Dict[str, Any]] = None
+        # Stage status is tracked as sets and written out as sorted lists
+        self._completed: Set[int] = set()
+        self._failed: Set[int] = set()
 
     def initialize(
         self,
@@ -48,6 +58,9 @@ class Manifest:
         # Create demo directory
         self.demo_dir.mkdir(parents=True, exist_ok=True)
 
+        self._completed = set()
+        self._failed = set()
+
         # Initialize manifest data
         self._data = {
             "demo_id": self.demo_id,
@@ -84,6 +97,13 @@ class Manifest:
         with open(self.manifest_path, "r") as f:
             self._data = json.load(f)
 
+        self._completed = set(self._data.get("completed_stages", []))
+        self._failed = set(self._data.get("failed_stages", []))
+
+        if self._has_pending_events():
+            self._replay_events()
+            self._save()
+
         return self._data
 
     def _save(self) -> None:
@@ -91,8 +111,54 @@ class Manifest:
         if self._data is None:
             raise RuntimeError("Manifest not initialized. Call initialize() or load() first.")
 
-        with open(self.manifest_path, "w") as f:
+        self._data["completed_stages"] = sorted(self._completed)
+        self._data["failed_stages"] = sorted(self._failed)
+
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
             json.dump(self._data, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+        # Everything in the event log is now part of manifest.json
+        try:
+            self.events_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _append_event(self, event: Dict[str, Any]) -> None:
+        """Append a single state change to the event log."""
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        with open(self.events_path, "ab") as f:
+            f.write(line.encode("utf-8"))
+
+    def _has_pending_events(self) -> bool:
+        """
+        Check whether the event log holds changes not yet in manifest.json.
+
+        Every full save clears the log, so any log on disk is pending, even
+        if something else rewrote manifest.json after it was appended to.
+        """
+        return self.events_path.exists()
+
+    def _replay_events(self) -> None:
+        """Apply logged events on top of the loaded manifest data."""
+        with open(self.events_path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final write from a crash
+                    continue
+                self._apply_event(event)
+
+    def _apply_event(self, event: Dict[str, Any]) -> None:
+        """Apply a single event to the in-memory manifest."""
+        kind = event.get("event")
+        if kind == "brand_voice_refreshed":
+            self._data["brand_voice_cache"]["last_refreshed"] = event["refreshed_at"]
 
     @property
     def data(self) -> Dict[str, Any]:
@@ -122,12 +188,10 @@ class Manifest:
         """
         data = self.data
 
-        if stage not in data["completed_stages"]:
-            data["completed_stages"].append(stage)
+        self._completed.add(stage)
 
         # Remove from failed if it was there
-        if stage in data["failed_stages"]:
-            data["failed_stages"].remove(stage)
+        self._failed.discard(stage)
 
         # Record outputs
         data["stage_outputs"][str(stage)] = outputs
@@ -158,10 +222,8 @@ class Manifest:
             screenshot_path: Optional path to error screenshot
             dom_snapshot_path: Optional path to DOM snapshot
         """
-        data = self.data
-
-        if stage not in data["failed_stages"]:
-            data["failed_stages"].append(stage)
+        if self._data is None:
+            self.load()
 
         error_record = {
             "stage": stage,
@@ -175,9 +237,24 @@ class Manifest:
             "timestamp": datetime.utcnow().isoformat() + "Z",
         }
 
-        data["errors"].append(error_record)
+        self._failed.add(stage)
+        self._data["errors"].append(error_record)
+
         self._save()
 
+    def clear_failed_stage(self, stage: int) -> None:
+        """
+        Clear a stage's failed status, e.g. before retrying it.
+
+        Args:
+            stage: Stage number (1-9)
+        """
+        if self._data is None:
+            self.load()
+        if stage in self._failed:
+            self._failed.discard(stage)
+            self._save()
+
     def get_stage_output(self, stage: int) -> Optional[Dict[str, Any]]:
         """
         Get the outputs from a specific stage.
@@ -201,8 +278,9 @@ class Manifest:
         Returns:
             True if stage is completed
         """
-        data = self.data
-        return stage in data["completed_stages"]
+        if self._data is None:
+            self.load()
+        return stage in self._completed
 
     def update_brand_voice_cache(self, refresh_time: Optional[str] = None) -> None:
         """
@@ -211,12 +289,14 @@ class Manifest:
         Args:
             refresh_time: ISO timestamp (defaults to now)
         """
-        data = self.data
+        if self._data is None:
+            self.load()
         if refresh_time is None:
             refresh_time = datetime.utcnow().isoformat() + "Z"
 
-        data["brand_voice_cache"]["last_refreshed"] = refresh_time
-        self._save()
+        event = {"event": "brand_voice_refreshed", "refreshed_at": refresh_time}
+        self._apply_event(event)
+        self._append_event(event)
 
     def get_file_path(self, filename: str) -> Path:
         """
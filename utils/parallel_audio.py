@@ -7,18 +7,23 @@ Generates multiple audio segments concurrently to reduce total generation time.
 import asyncio
 import logging
 import os
+import queue
+import re
+import subprocess
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .cache import DemoCache
+from .cache import DemoCache, link_or_copy
 from .elevenlabs_client import ElevenLabsClient
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AudioSegment:
     """An audio segment to generate."""
 
@@ -27,7 +32,7 @@ class AudioSegment:
     output_path: Path
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AudioResult:
     """Result of audio generation."""
 
@@ -49,11 +54,90 @@ class AudioResult:
         }
 
 
+# Pause placed between texts in a batched request, and the silence length
+# used to find those pauses again in the returned audio
+BATCH_BREAK = ' <break time="1.5s" /> '
+BATCH_MIN_SILENCE = 1.0
+
+_SILENCE_START_RE = re.compile(r"silence_start: (-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end: ([\d.]+) \| silence_duration: ([\d.]+)")
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):([\d.]+)")
+
+
+def _split_audio_on_silence(
+    audio_path: Path,
+    output_paths: List[Path],
+    min_silence: float = BATCH_MIN_SILENCE,
+    noise_db: int = -40,
+) -> List[float]:
+    """
+    Split an audio file at its longest silences using ffmpeg.
+
+    Args:
+        audio_path: Audio file containing ``len(output_paths)`` utterances
+        output_paths: Where to write each part, in order
+        min_silence: Minimum silence length (seconds) treated as a boundary
+        noise_db: Volume (dB) below which audio counts as silence
+
+    Returns:
+        Duration of each part in seconds
+
+    Raises:
+        ValueError: If fewer boundaries are found than needed
+        subprocess.CalledProcessError: If ffmpeg fails
+    """
+    probe = subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-i", str(audio_path),
+            "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}",
+            "-f", "null", "-",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    duration_match = _DURATION_RE.search(probe.stderr)
+    if not duration_match:
+        raise ValueError(f"Could not read duration of {audio_path}")
+    hours, minutes, seconds = duration_match.groups()
+    total = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    starts = [float(m) for m in _SILENCE_START_RE.findall(probe.stderr)]
+    ends = [(float(e), float(d)) for e, d in _SILENCE_END_RE.findall(probe.stderr)]
+    silences = [
+        (start, end, length) for start, (end, length) in zip(starts, ends, strict=False)
+    ]
+
+    needed = len(output_paths) - 1
+    if len(silences) < needed:
+        raise ValueError(
+            f"Found {len(silences)} pauses in batched audio, expected {needed}"
+        )
+
+    # Keep the longest pauses as boundaries, in time order
+    boundaries = sorted(sorted(silences, key=lambda s: s[2], reverse=True)[:needed])
+
+    cuts = []
+    position = 0.0
+    for start, end, _ in boundaries:
+        cuts.append((position, max(start, 0.0)))
+        position = end
+    cuts.append((position, total))
+
+    cmd = ["ffmpeg", "-y", "-i", str(audio_path)]
+    for (start, end), output_path in zip(cuts, output_paths, strict=True):
+        cmd.extend(["-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-c", "copy", str(output_path)])
+    subprocess.run(cmd, capture_output=True, check=True)
+
+    return [end - start for start, end in cuts]
+
+
 class ParallelAudioGenerator:
     """
     Generates multiple audio segments in parallel.
 
-    Uses thread pool for concurrent API calls, with optional caching
+    Uses a work-stealing thread pool for concurrent API calls, with optional caching
     to skip regenerating unchanged segments.
     """
 
@@ -64,6 +148,7 @@ class ParallelAudioGenerator:
         max_workers: int = 4,
         use_cache: bool = True,
         cache_dir: Optional[Path] = None,
+        batch_size: int = 1,
     ):
         """
         Initialize parallel audio generator.
@@ -74,13 +159,44 @@ class ParallelAudioGenerator:
             max_workers: Maximum concurrent generations
             use_cache: Whether to use caching
             cache_dir: Directory for cache (defaults to .demo/.cache)
+            batch_size: Segments synthesized per API request (1 disables
+                batching). Batched audio is split on the pauses between texts.
         """
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         self.voice_id = voice_id or os.getenv("ELEVENLABS_VOICE_ID")
         self.max_workers = max_workers
         self.use_cache = use_cache
+        self.batch_size = max(1, batch_size)
         self.cache = DemoCache(cache_dir or Path(".demo/.cache")) if use_cache else None
 
+        # One client (and connection pool) shared by every worker
+        self._client: Optional[ElevenLabsClient] = None
+        self._client_lock = threading.Lock()
+
+    def _get_client(self) -> ElevenLabsClient:
+        """Return the shared ElevenLabs client, creating it on first use."""
+        with self._client_lock:
+            if self._client is None:
+                self._client = ElevenLabsClient(
+                    api_key=self.api_key,
+                    voice_id=self.voice_id,
+                    pool_size=self.max_workers,
+                )
+            return self._client
+
+    def close(self) -> None:
+        """Close the shared client and its connection pool."""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def __enter__(self) -> "ParallelAudioGenerator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def generate_segments(
         self,
         segments: List[AudioSegment],
@@ -96,90 +212,276 @@ class ParallelAudioGenerator:
         Returns:
             List of AudioResult objects
         """
-        results = []
         total = len(segments)
         completed = 0
 
-        # Check cache first
-        segments_to_generate = []
-        for segment in segments:
-            if self.use_cache and self.cache:
-                cached = self.cache.get_audio(segment.text, self.voice_id)
-                if cached:
-                    # Copy cached audio to output path
-                    segment.output_path.parent.mkdir(parents=True, exist_ok=True)
-                    segment.output_path.write_bytes(cached["data"])
-
-                    results.append(AudioResult(
-                        scene_id=segment.scene_id,
-                        status="cached",
-                        path=segment.output_path,
-                        duration=cached.get("duration"),
-                        from_cache=True,
-                    ))
-                    completed += 1
-                    if progress_callback:
-                        progress_callback(completed, total)
-                    continue
-
-            segments_to_generate.append(segment)
-
-        if not segments_to_generate:
-            return results
-
-        # Generate remaining segments in parallel
+        # Results are placed by position in scene order as they complete, so
+        # no final sort is needed. Segments normally arrive in scene order,
+        # which makes this sort linear.
+        segments = sorted(segments, key=attrgetter("scene_id"))
+        results: List[Optional[AudioResult]] = [None] * total
+
+        # Classify cache hits up front; installing them is just file work
+        cache_hits = []
+        to_generate = []
+        for index, cached in enumerate(self._lookup_cached(segments)):
+            if cached:
+                cache_hits.append((index, cached))
+            else:
+                to_generate.append(index)
+
+        # Cache writes happen on a background thread so harvesting
+        # results never waits on disk
+        cache_queue: Optional[queue.SimpleQueue] = None
+        cache_thread: Optional[threading.Thread] = None
+        if to_generate and self.use_cache and self.cache:
+            cache_queue = queue.SimpleQueue()
+            cache_thread = threading.Thread(
+                target=self._cache_writer, args=(cache_queue,), daemon=True
+            )
+            cache_thread.start()
+
+        # Longest requests go first, so a long clip doesn't start last and
+        # hold up the whole run; workers share one queue, so short clips
+        # fill in around it
+        batches = [
+            to_generate[start:start + self.batch_size]
+            for start in range(0, len(to_generate), self.batch_size)
+        ]
+        batches.sort(key=lambda indices: sum(len(segments[i].text) for i in indices), reverse=True)
+
+        # Install cache hits and generate misses on the same pool. Generation
+        # is submitted first so API requests start before any file installs.
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_segment = {
-                executor.submit(self._generate_single, seg): seg
-                for seg in segments_to_generate
-            }
-
-            for future in as_completed(future_to_segment):
-                segment = future_to_segment[future]
+            future_to_indices = {}
+            for indices in batches:
+                if len(indices) == 1:
+                    future = executor.submit(self._generate_single, segments[indices[0]])
+                else:
+                    future = executor.submit(
+                        self._generate_batch, [segments[i] for i in indices]
+                    )
+                future_to_indices[future] = indices
+            for index, cached in cache_hits:
+                future = executor.submit(self._install_cache_hit, segments[index], cached)
+                future_to_indices[future] = [index]
+
+            for future in as_completed(future_to_indices):
+                indices = future_to_indices[future]
                 try:
-                    result = future.result()
-                    results.append(result)
-
-                    # Cache successful results
-                    if (
-                        result.status == "success"
-                        and self.use_cache
-                        and self.cache
-                        and result.path
-                    ):
-                        audio_data = result.path.read_bytes()
-                        self.cache.cache_audio(
-                            segment.text,
-                            audio_data,
-                            self.voice_id,
-                            result.duration,
-                        )
+                    outcome = future.result()
+                    batch_results = outcome if isinstance(outcome, list) else [outcome]
+
+                    for index, result in zip(indices, batch_results, strict=True):
+                        results[index] = result
+
+                        # Cache successful results
+                        if result.status == "success" and cache_queue is not None:
+                            cache_queue.put((
+                                segments[index].text,
+                                result.path,
+                                self.voice_id,
+                                result.duration,
+                            ))
 
                 except Exception as e:
-                    logger.exception(f"Failed to generate audio for scene {segment.scene_id}")
-                    results.append(AudioResult(
-                        scene_id=segment.scene_id,
-                        status="failed",
-                        error=str(e),
-                    ))
-
-                completed += 1
+                    for index in indices:
+                        segment = segments[index]
+                        logger.exception(f"Failed to generate audio for scene {segment.scene_id}")
+                        results[index] = AudioResult(
+                            scene_id=segment.scene_id,
+                            status="failed",
+                            error=str(e),
+                        )
+
+                completed += len(indices)
                 if progress_callback:
                     progress_callback(completed, total)
 
-        # Sort by scene_id
-        results.sort(key=lambda r: r.scene_id)
+        if cache_queue is not None:
+            cache_queue.put(None)
+            cache_thread.join()
+
         return results
 
-    def _generate_single(self, segment: AudioSegment) -> AudioResult:
-        """Generate a single audio segment."""
+    def _generate_batch(self, batch: List[AudioSegment]) -> List[AudioResult]:
+        """
+        Synthesize several segments with one request and split the result.
+
+        Falls back to one request per segment if the pauses between texts
+        can't be located in the returned audio.
+        """
+        first = batch[0]
+        first.output_path.parent.mkdir(parents=True, exist_ok=True)
+        batch_path = first.output_path.with_name(
+            f".batch_{'_'.join(str(seg.scene_id) for seg in batch)}.mp3"
+        )
+
         try:
-            client = ElevenLabsClient(
-                api_key=self.api_key,
-                voice_id=self.voice_id,
+            self._get_client().generate_audio(
+                text=BATCH_BREAK.join(seg.text for seg in batch),
+                output_path=str(batch_path),
             )
+            for seg in batch:
+                seg.output_path.parent.mkdir(parents=True, exist_ok=True)
+                seg.output_path.unlink(missing_ok=True)
+            durations = _split_audio_on_silence(
+                batch_path, [seg.output_path for seg in batch]
+            )
+        except Exception as e:
+            logger.warning(f"Batched generation failed ({e}), generating segments individually")
+            return [self._generate_single(seg) for seg in batch]
+        finally:
+            batch_path.unlink(missing_ok=True)
+
+        return [
+            AudioResult(
+                scene_id=seg.scene_id,
+                status="success",
+                path=seg.output_path,
+                duration=duration,
+            )
+            for seg, duration in zip(batch, durations, strict=True)
+        ]
+
+    def _cache_writer(self, cache_queue: queue.SimpleQueue) -> None:
+        """Link queued (text, path, voice_id, duration) items into the cache."""
+        while True:
+            item = cache_queue.get()
+            if item is None:
+                break
+            try:
+                self.cache.link_from_path(*item)
+            except Exception as e:
+                logger.warning(f"Could not cache audio: {e}")
+
+    async def agenerate_segments(
+        self,
+        segments: List[AudioSegment],
+        progress_callback: Optional[callable] = None,
+    ) -> List[AudioResult]:
+        """
+        Generate multiple audio segments concurrently on the running event loop.
+
+        All requests share the generator's client and at most ``max_workers``
+        of them are in flight at once.
+
+        Args:
+            segments: List of AudioSegment objects
+            progress_callback: Optional callback(completed, total) for progress updates
+
+        Returns:
+            List of AudioResult objects
+        """
+        total = len(segments)
+        completed = 0
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        try:
+            client = self._get_client()
+        except Exception as e:
+            logger.error(f"Could not create ElevenLabs client: {e}")
+            client = None
+
+        # gather() keeps input order, so sorting the segments orders the results
+        segments = sorted(segments, key=attrgetter("scene_id"))
+        cached_records = await asyncio.to_thread(self._lookup_cached, segments)
+
+        async def run(segment: AudioSegment, cached: Optional[Dict[str, Any]]) -> AudioResult:
+            nonlocal completed
+            if cached:
+                # Installing a cache hit is only file work, so it doesn't
+                # take one of the request slots
+                result = await asyncio.to_thread(self._install_cache_hit, segment, cached)
+            else:
+                async with semaphore:
+                    # The ElevenLabs client is blocking, so each request runs
+                    # in a worker thread while the semaphore bounds concurrency.
+                    result = await asyncio.to_thread(
+                        self._process_segment, segment, client
+                    )
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total)
+            return result
+
+        return list(await asyncio.gather(
+            *(run(seg, cached) for seg, cached in zip(segments, cached_records, strict=True))
+        ))
+
+    def _lookup_cached(
+        self,
+        segments: List[AudioSegment],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Return the cache record for each segment (None on a miss)."""
+        if not (self.use_cache and self.cache):
+            return [None] * len(segments)
+
+        found = self.cache.get_audio_many(
+            [(segment.text, self.voice_id) for segment in segments]
+        )
+        return [found[(segment.text, self.voice_id)] for segment in segments]
+
+    def _install_cache_hit(
+        self,
+        segment: AudioSegment,
+        cached: Dict[str, Any],
+    ) -> AudioResult:
+        """Copy cached audio to the segment's output path."""
+        segment.output_path.parent.mkdir(parents=True, exist_ok=True)
+        link_or_copy(cached["path"], segment.output_path)
+
+        return AudioResult(
+            scene_id=segment.scene_id,
+            status="cached",
+            path=segment.output_path,
+            duration=cached.get("duration"),
+            from_cache=True,
+        )
+
+    def _process_segment(
+        self,
+        segment: AudioSegment,
+        client: Optional[ElevenLabsClient],
+    ) -> AudioResult:
+        """Generate a segment with a shared client and cache the result."""
+        if client is None:
+            return AudioResult(
+                scene_id=segment.scene_id,
+                status="failed",
+                error="ElevenLabs client unavailable",
+            )
+
+        result = self._generate_single(segment, client)
+
+        if result.status == "success" and self.use_cache and self.cache:
+            try:
+                self.cache.link_from_path(
+                    segment.text,
+                    result.path,
+                    self.voice_id,
+                    result.duration,
+                )
+            except Exception as e:
+                # The audio was generated; a cache failure must not fail it
+                logger.warning(f"Could not cache audio for scene {segment.scene_id}: {e}")
+
+        return result
+
+    def _generate_single(
+        self,
+        segment: AudioSegment,
+        client: Optional[ElevenLabsClient] = None,
+    ) -> AudioResult:
+        """Generate a single audio segment."""
+        try:
+            if client is None:
+                client = self._get_client()
 
             segment.output_path.parent.mkdir(parents=True, exist_ok=True)
+            # The output may be a hard link into the cache; replace it
+            # rather than overwriting the cached file through it.
+            segment.output_path.unlink(missing_ok=True)
 
             result = client.generate_audio(
                 text=segment.text,
@@ -208,16 +510,22 @@ async def generate_audio_parallel_async(
     api_key: Optional[str] = None,
     voice_id: Optional[str] = None,
     max_concurrent: int = 4,
+    use_cache: bool = True,
+    progress_callback: Optional[callable] = None,
 ) -> List[AudioResult]:
     """
     Async version of parallel audio generation.
 
+    Runs on the caller's event loop, so it can overlap with other async work.
+
     Args:
         segments: List of segment dicts with 'scene', 'text' keys
         output_dir: Output directory for audio files
         api_key: Optional ElevenLabs API key
         voice_id: Optional voice ID
         max_concurrent: Maximum concurrent generations
+        use_cache: Whether to use caching
+        progress_callback: Optional callback(completed, total)
 
     Returns:
         List of AudioResult objects
@@ -237,18 +545,14 @@ async def generate_audio_parallel_async(
         api_key=api_key,
         voice_id=voice_id,
         max_workers=max_concurrent,
+        use_cache=use_cache,
+        cache_dir=output_dir.parent / ".cache" if use_cache else None,
     )
 
-    # Run in thread pool since ElevenLabs client is synchronous
-    loop = asyncio.get_event_loop()
-    results = await loop.run_in_executor(
-        None,
-        generator.generate_segments,
-        audio_segments,
-        None,
-    )
-
-    return results
+    try:
+        return await generator.agenerate_segments(audio_segments, progress_callback)
+    finally:
+        generator.close()
 
 
 def generate_audio_parallel(
@@ -294,4 +598,7 @@ def generate_audio_parallel(
         cache_dir=output_dir.parent / ".cache" if use_cache else None,
     )
 
-    return generator.generate_segments(audio_segments, progress_callback)
+    try:
+        return generator.generate_segments(audio_segments, progress_callback)
+    finally:
+        generator.close()
@@ -9,7 +9,8 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 class StageStatus(Enum):
@@ -21,7 +22,7 @@ class StageStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class StageProgress:
     """Progress information for a single stage."""
 
@@ -33,6 +34,8 @@ class StageProgress:
     substeps: List[str] = field(default_factory=list)
     current_substep: int = 0
     error: Optional[str] = None
+    # Formatted elapsed time, frozen once the stage has finished
+    _elapsed_str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def elapsed(self) -> Optional[float]:
@@ -45,13 +48,14 @@ class StageProgress:
     @property
     def elapsed_str(self) -> str:
         """Get elapsed time as formatted string."""
+        if self._elapsed_str is not None:
+            return self._elapsed_str
         elapsed = self.elapsed
         if elapsed is None:
             return ""
         if elapsed < 60:
             return f"{elapsed:.0f}s"
-        minutes = int(elapsed // 60)
-        seconds = int(elapsed % 60)
+        minutes, seconds = divmod(int(elapsed), 60)
         return f"{minutes}m {seconds}s"
 
 
@@ -63,6 +67,10 @@ class PipelineProgress:
     current_stage: int = 0
     start_time: Optional[float] = None
 
+    def _finish(self, stage: StageProgress) -> None:
+        stage.end_time = time.time()
+        stage._elapsed_str = stage.elapsed_str
+
     def add_stage(
         self,
         name: str,
@@ -87,13 +95,13 @@ class PipelineProgress:
         """Mark a stage as completed."""
         if stage_index < len(self.stages):
             self.stages[stage_index].status = StageStatus.COMPLETED
-            self.stages[stage_index].end_time = time.time()
+            self._finish(self.stages[stage_index])
 
     def fail_stage(self, stage_index: int, error: str) -> None:
         """Mark a stage as failed."""
         if stage_index < len(self.stages):
             self.stages[stage_index].status = StageStatus.FAILED
-            self.stages[stage_index].end_time = time.time()
+            self._finish(self.stages[stage_index])
             self.stages[stage_index].error = error
 
     def skip_stage(self, stage_index: int) -> None:
@@ -110,9 +118,7 @@ class PipelineProgress:
     def estimated_remaining(self) -> Optional[float]:
         """Estimate remaining time in seconds."""
         remaining = 0.0
-        for i, stage in enumerate(self.stages):
-            if i < self.current_stage:
-                continue
+        for stage in self.stages[self.current_stage:]:
             if stage.status == StageStatus.IN_PROGRESS:
                 # Estimate remaining based on progress
                 if stage.estimated_duration:
@@ -124,6 +130,17 @@ class PipelineProgress:
         return remaining if remaining > 0 else None
 
 
+# ANSI control sequences for redrawing the display in place
+_CLEAR_BELOW = "\033[J"
+_HEADER = ("", "Demo Creation Progress", "=" * 22, "")
+
+
+@lru_cache(maxsize=64)
+def _cursor_up_and_clear(num_lines: int) -> str:
+    """Return the escape sequence that moves up num_lines and clears below."""
+    return f"\033[{num_lines}A{_CLEAR_BELOW}"
+
+
 class ProgressDisplay:
     """
     Displays progress information to the terminal.
@@ -145,6 +162,7 @@ class ProgressDisplay:
         pipeline: PipelineProgress,
         use_rich: bool = True,
         output_callback: Optional[Callable[[str], None]] = None,
+        min_interval: float = 0.05,
     ):
         """
         Initialize progress display.
@@ -153,40 +171,31 @@ class ProgressDisplay:
             pipeline: Pipeline progress tracker
             use_rich: Use rich terminal output (ANSI colors)
             output_callback: Optional callback for output (default: print)
+            min_interval: Minimum seconds between redraws from update()
         """
         self.pipeline = pipeline
         self.use_rich = use_rich
         self.output = output_callback or print
+        self.min_interval = min_interval
+        self._last_draw = float("-inf")
+        # Line buffer reused across renders
+        self._lines: List[str] = []
+        # Lines written by the previous draw, used to move the cursor back
+        self._last_line_count = 0
+
+        # Per-stage labels, rebuilt only when the stage list changes
+        self._prefixes: List[str] = []
+        self._estimates: List[Optional[str]] = []
 
     def render(self) -> str:
         """Render the current progress state as a string."""
-        lines = ["", "Demo Creation Progress", "=" * 22, ""]
-
-        for i, stage in enumerate(self.pipeline.stages):
-            symbol = self.SYMBOLS[stage.status]
-            elapsed = stage.elapsed_str
-
-            # Format stage line
-            if stage.status == StageStatus.IN_PROGRESS:
-                if stage.estimated_duration:
-                    est = self._format_duration(stage.estimated_duration)
-                    line = f"[{symbol}] Stage {i + 1}: {stage.name:<24} ({elapsed} / ~{est})"
-                else:
-                    line = f"[{symbol}] Stage {i + 1}: {stage.name:<24} ({elapsed})"
-            elif stage.status == StageStatus.COMPLETED:
-                line = f"[{symbol}] Stage {i + 1}: {stage.name:<24} ({elapsed})"
-            elif stage.status == StageStatus.FAILED:
-                line = f"[{symbol}] Stage {i + 1}: {stage.name:<24} FAILED"
-            elif stage.status == StageStatus.SKIPPED:
-                line = f"[{symbol}] Stage {i + 1}: {stage.name:<24} (skipped)"
-            else:
-                if stage.estimated_duration:
-                    est = self._format_duration(stage.estimated_duration)
-                    line = f"[{symbol}] Stage {i + 1}: {stage.name:<24} (~{est})"
-                else:
-                    line = f"[{symbol}] Stage {i + 1}: {stage.name:<24}"
+        lines = self._lines
+        lines.clear()
+        lines.extend(_HEADER)
+        prefixes, estimates = self._stage_labels()
 
-            lines.append(line)
+        for stage, prefix, est in zip(self.pipeline.stages, prefixes, estimates, strict=True):
+            lines.append(self._STATUS_RENDERERS[stage.status](self, stage, prefix, est))
 
             # Show substeps for in-progress stage
             if stage.status == StageStatus.IN_PROGRESS and stage.substeps:
@@ -210,17 +219,77 @@ class ProgressDisplay:
 
         return "\n".join(lines)
 
+    def _stage_labels(self) -> Tuple[List[str], List[Optional[str]]]:
+        """Return per-stage line prefixes and formatted estimates, built once."""
+        stages = self.pipeline.stages
+        if len(self._prefixes) != len(stages):
+            self._prefixes = [
+                f"Stage {i + 1}: {stage.name:<24}" for i, stage in enumerate(stages)
+            ]
+            self._estimates = [
+                self._format_duration(stage.estimated_duration)
+                if stage.estimated_duration else None
+                for stage in stages
+            ]
+        return self._prefixes, self._estimates
+
+    def _render_in_progress(self, stage: StageProgress, prefix: str, est: Optional[str]) -> str:
+        symbol = self.SYMBOLS[StageStatus.IN_PROGRESS]
+        if est:
+            return f"[{symbol}] {prefix} ({stage.elapsed_str} / ~{est})"
+        return f"[{symbol}] {prefix} ({stage.elapsed_str})"
+
+    def _render_completed(self, stage: StageProgress, prefix: str, est: Optional[str]) -> str:
+        return f"[{self.SYMBOLS[StageStatus.COMPLETED]}] {prefix} ({stage.elapsed_str})"
+
+    def _render_failed(self, stage: StageProgress, prefix: str, est: Optional[str]) -> str:
+        return f"[{self.SYMBOLS[StageStatus.FAILED]}] {prefix} FAILED"
+
+    def _render_skipped(self, stage: StageProgress, prefix: str, est: Optional[str]) -> str:
+        return f"[{self.SYMBOLS[StageStatus.SKIPPED]}] {prefix} (skipped)"
+
+    def _render_pending(self, stage: StageProgress, prefix: str, est: Optional[str]) -> str:
+        symbol = self.SYMBOLS[StageStatus.PENDING]
+        if est:
+            return f"[{symbol}] {prefix} (~{est})"
+        return f"[{symbol}] {prefix}"
+
+    # Stage status -> line renderer
+    _STATUS_RENDERERS = {
+        StageStatus.IN_PROGRESS: _render_in_progress,
+        StageStatus.COMPLETED: _render_completed,
+        StageStatus.FAILED: _render_failed,
+        StageStatus.SKIPPED: _render_skipped,
+        StageStatus.PENDING: _render_pending,
+    }
+
     def display(self) -> None:
         """Display current progress."""
-        self.output(self.render())
+        self._draw(self.render())
+
+    def _draw(self, text: str, prefix: str = "") -> None:
+        """Write text in one call and remember how many lines it took."""
+        self.output(prefix + text)
+        self._last_line_count = text.count("\n") + 1
 
-    def update(self) -> None:
-        """Update the display (for terminal refresh)."""
-        if self.use_rich:
-            # Move cursor up and clear lines
-            num_lines = 4 + len(self.pipeline.stages) * 2  # Approximate
-            self.output(f"\033[{num_lines}A\033[J")
-        self.display()
+    def update(self, force: bool = False) -> None:
+        """
+        Update the display (for terminal refresh).
+
+        Redraws are coalesced to at most one per ``min_interval``; pass
+        ``force=True`` at stage transitions so the final state is shown.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_draw < self.min_interval:
+            return
+        self._last_draw = now
+
+        # Move cursor up over the previous frame and clear it, in the same
+        # write as the new frame so the terminal never shows a partial redraw
+        prefix = ""
+        if self.use_rich and self._last_line_count > 0:
+            prefix = _cursor_up_and_clear(self._last_line_count)
+        self._draw(self.render(), prefix)
 
     def _format_duration(self, seconds: float) -> str:
         """Format duration in seconds to human-readable string."""
@@ -286,7 +355,7 @@ class ProgressContext:
     def __enter__(self):
         self.pipeline.start_stage(self.stage_index)
         if self.display:
-            self.display.update()
+            self.display.update(force=True)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -296,7 +365,7 @@ class ProgressContext:
             self.pipeline.complete_stage(self.stage_index)
 
         if self.display:
-            self.display.update()
+            self.display.update(force=True)
 
         return False  # Don't suppress exceptions
 
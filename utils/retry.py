@@ -8,11 +8,16 @@ like browser automation, API calls, and K8s interactions.
 import functools
 import logging
 import random
+import subprocess
+import threading
 import time
-from typing import Any, Callable, Optional, Tuple, Type, Union
+from typing import Any, Callable, Iterator, Literal, Optional, Tuple, Type, Union
 
 logger = logging.getLogger(__name__)
 
+# Jitter strategies from the AWS "Exponential Backoff and Jitter" article
+JitterMode = Literal["none", "equal", "full", "decorrelated"]
+
 
 class RetryError(Exception):
     """Raised when all retry attempts have been exhausted."""
@@ -39,27 +44,157 @@ def calculate_backoff(
     max_delay: float = 60.0,
     exponential_base: float = 2.0,
     jitter: bool = True,
+    jitter_mode: Optional[JitterMode] = None,
+    prev_delay: Optional[float] = None,
+    rng: Optional[random.Random] = None,
 ) -> float:
     """
     Calculate delay with exponential backoff and optional jitter.
 
+    Jitter modes follow the AWS "Exponential Backoff and Jitter" article:
+
+    - ``none``: the capped exponential delay itself
+    - ``equal``: half the delay plus a random amount up to the other half
+    - ``full``: uniformly random between 0 and the delay
+    - ``decorrelated``: uniformly random between ``base_delay`` and three
+      times the previous delay, capped at ``max_delay``
+
     Args:
         attempt: Current attempt number (0-indexed)
         base_delay: Initial delay in seconds
         max_delay: Maximum delay in seconds
         exponential_base: Base for exponential calculation
-        jitter: Whether to add random jitter
+        jitter: Whether to add random jitter (full jitter unless jitter_mode
+            is given)
+        jitter_mode: Jitter strategy; overrides ``jitter`` when set
+        prev_delay: Previous delay, used by decorrelated jitter
+        rng: Random generator for jitter (default: the shared module one)
 
     Returns:
         Delay in seconds
     """
     delay = min(base_delay * (exponential_base ** attempt), max_delay)
+    if jitter_mode is None:
+        jitter_mode = "full" if jitter else "none"
+    return _apply_jitter(delay, jitter_mode, base_delay, max_delay, prev_delay, rng)
+
+
+def _apply_jitter(
+    delay: float,
+    jitter_mode: JitterMode,
+    base_delay: float,
+    max_delay: float,
+    prev_delay: Optional[float],
+    rng: Optional[random.Random] = None,
+) -> float:
+    """Apply a jitter strategy to a capped exponential delay."""
+    # The random module's functions share one global generator
+    source = rng if rng is not None else random
+    if jitter_mode == "full":
+        return source.random() * delay
+    if jitter_mode == "equal":
+        return delay / 2 + source.random() * delay / 2
+    if jitter_mode == "decorrelated":
+        upper = (prev_delay or base_delay) * 3
+        return min(max_delay, source.uniform(base_delay, upper))
+    if jitter_mode == "none":
+        return delay
+    raise ValueError(f"Unknown jitter mode: {jitter_mode}")
+
+
+def _backoff_schedule(
+    max_attempts: int,
+    base_delay: float,
+    max_delay: float,
+    exponential_base: float,
+) -> Tuple[float, ...]:
+    """Capped exponential delays (before jitter) between max_attempts attempts."""
+    return tuple(
+        min(base_delay * (exponential_base ** attempt), max_delay)
+        for attempt in range(max_attempts - 1)
+    )
+
+
+def _backoff_plain(scheduled: float, prev_delay: Optional[float]) -> float:
+    """Backoff without jitter: the scheduled delay as-is."""
+    return scheduled
+
+
+def _make_backoff(
+    jitter_mode: JitterMode,
+    base_delay: float,
+    max_delay: float,
+    rng: Optional[random.Random],
+) -> Callable[[float, Optional[float]], float]:
+    """
+    Pick the per-retry delay function once, when a retry loop is set up.
+
+    Args:
+        jitter_mode: Jitter strategy (see calculate_backoff)
+        base_delay: Initial delay in seconds
+        max_delay: Maximum delay in seconds
+        rng: Random generator for jitter
+
+    Returns:
+        A function mapping (scheduled delay, previous delay) to the delay to
+        wait, so the retry loop itself never branches on the jitter mode
+    """
+    if jitter_mode == "none":
+        return _backoff_plain
+
+    def _backoff_jittered(scheduled: float, prev_delay: Optional[float]) -> float:
+        return _apply_jitter(scheduled, jitter_mode, base_delay, max_delay, prev_delay, rng)
+
+    return _backoff_jittered
 
-    if jitter:
-        # Add up to 25% random jitter
-        delay = delay * (0.75 + random.random() * 0.5)
 
-    return delay
+def _iter_attempts(
+    max_attempts: int, delays: Tuple[float, ...]
+) -> Iterator[Tuple[int, Optional[float]]]:
+    """
+    Yield (attempt, delay) for each attempt of a retry loop.
+
+    Args:
+        max_attempts: Maximum number of attempts
+        delays: Backoff schedule from _backoff_schedule
+
+    Yields:
+        The 1-indexed attempt number and the un-jittered delay to wait if it
+        fails, or None for the last attempt
+    """
+    for attempt in range(1, max_attempts + 1):
+        yield attempt, delays[attempt - 1] if attempt < max_attempts else None
+
+
+def _report_retry(
+    attempt: int,
+    max_attempts: int,
+    exc: Exception,
+    delay: float,
+    on_retry: Optional[Callable[[int, Exception, float], None]],
+) -> None:
+    """Call the on_retry callback, or log the failed attempt without one."""
+    if on_retry:
+        on_retry(attempt, exc, delay)
+    else:
+        logger.warning(
+            f"Attempt {attempt}/{max_attempts} failed: {exc}. "
+            f"Retrying in {delay:.2f}s..."
+        )
+
+
+def _exhausted(max_attempts: int, last_exception: Optional[Exception]) -> RetryError:
+    """Build the RetryError raised once every attempt has failed."""
+    if last_exception is None:
+        return RetryError(
+            f"Failed after {max_attempts} attempts",
+            attempts=max_attempts,
+        )
+    return RetryError(
+        f"Failed after {max_attempts} attempts: {last_exception}",
+        attempts=max_attempts,
+        last_exception=last_exception,
+    )
 
 
 def retry(
@@ -70,6 +205,9 @@ def retry(
     jitter: bool = True,
     retryable_exceptions: Tuple[Type[Exception], ...] = (Exception,),
     on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    jitter_mode: Optional[JitterMode] = None,
+    rng: Optional[random.Random] = None,
 ) -> Callable:
     """
     Decorator for retrying functions with exponential backoff.
@@ -82,6 +220,11 @@ def retry(
         jitter: Add random jitter to delays (default: True)
         retryable_exceptions: Tuple of exception types to retry on
         on_retry: Optional callback called on each retry with (attempt, exception, delay)
+        cancel_event: Optional event that, once set, interrupts the backoff wait
+            and stops retrying with a RetryError
+        jitter_mode: Jitter strategy (see calculate_backoff); overrides jitter
+        rng: Random generator for jitter. By default each decorated function
+            gets its own, so concurrent retries don't share the global one.
 
     Returns:
         Decorated function
@@ -93,50 +236,41 @@ def retry(
     """
 
     def decorator(func: Callable) -> Callable:
+        # The backoff schedule is fixed by the decorator arguments, so it is
+        # computed once here; only jitter is applied per retry.
+        delays = _backoff_schedule(max_attempts, base_delay, max_delay, exponential_base)
+        next_delay = _make_backoff(
+            jitter_mode or ("full" if jitter else "none"),
+            base_delay,
+            max_delay,
+            rng if rng is not None else random.Random(),
+        )
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
             last_exception = None
-
-            for attempt in range(max_attempts):
+            delay = None
+            for attempt, scheduled in _iter_attempts(max_attempts, delays):
                 try:
                     return func(*args, **kwargs)
                 except retryable_exceptions as exc:
+                    if scheduled is None:
+                        raise _exhausted(max_attempts, exc) from exc
                     last_exception = exc
 
-                    if attempt == max_attempts - 1:
-                        # Last attempt failed
-                        raise RetryError(
-                            f"Failed after {max_attempts} attempts: {exc}",
-                            attempts=max_attempts,
-                            last_exception=exc,
-                        ) from exc
-
-                    # Calculate delay
-                    delay = calculate_backoff(
-                        attempt=attempt,
-                        base_delay=base_delay,
-                        max_delay=max_delay,
-                        exponential_base=exponential_base,
-                        jitter=jitter,
-                    )
-
-                    # Call retry callback if provided
-                    if on_retry:
-                        on_retry(attempt + 1, exc, delay)
-                    else:
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_attempts} failed: {exc}. "
-                            f"Retrying in {delay:.2f}s..."
-                        )
+                delay = next_delay(scheduled, delay)
+                _report_retry(attempt, max_attempts, last_exception, delay, on_retry)
 
+                if cancel_event is None:
                     time.sleep(delay)
+                elif cancel_event.wait(delay):
+                    raise RetryError(
+                        f"Retry cancelled after {attempt} attempts: {last_exception}",
+                        attempts=attempt,
+                        last_exception=last_exception,
+                    ) from last_exception
 
-            # Should never reach here, but just in case
-            raise RetryError(
-                f"Failed after {max_attempts} attempts",
-                attempts=max_attempts,
-                last_exception=last_exception,
-            )
+            raise _exhausted(max_attempts, last_exception)
 
         return wrapper
 
@@ -152,6 +286,8 @@ async def retry_async(
     jitter: bool = True,
     retryable_exceptions: Tuple[Type[Exception], ...] = (Exception,),
     on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    jitter_mode: Optional[JitterMode] = None,
+    rng: Optional[random.Random] = None,
 ) -> Any:
     """
     Async retry helper with exponential backoff.
@@ -165,6 +301,8 @@ async def retry_async(
         jitter: Add random jitter to delays
         retryable_exceptions: Tuple of exception types to retry on
         on_retry: Optional callback called on each retry
+        jitter_mode: Jitter strategy (see calculate_backoff); overrides jitter
+        rng: Random generator for jitter (default: the shared module one)
 
     Returns:
         Result of the function
@@ -178,44 +316,26 @@ async def retry_async(
     """
     import asyncio
 
+    delays = _backoff_schedule(max_attempts, base_delay, max_delay, exponential_base)
+    next_delay = _make_backoff(
+        jitter_mode or ("full" if jitter else "none"), base_delay, max_delay, rng
+    )
     last_exception = None
+    delay = None
 
-    for attempt in range(max_attempts):
+    for attempt, scheduled in _iter_attempts(max_attempts, delays):
         try:
             return await func()
         except retryable_exceptions as exc:
+            if scheduled is None:
+                raise _exhausted(max_attempts, exc) from exc
             last_exception = exc
 
-            if attempt == max_attempts - 1:
-                raise RetryError(
-                    f"Failed after {max_attempts} attempts: {exc}",
-                    attempts=max_attempts,
-                    last_exception=exc,
-                ) from exc
+        delay = next_delay(scheduled, delay)
+        _report_retry(attempt, max_attempts, last_exception, delay, on_retry)
+        await asyncio.sleep(delay)
 
-            delay = calculate_backoff(
-                attempt=attempt,
-                base_delay=base_delay,
-                max_delay=max_delay,
-                exponential_base=exponential_base,
-                jitter=jitter,
-            )
-
-            if on_retry:
-                on_retry(attempt + 1, exc, delay)
-            else:
-                logger.warning(
-                    f"Attempt {attempt + 1}/{max_attempts} failed: {exc}. "
-                    f"Retrying in {delay:.2f}s..."
-                )
-
-            await asyncio.sleep(delay)
-
-    raise RetryError(
-        f"Failed after {max_attempts} attempts",
-        attempts=max_attempts,
-        last_exception=last_exception,
-    )
+    raise _exhausted(max_attempts, last_exception)
 
 
 class RetryContext:
@@ -241,6 +361,8 @@ class RetryContext:
         exponential_base: float = 2.0,
         jitter: bool = True,
         retryable_exceptions: Tuple[Type[Exception], ...] = (Exception,),
+        jitter_mode: Optional[JitterMode] = None,
+        rng: Optional[random.Random] = None,
     ):
         self.max_attempts = max_attempts
         self.base_delay = base_delay
@@ -248,10 +370,15 @@ class RetryContext:
         self.exponential_base = exponential_base
         self.jitter = jitter
         self.retryable_exceptions = retryable_exceptions
+        self.jitter_mode = jitter_mode
+        self._rng = rng if rng is not None else random.Random()
 
         self._attempt = 0
         self._succeeded = False
         self._last_exception: Optional[Exception] = None
+        # Last backoff delay; decorrelated jitter grows from it
+        self._prev_delay = base_delay
+        self._cancel = threading.Event()
 
     def __enter__(self):
         return self
@@ -274,9 +401,18 @@ class RetryContext:
         """The last exception that occurred."""
         return self._last_exception
 
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() has been called."""
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Stop retrying, interrupting any backoff wait in progress."""
+        self._cancel.set()
+
     def should_retry(self) -> bool:
         """Check if another retry should be attempted."""
-        if self._succeeded:
+        if self._succeeded or self._cancel.is_set():
             return False
         if self._attempt >= self.max_attempts:
             return False
@@ -303,16 +439,29 @@ class RetryContext:
                 max_delay=self.max_delay,
                 exponential_base=self.exponential_base,
                 jitter=self.jitter,
+                jitter_mode=self.jitter_mode,
+                prev_delay=self._prev_delay,
+                rng=self._rng,
             )
+            self._prev_delay = delay
             logger.warning(
                 f"Attempt {self._attempt}/{self.max_attempts} failed: {exception}. "
                 f"Retrying in {delay:.2f}s..."
             )
-            time.sleep(delay)
+            # Returns early if cancel() is called from another thread
+            self._cancel.wait(delay)
 
     def raise_if_exhausted(self) -> None:
-        """Raise RetryError if all attempts have been exhausted."""
-        if not self._succeeded and self._attempt >= self.max_attempts:
+        """Raise RetryError if all attempts have been exhausted or retrying was cancelled."""
+        if self._succeeded:
+            return
+        if self._cancel.is_set():
+            raise RetryError(
+                f"Retry cancelled after {self._attempt} attempts: {self._last_exception}",
+                attempts=self._attempt,
+                last_exception=self._last_exception,
+            )
+        if self._attempt >= self.max_attempts:
             raise RetryError(
                 f"Failed after {self.max_attempts} attempts",
                 attempts=self.max_attempts,
@@ -323,7 +472,7 @@ class RetryContext:
 # Common exception sets for different use cases
 BROWSER_EXCEPTIONS = (TimeoutError, ConnectionError)
 API_EXCEPTIONS = (TimeoutError, ConnectionError, ConnectionRefusedError)
-K8S_EXCEPTIONS = (TimeoutError, ConnectionError, subprocess.SubprocessError if 'subprocess' in dir() else Exception)
+K8S_EXCEPTIONS = (TimeoutError, ConnectionError, subprocess.SubprocessError)
 
 
 def log_retry(attempt: int, exception: Exception, delay: float) -> None:
@@ -338,10 +487,3 @@ def print_retry(attempt: int, exception: Exception, delay: float) -> None:
     """Print-based retry logger for CLI output."""
     print(f"  Attempt {attempt} failed: {exception}. Retrying in {delay:.1f}s...")
 
-
-# Import subprocess for K8S_EXCEPTIONS if available
-try:
-    import subprocess
-    K8S_EXCEPTIONS = (TimeoutError, ConnectionError, subprocess.SubprocessError)
-except ImportError:
-    pass
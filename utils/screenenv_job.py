@@ -4,13 +4,56 @@ Kubernetes Job utilities for screenenv recording.
 Handles creating and monitoring screenenv recording jobs in k8s.
 """
 
+import asyncio
+import functools
+import logging
+import math
 import os
 import subprocess
 import time
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List
 from pathlib import Path
 
+try:
+    from kubernetes import client as k8s_client
+    from kubernetes import config as k8s_config
+    from kubernetes import watch as k8s_watch
+    KUBERNETES_AVAILABLE = True
+except ImportError:
+    KUBERNETES_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bounds for the adaptive poll interval in wait_for_completion
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 30.0
+
+# Log lines kept when a failed job's logs are attached to its status
+FAILURE_LOG_TAIL = 1000
+
+# helm install --wait timeout, in minutes: used until an install time has
+# been observed, and the floor for the adaptive timeout so that a cold image
+# pull still fits after a run of fast installs
+DEFAULT_HELM_TIMEOUT_MINUTES = 10
+
+# Fraction of --timeout after which a failed install counts as timed out;
+# helm exits 1 for every error, so elapsed time is the reliable signal
+HELM_TIMEOUT_FRACTION = 0.95
+
+
+def _parse_counts(output: str, expected: int) -> List[int]:
+    """Parse "|"-separated jsonpath counts, treating missing fields as 0."""
+    fields = output.strip().split("|")
+    fields += [""] * (expected - len(fields))
+    return [int(field) if field.strip().isdigit() else 0 for field in fields[:expected]]
+
+
+@functools.lru_cache(maxsize=256)
+def _build_cmd(prefix: tuple, args: tuple) -> tuple:
+    """Join the kubectl prefix and arguments, memoized for repeated commands."""
+    return prefix + args
+
 
 class ScreenenvJobManager:
     """
@@ -24,6 +67,8 @@ class ScreenenvJobManager:
         namespace: str = "infra",
         helm_chart_path: str = "k8s/infra/charts/screenenv-job",
         context: Optional[str] = None,
+        initial_rtt: float = 1.0,
+        helm_rtt_path: Optional[str] = None,
     ):
         """
         Initialize job manager.
@@ -32,18 +77,130 @@ class ScreenenvJobManager:
             namespace: Kubernetes namespace
             helm_chart_path: Path to screenenv-job Helm chart
             context: Kubernetes context (or set KUBE_CONTEXT env var, defaults to current context)
+            initial_rtt: Seed, in seconds, for the kubectl round-trip estimate
+                that paces adaptive polling
+            helm_rtt_path: JSON file keeping the smoothed helm install time
+                across runs (default: ~/.cache/demo-creator/helm-rtt.json)
         """
         self.namespace = namespace
         self.helm_chart_path = helm_chart_path
         self.context = context or os.getenv("KUBE_CONTEXT")
 
+        # Global flags go before the subcommand, so they also apply to
+        # commands like "exec ... -- cmd" that pass trailing args through
+        prefix = ["kubectl"]
+        if self.context:
+            prefix.extend(["--context", self.context])
+        prefix.extend(["--namespace", self.namespace])
+        self._kubectl_prefix = tuple(prefix)
+
+        # Smoothed kubectl round-trip time and its variation (Jacobson/Karn)
+        self._srtt = initial_rtt
+        self._rttvar = initial_rtt / 2
+
+        # In-process Kubernetes API client, loaded on first use
+        self._batch = None
+        self._batch_loaded = False
+
+        if helm_rtt_path is None:
+            self.helm_rtt_path = Path.home() / ".cache" / "demo-creator" / "helm-rtt.json"
+        else:
+            self.helm_rtt_path = Path(helm_rtt_path)
+
     def _kubectl_cmd(self, *args) -> list:
         """Build kubectl command with optional context."""
-        cmd = ["kubectl"] + list(args)
-        if self.context:
-            cmd.extend(["--context", self.context])
-        cmd.extend(["--namespace", self.namespace])
-        return cmd
+        return list(_build_cmd(self._kubectl_prefix, args))
+
+    def _batch_api(self):
+        """
+        Return a BatchV1Api client, or None to fall back to kubectl.
+
+        Requires the optional ``kubernetes`` package and a loadable kubeconfig.
+        """
+        if not self._batch_loaded:
+            self._batch_loaded = True
+            if KUBERNETES_AVAILABLE:
+                try:
+                    k8s_config.load_kube_config(context=self.context)
+                    self._batch = k8s_client.BatchV1Api()
+                except Exception as e:
+                    logger.warning(f"Kubernetes client unavailable, using kubectl: {e}")
+        return self._batch
+
+    def _run_timed(self, cmd: list) -> subprocess.CompletedProcess:
+        """Run a kubectl command and fold its latency into the RTT estimate."""
+        start = time.monotonic()
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+        )
+        self._observe_rtt(time.monotonic() - start)
+        return result
+
+    def _observe_rtt(self, sample: float) -> None:
+        """Update the smoothed round-trip estimate with one sample."""
+        self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._srtt - sample)
+        self._srtt = 0.875 * self._srtt + 0.125 * sample
+
+    def _poll_delay(self) -> float:
+        """Seconds to wait before the next poll: srtt + 4 * rttvar, in [1, 30]."""
+        return max(MIN_POLL_INTERVAL, min(MAX_POLL_INTERVAL, self._srtt + 4 * self._rttvar))
+
+    def _load_helm_rtt(self) -> Optional[Dict[str, float]]:
+        """Load the smoothed helm install time, or None if none is recorded."""
+        if not self.helm_rtt_path.exists():
+            return None
+        try:
+            data = json.loads(self.helm_rtt_path.read_text())
+            return {"srtt": float(data["srtt"]), "rttvar": float(data["rttvar"])}
+        except Exception as e:
+            logger.warning(f"Failed to load helm install times: {e}")
+            return None
+
+    def _save_helm_rtt(self, state: Dict[str, float]) -> None:
+        """Persist the smoothed helm install time."""
+        try:
+            self.helm_rtt_path.parent.mkdir(parents=True, exist_ok=True)
+            self.helm_rtt_path.write_text(json.dumps(state))
+        except Exception as e:
+            logger.warning(f"Failed to save helm install times: {e}")
+
+    def _helm_timeout_minutes(self) -> int:
+        """
+        Timeout for the next helm install: srtt + 4 * rttvar, in minutes.
+
+        Never less than DEFAULT_HELM_TIMEOUT_MINUTES; history only extends it.
+        """
+        state = self._load_helm_rtt()
+        if state is None:
+            return DEFAULT_HELM_TIMEOUT_MINUTES
+        seconds = state["srtt"] + 4 * state["rttvar"]
+        return max(DEFAULT_HELM_TIMEOUT_MINUTES, math.ceil(seconds / 60))
+
+    def _observe_helm_install(self, elapsed: float, timed_out: bool) -> None:
+        """
+        Fold one helm install into the smoothed install time.
+
+        Following Karn's algorithm, a timed-out install is not a valid sample:
+        it leaves srtt alone and only backs the next timeout off to twice
+        the elapsed time.
+
+        Args:
+            elapsed: Wall-clock seconds the install took
+            timed_out: Whether helm gave up waiting for the release
+        """
+        state = self._load_helm_rtt()
+        if timed_out:
+            if state is None:
+                state = {"srtt": elapsed, "rttvar": elapsed / 4}
+            state["rttvar"] = max(state["rttvar"], (2 * elapsed - state["srtt"]) / 4)
+        elif state is None:
+            state = {"srtt": elapsed, "rttvar": elapsed / 2}
+        else:
+            state["rttvar"] = 0.75 * state["rttvar"] + 0.25 * abs(state["srtt"] - elapsed)
+            state["srtt"] = 0.875 * state["srtt"] + 0.125 * elapsed
+        self._save_helm_rtt(state)
 
     def create_job(
         self,
@@ -52,7 +209,7 @@ class ScreenenvJobManager:
         target_url: Optional[str] = None,
         resolution: str = "1920x1080",
         frame_rate: str = "30",
-        timeout_minutes: int = 10,
+        timeout_minutes: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Create a screenenv recording job.
@@ -63,13 +220,17 @@ class ScreenenvJobManager:
             target_url: Base URL of the application (or set DEMO_TARGET_URL env var)
             resolution: Video resolution (default: 1920x1080)
             frame_rate: Frame rate (default: 30)
-            timeout_minutes: Job timeout in minutes
+            timeout_minutes: Job timeout in minutes. By default it adapts to
+                how long previous installs took on this machine.
 
         Returns:
             Dict with job status
         """
         target_url = target_url or os.getenv("DEMO_TARGET_URL", "http://localhost:3000")
         release_name = f"screenenv-{demo_id}"
+        adaptive = timeout_minutes is None
+        if adaptive:
+            timeout_minutes = self._helm_timeout_minutes()
 
         # Install Helm chart
         cmd = [
@@ -89,13 +250,16 @@ class ScreenenvJobManager:
             cmd.insert(3, "--kube-context")
             cmd.insert(4, self.context)
 
+        start = time.monotonic()
         try:
-            result = subprocess.run(
+            subprocess.run(
                 cmd,
                 check=True,
                 capture_output=True,
                 text=True,
             )
+            if adaptive:
+                self._observe_helm_install(time.monotonic() - start, timed_out=False)
 
             return {
                 "status": "success",
@@ -104,6 +268,10 @@ class ScreenenvJobManager:
             }
 
         except subprocess.CalledProcessError as e:
+            elapsed = time.monotonic() - start
+            # A failure that took the whole --timeout is helm giving up on --wait
+            if adaptive and elapsed >= HELM_TIMEOUT_FRACTION * timeout_minutes * 60:
+                self._observe_helm_install(elapsed, timed_out=True)
             return {
                 "status": "failed",
                 "error": e.stderr,
@@ -113,7 +281,7 @@ class ScreenenvJobManager:
     def wait_for_completion(
         self,
         demo_id: str,
-        poll_interval: int = 5,
+        poll_interval: Optional[float] = None,
         max_wait: int = 600,
     ) -> Dict[str, Any]:
         """
@@ -121,79 +289,227 @@ class ScreenenvJobManager:
 
         Args:
             demo_id: Demo identifier
-            poll_interval: Seconds between status checks
+            poll_interval: Seconds between status checks. By default the job
+                is watched through the kubernetes client when it is installed,
+                and otherwise polled at an interval that adapts to observed
+                kubectl latency.
             max_wait: Maximum seconds to wait
 
         Returns:
             Dict with completion status
         """
         job_name = f"screenenv-{demo_id}"
-        elapsed = 0
+        deadline = time.monotonic() + max_wait
 
-        while elapsed < max_wait:
-            # Check job status
-            cmd = self._kubectl_cmd("get", "job", job_name, "-o", "jsonpath={.status.succeeded}")
+        # With the Kubernetes client, stream job events instead of polling
+        if poll_interval is None and self._batch_api() is not None:
+            try:
+                return self._watch_for_completion(demo_id, job_name, max_wait)
+            except Exception as e:
+                logger.warning(f"Watching job {job_name} failed, polling instead: {e}")
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-            )
+        return self._poll_for_completion(demo_id, job_name, poll_interval, deadline)
+
+    def _watch_for_completion(
+        self,
+        demo_id: str,
+        job_name: str,
+        max_wait: int,
+    ) -> Dict[str, Any]:
+        """Wait for the job over a single Kubernetes watch stream."""
+        job_watch = k8s_watch.Watch()
+        try:
+            for event in job_watch.stream(
+                self._batch.list_namespaced_job,
+                namespace=self.namespace,
+                field_selector=f"metadata.name={job_name}",
+                timeout_seconds=max_wait,
+            ):
+                status = event["object"].status
+                if (status.succeeded or 0) >= 1:
+                    return {
+                        "status": "completed",
+                        "demo_id": demo_id,
+                    }
+                if (status.failed or 0) > 0:
+                    return {
+                        "status": "failed",
+                        "demo_id": demo_id,
+                        "logs": self.get_job_logs(demo_id, tail=FAILURE_LOG_TAIL),
+                    }
+        finally:
+            job_watch.stop()
+
+        return {
+            "status": "timeout",
+            "demo_id": demo_id,
+        }
+
+    def _poll_for_completion(
+        self,
+        demo_id: str,
+        job_name: str,
+        poll_interval: Optional[float],
+        deadline: float,
+    ) -> Dict[str, Any]:
+        """Wait for the job by polling its status with kubectl."""
+        # Succeeded, failed and active counts in one round trip
+        cmd = self._kubectl_cmd(
+            "get", "job", job_name,
+            "-o", "jsonpath={.status.succeeded}|{.status.failed}|{.status.active}",
+        )
+
+        while time.monotonic() < deadline:
+            result = self._run_timed(cmd)
+            succeeded, failed, _active = _parse_counts(result.stdout, 3)
 
-            if result.stdout == "1":
+            if succeeded >= 1:
                 return {
                     "status": "completed",
                     "demo_id": demo_id,
                 }
 
-            # Check for failures
-            cmd_failed = self._kubectl_cmd("get", "job", job_name, "-o", "jsonpath={.status.failed}")
+            if failed > 0:
+                # Get logs for debugging
+                logs = self.get_job_logs(demo_id, tail=FAILURE_LOG_TAIL)
 
-            result_failed = subprocess.run(
-                cmd_failed,
-                capture_output=True,
-                text=True,
-            )
+                return {
+                    "status": "failed",
+                    "demo_id": demo_id,
+                    "logs": logs,
+                }
 
-            if result_failed.stdout and int(result_failed.stdout) > 0:
-                # Get logs for debugging
-                logs = self.get_job_logs(demo_id)
+            delay = poll_interval if poll_interval is not None else self._poll_delay()
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+
+        return {
+            "status": "timeout",
+            "demo_id": demo_id,
+        }
+
+    async def wait_for_completion_async(
+        self,
+        demo_id: str,
+        poll_interval: Optional[float] = None,
+        max_wait: int = 600,
+    ) -> Dict[str, Any]:
+        """
+        Async version of wait_for_completion.
+
+        Polls with kubectl subprocesses on the running event loop, so many
+        jobs can be awaited together without a thread per job.
+
+        Args:
+            demo_id: Demo identifier
+            poll_interval: Seconds between status checks (default: adaptive)
+            max_wait: Maximum seconds to wait
+
+        Returns:
+            Dict with completion status
+        """
+        job_name = f"screenenv-{demo_id}"
+        deadline = time.monotonic() + max_wait
+        cmd = self._kubectl_cmd(
+            "get", "job", job_name,
+            "-o", "jsonpath={.status.succeeded}|{.status.failed}|{.status.active}",
+        )
+
+        while time.monotonic() < deadline:
+            stdout = await self._run_timed_async(cmd)
+            succeeded, failed, _active = _parse_counts(stdout, 3)
 
+            if succeeded >= 1:
+                return {
+                    "status": "completed",
+                    "demo_id": demo_id,
+                }
+
+            if failed > 0:
+                logs = await self._run_timed_async(
+                    self._kubectl_cmd("logs", f"job/{job_name}", f"--tail={FAILURE_LOG_TAIL}")
+                )
                 return {
                     "status": "failed",
                     "demo_id": demo_id,
                     "logs": logs,
                 }
 
-            time.sleep(poll_interval)
-            elapsed += poll_interval
+            delay = poll_interval if poll_interval is not None else self._poll_delay()
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
 
         return {
             "status": "timeout",
             "demo_id": demo_id,
         }
 
-    def get_job_logs(self, demo_id: str) -> str:
+    async def _run_timed_async(self, cmd: list) -> str:
+        """Run a kubectl command without blocking the loop and return its stdout."""
+        start = time.monotonic()
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, _ = await proc.communicate()
+        self._observe_rtt(time.monotonic() - start)
+        return stdout.decode(errors="replace")
+
+    def get_job_logs(self, demo_id: str, tail: Optional[int] = None) -> str:
         """
         Get logs from a job pod.
 
         Args:
             demo_id: Demo identifier
+            tail: Only return the last N lines (default: all)
 
         Returns:
             Job logs as string
         """
+        return "".join(self.iter_job_logs(demo_id, tail=tail))
+
+    def iter_job_logs(
+        self,
+        demo_id: str,
+        follow: bool = False,
+        tail: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Stream logs from a job pod line by line.
+
+        Lines are yielded as kubectl prints them, so callers can react to
+        output without waiting for the whole log.
+
+        Args:
+            demo_id: Demo identifier
+            follow: Keep streaming until the pod exits
+            tail: Only return the last N lines (default: all)
+
+        Yields:
+            Log lines, including trailing newlines
+        """
         job_name = f"screenenv-{demo_id}"
 
         cmd = self._kubectl_cmd("logs", f"job/{job_name}")
+        if follow:
+            cmd.append("--follow")
+        if tail is not None:
+            cmd.append(f"--tail={tail}")
 
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
+            bufsize=1,
         )
-
-        return result.stdout
+        try:
+            yield from proc.stdout
+        finally:
+            # The caller may stop early, e.g. while following
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
 
     def retrieve_recording(
         self,
@@ -210,35 +526,23 @@ class ScreenenvJobManager:
         Returns:
             True if successful
         """
-        # Get pod name
-        cmd_get_pod = self._kubectl_cmd(
-            "get", "pods",
-            "-l", f"job-name=screenenv-{demo_id}",
-            "-o", "jsonpath={.items[0].metadata.name}",
-        )
-
-        result = subprocess.run(
-            cmd_get_pod,
-            capture_output=True,
-            text=True,
-        )
-
-        pod_name = result.stdout.strip()
-        if not pod_name:
-            return False
-
-        # Copy file from pod
+        # Stream the file out of the job's pod straight into output_path.
+        # Addressing the pod as job/<name> lets kubectl resolve it in the same
+        # call, and unlike kubectl cp no tar archive is needed on either side.
+        job_name = f"screenenv-{demo_id}"
         remote_path = f"/recordings/{demo_id}/raw_recording.mp4"
+        cmd_cat = self._kubectl_cmd("exec", f"job/{job_name}", "--", "cat", remote_path)
 
-        cmd_cp = ["kubectl", "cp", f"{self.namespace}/{pod_name}:{remote_path}", output_path]
-        if self.context:
-            cmd_cp.extend(["--context", self.context])
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "wb") as f:
+            result = subprocess.run(cmd_cat, stdout=f, stderr=subprocess.PIPE)
 
-        try:
-            subprocess.run(cmd_cp, check=True)
-            return True
-        except subprocess.CalledProcessError:
+        if result.returncode != 0:
+            logger.warning(f"Failed to copy recording from {job_name}: {result.stderr!r}")
+            output.unlink(missing_ok=True)
             return False
+        return True
 
     def cleanup_job(self, demo_id: str) -> None:
         """
@@ -316,3 +620,73 @@ def create_and_run_recording(
         "demo_id": demo_id,
         "recording_path": output_path,
     }
+
+
+async def create_and_run_recording_async(
+    demo_id: str,
+    script_url: str,
+    output_path: str,
+    target_url: Optional[str] = None,
+    context: Optional[str] = None,
+    cleanup: bool = True,
+) -> Dict[str, Any]:
+    """
+    Async version of create_and_run_recording.
+
+    Waiting for the job runs on the event loop, so several recordings can
+    be run together:
+
+        results = await asyncio.gather(*(
+            create_and_run_recording_async(demo_id, url, path)
+            for demo_id, url, path in jobs
+        ))
+
+    Args:
+        demo_id: Demo identifier
+        script_url: URL to script YAML
+        output_path: Local path to save recording
+        target_url: Application URL (or set DEMO_TARGET_URL env var)
+        context: Kubernetes context (or set KUBE_CONTEXT env var)
+        cleanup: Whether to cleanup job after completion
+
+    Returns:
+        Dict with status and paths
+    """
+    manager = ScreenenvJobManager(context=context)
+
+    # Create job
+    create_result = await asyncio.to_thread(
+        manager.create_job,
+        demo_id=demo_id,
+        script_url=script_url,
+        target_url=target_url,
+    )
+
+    if create_result["status"] != "success":
+        return create_result
+
+    # Wait for completion
+    wait_result = await manager.wait_for_completion_async(demo_id)
+
+    if wait_result["status"] != "completed":
+        return wait_result
+
+    # Retrieve recording
+    success = await asyncio.to_thread(manager.retrieve_recording, demo_id, output_path)
+
+    if not success:
+        return {
+            "status": "failed",
+            "error": "Failed to retrieve recording",
+            "demo_id": demo_id,
+        }
+
+    # Cleanup
+    if cleanup:
+        await asyncio.to_thread(manager.cleanup_job, demo_id)
+
+    return {
+        "status": "success",
+        "demo_id": demo_id,
+        "recording_path": output_path,
+    }
@@ -5,14 +5,230 @@ Crawls web applications to discover robust selectors for interactive elements.
 Prioritizes test-ids, aria-labels, and text-based selectors over CSS classes.
 """
 
-import hashlib
+import functools
 import json
 import logging
+import re
+import weakref
+import zlib
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Attributes read from each element when choosing its selector
+ANALYZED_ATTRIBUTES = ("data-testid", "aria-label", "name", "placeholder", "id", "class", "type")
+
+# Attributes the choice of selector depends on, in _generate_selector_cached
+# argument order
+SELECTOR_ATTRIBUTES = ("data-testid", "aria-label", "name", "placeholder", "class")
+
+# Element names: runs of spaces and dashes become "_", other non-word
+# characters are dropped
+_SPACE_DASH_RE = re.compile(r"[ \-]+")
+_NAME_RE = re.compile(r"\W+")
+
+# Utility-class prefixes (Tailwind-style spacing, layout, colors) that make
+# poor selectors
+_UTILITY_CLASS_RE = re.compile(r"p-|m-|text-|bg-|flex|grid|w-|h-")
+
+# Element kinds found by discover_page and the CSS selectors matching each,
+# in the order their results are merged
+DISCOVERY_SELECTORS = (
+    ("button", (
+        "button",
+        "[role='button']",
+        "input[type='submit']",
+        "input[type='button']",
+        "a.btn",
+        "a.button",
+    )),
+    ("input", (
+        "input[type='text']",
+        "input[type='email']",
+        "input[type='password']",
+        "input[type='search']",
+        "input[type='tel']",
+        "input[type='url']",
+        "input[type='number']",
+        "input:not([type])",
+        "textarea",
+        "[contenteditable='true']",
+    )),
+    ("link", ("a[href]",)),
+    ("select", ("select",)),
+)
+
+# Excludes explicitly hidden elements in the query itself, before the
+# per-element layout checks run
+_NOT_HIDDEN = ":not([hidden]):not([aria-hidden='true'])"
+
+
+def _discovery_kinds(suffix: str) -> List[List[str]]:
+    """[kind, selector list] pairs for _DISCOVER_JS, each selector + suffix."""
+    return [
+        [kind, ", ".join(selector + suffix for selector in selectors)]
+        for kind, selectors in DISCOVERY_SELECTORS
+    ]
+
+
+_DISCOVERY_KINDS = _discovery_kinds("")
+_DISCOVERY_KINDS_VISIBLE = _discovery_kinds(_NOT_HIDDEN)
+
+# Describes an element as {tag, text, selectorText, inShadow, box, attrs};
+# shared by the scripts below. text is the rendered innerText, used for names;
+# selectorText is textContent with whitespace collapsed exactly as XPath
+# normalize-space() does, so text selectors match what XPath sees (raw case,
+# hidden descendants included) rather than the CSS-transformed rendering.
+# inShadow marks elements inside a shadow root, which XPath cannot reach.
+_DESCRIBE_ELEMENT_JS = """
+const describe = (el, attrNames) => {
+    const rects = el.getClientRects();
+    const rect = el.getBoundingClientRect();
+    const attrs = {};
+    for (const name of attrNames) {
+        const value = el.getAttribute(name);
+        if (value) attrs[name] = value;
+    }
+    return {
+        tag: el.tagName.toLowerCase(),
+        text: (el.innerText || "").trim().slice(0, 100),
+        selectorText: (el.textContent || "")
+            .replace(/[ \\t\\r\\n]+/g, " ")
+            .replace(/^ | $/g, "")
+            .slice(0, 100),
+        inShadow: el.getRootNode() !== document,
+        box: rects.length
+            ? {x: rect.x, y: rect.y, width: rect.width, height: rect.height}
+            : null,
+        attrs: attrs,
+    };
+};
+"""
+
+# Collects the elements matching a selector in the document and, recursively,
+# in every open shadow root, calling onShadowRoot for each root entered.
+# Closed shadow roots are not reachable from page scripts and are skipped.
+_QUERY_DEEP_JS = """
+const queryDeep = (selector, onShadowRoot) => {
+    const found = [];
+    const walk = (root) => {
+        for (const el of root.querySelectorAll(selector)) found.push(el);
+        for (const host of root.querySelectorAll("*")) {
+            if (!host.shadowRoot) continue;
+            if (onShadowRoot) onShadowRoot(host.shadowRoot);
+            walk(host.shadowRoot);
+        }
+    };
+    walk(document);
+    return found;
+};
+"""
+
+# Reads everything _analyze_element needs in one round trip to the browser
+_ELEMENT_INFO_JS = (
+    "(el, attrNames) => {" + _DESCRIBE_ELEMENT_JS + "return describe(el, attrNames); }"
+)
+
+# Finds and describes every interactive element in one pass over the
+# document and its open shadow roots, grouped by kind in DISCOVERY_SELECTORS
+# order. Shadow roots it enters are handed to window.__dc_observe so their
+# mutations also count towards the DOM revision.
+_DISCOVER_JS = (
+    "({kinds, attrNames, includeHidden}) => {" + _DESCRIBE_ELEMENT_JS + _QUERY_DEEP_JS + """
+    const isVisible = (el) => {
+        // No offsetParent means display: none (or a hidden ancestor), except
+        // for fixed-position elements
+        if (el.offsetParent === null && getComputedStyle(el).position !== "fixed") {
+            return false;
+        }
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0
+            && getComputedStyle(el).visibility !== "hidden";
+    };
+    const checkVisible = !includeHidden;
+    const groups = kinds.map(() => []);
+    const candidates = queryDeep(kinds.map((k) => k[1]).join(", "), window.__dc_observe);
+    for (const el of candidates) {
+        if (checkVisible && !isVisible(el)) continue;
+        let info = null;
+        kinds.forEach(([kind, selector], i) => {
+            if (el.matches(selector)) {
+                info = info || describe(el, attrNames);
+                groups[i].push({kind: kind, ...info});
+            }
+        });
+    }
+    return groups.flat();
+}
+"""
+)
+
+# Defines _DISCOVER_JS as window.__dc_scan. Installed once per page, so each
+# discovery sends only the short _SCAN_CALL_JS for the browser to compile.
+# Also counts DOM mutations in window.__dc_rev, so a scan can be reused
+# until the document changes; shadow roots are observed once a scan finds them.
+_DC_JS_LIB = (
+    "(() => { if (window.__dc_scan) return; window.__dc_scan = " + _DISCOVER_JS + """;
+    window.__dc_rev = 0;
+    const observer = new MutationObserver(() => { window.__dc_rev++; });
+    window.__dc_observe = (root) => observer.observe(root, {
+        subtree: true, childList: true, attributes: true, characterData: true,
+    });
+    window.__dc_observe(document);
+})()"""
+)
+_SCAN_CALL_JS = "(arg) => window.__dc_scan(arg)"
+
+# Identifies the current document, its mutation count and the scroll
+# position and viewport size, which the cached bounding boxes depend on;
+# timeOrigin tells apart reloads of the same URL
+_DOM_REVISION_JS = (
+    "() => window.__dc_rev === undefined ? null"
+    " : [performance.timeOrigin, window.__dc_rev, window.scrollX, window.scrollY,"
+    " window.innerWidth, window.innerHeight].join(':')"
+)
+
+# Last discover_page result per page, as ((url, revision, include_hidden),
+# elements), shared by all SelectorDiscovery instances
+_SCAN_CACHE = weakref.WeakKeyDictionary()
+
+# Pages _DC_JS_LIB has been installed in, shared like _SCAN_CACHE since the
+# convenience functions create a new SelectorDiscovery for every call
+_INSTALLED_PAGES = weakref.WeakSet()
+
+
+# Characters that must be escaped inside a single-quoted CSS string; newlines
+# take CSS hex escapes, which JSON-style "\\n" escapes are not
+_CSS_STRING_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "'": "\\'",
+    "\n": "\\a ",
+    "\r": "\\d ",
+    "\f": "\\c ",
+})
+
+
+def _css_string(value: str) -> str:
+    """Quote a value for use in a CSS attribute selector."""
+    return f"'{value.translate(_CSS_STRING_ESCAPES)}'"
+
+
+def _xpath_literal(value: str) -> str:
+    """Quote a value as an XPath string literal, using concat() if it has both quotes."""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def _name_part(text: str) -> str:
+    """Turn element text into a lowercase identifier of at most 30 chars."""
+    name = _SPACE_DASH_RE.sub("_", text.lower().strip())
+    return _NAME_RE.sub("", name)[:30]
+
 
 @dataclass
 class DiscoveredElement:
@@ -25,6 +241,20 @@ class DiscoveredElement:
     priority: int  # Lower is better
     attributes: Dict[str, str] = field(default_factory=dict)
     bounding_box: Optional[Dict[str, float]] = None
+    _locator: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def get_locator(self, page) -> Any:
+        """
+        Return a Playwright locator for this element's selector.
+
+        The locator is created on first use and reused afterwards.
+
+        Args:
+            page: Playwright page the element was discovered on
+        """
+        if self._locator is None:
+            self._locator = page.locator(self.selector)
+        return self._locator
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -38,6 +268,14 @@ class DiscoveredElement:
         }
 
 
+@dataclass
+class CompiledSelector:
+    """A discovered selector with a Playwright locator ready for reuse."""
+
+    selector: str
+    locator: Any
+
+
 class SelectorDiscovery:
     """
     Discovers robust selectors for interactive elements on web pages.
@@ -54,6 +292,39 @@ class SelectorDiscovery:
     PRIORITY_ROLE = 6
     PRIORITY_CSS_CLASS = 7
 
+    # Attribute-based selectors tried before and after the text selector, as
+    # (attribute, build(value, tag), selector type, priority, element types
+    # it applies to or None for all)
+    _STRATEGIES_BEFORE_TEXT = (
+        (
+            "data-testid",
+            lambda v, tag: f"[data-testid={_css_string(v)}]",
+            "test-id",
+            PRIORITY_TEST_ID,
+            None,
+        ),
+        (
+            "aria-label",
+            lambda v, tag: f"[aria-label={_css_string(v)}]",
+            "aria-label",
+            PRIORITY_ARIA_LABEL,
+            None,
+        ),
+    )
+    _STRATEGIES_AFTER_TEXT = (
+        ("name", lambda v, tag: f"{tag}[name={_css_string(v)}]", "name", PRIORITY_NAME, None),
+        (
+            "placeholder",
+            lambda v, tag: f"{tag}[placeholder={_css_string(v)}]",
+            "placeholder",
+            PRIORITY_PLACEHOLDER,
+            ("input",),
+        ),
+    )
+
+    # Choosers built by _build_chooser, by element type
+    _choosers: Dict[str, Callable] = {}
+
     def __init__(self, base_url: str):
         """
         Initialize selector discovery.
@@ -62,7 +333,6 @@ class SelectorDiscovery:
             base_url: Base URL of the application
         """
         self.base_url = base_url
-        self._page = None
 
     def discover_page(
         self,
@@ -85,152 +355,63 @@ class SelectorDiscovery:
             page.goto(url)
             page.wait_for_load_state("networkidle")
 
-        elements = {}
-
-        # Discover buttons
-        button_elements = self._discover_buttons(page, include_hidden)
-        elements.update(button_elements)
+        # Reuse the last scan of this page if its document hasn't changed
+        self._install_helpers(page)
+        revision = page.evaluate(_DOM_REVISION_JS)
+        key = (page.url, revision, include_hidden)
+        cached = _SCAN_CACHE.get(page)
+        if revision is not None and cached is not None and cached[0] == key:
+            logger.debug(f"Reusing discovered elements for {page.url}")
+            return dict(cached[1])
 
-        # Discover inputs
-        input_elements = self._discover_inputs(page, include_hidden)
-        elements.update(input_elements)
-
-        # Discover links
-        link_elements = self._discover_links(page, include_hidden)
-        elements.update(link_elements)
-
-        # Discover select dropdowns
-        select_elements = self._discover_selects(page, include_hidden)
-        elements.update(select_elements)
-
-        logger.info(f"Discovered {len(elements)} interactive elements on {page.url}")
-        return elements
-
-    def _discover_buttons(
-        self,
-        page,
-        include_hidden: bool = False,
-    ) -> Dict[str, DiscoveredElement]:
-        """Discover button elements."""
         elements = {}
 
-        # Query all button-like elements
-        selectors = [
-            "button",
-            "[role='button']",
-            "input[type='submit']",
-            "input[type='button']",
-            "a.btn, a.button",
-        ]
-
-        for base_selector in selectors:
-            locators = page.locator(base_selector).all()
-
-            for locator in locators:
-                try:
-                    if not include_hidden and not locator.is_visible():
-                        continue
+        for info in self._discover_all_js(page, include_hidden):
+            element = self._build_element(info, info["kind"])
+            if element:
+                # Create semantic name
+                name = self._generate_name(element, info["kind"])
+                elements[name] = element
 
-                    element = self._analyze_element(locator, "button")
-                    if element:
-                        # Create semantic name
-                        name = self._generate_name(element, "button")
-                        elements[name] = element
-
-                except Exception as e:
-                    logger.debug(f"Error analyzing button element: {e}")
-
-        return elements
-
-    def _discover_inputs(
-        self,
-        page,
-        include_hidden: bool = False,
-    ) -> Dict[str, DiscoveredElement]:
-        """Discover input elements."""
-        elements = {}
-
-        # Query input elements
-        selectors = [
-            "input[type='text']",
-            "input[type='email']",
-            "input[type='password']",
-            "input[type='search']",
-            "input[type='tel']",
-            "input[type='url']",
-            "input[type='number']",
-            "input:not([type])",
-            "textarea",
-            "[contenteditable='true']",
-        ]
-
-        for base_selector in selectors:
-            locators = page.locator(base_selector).all()
-
-            for locator in locators:
-                try:
-                    if not include_hidden and not locator.is_visible():
-                        continue
-
-                    element = self._analyze_element(locator, "input")
-                    if element:
-                        name = self._generate_name(element, "input")
-                        elements[name] = element
-
-                except Exception as e:
-                    logger.debug(f"Error analyzing input element: {e}")
-
-        return elements
-
-    def _discover_links(
-        self,
-        page,
-        include_hidden: bool = False,
-    ) -> Dict[str, DiscoveredElement]:
-        """Discover link elements."""
-        elements = {}
-
-        locators = page.locator("a[href]").all()
-
-        for locator in locators:
-            try:
-                if not include_hidden and not locator.is_visible():
-                    continue
-
-                element = self._analyze_element(locator, "link")
-                if element:
-                    name = self._generate_name(element, "link")
-                    elements[name] = element
-
-            except Exception as e:
-                logger.debug(f"Error analyzing link element: {e}")
+        if revision is not None:
+            _SCAN_CACHE[page] = (key, dict(elements))
 
+        logger.info(f"Discovered {len(elements)} interactive elements on {page.url}")
         return elements
 
-    def _discover_selects(
-        self,
-        page,
-        include_hidden: bool = False,
-    ) -> Dict[str, DiscoveredElement]:
-        """Discover select dropdown elements."""
-        elements = {}
-
-        locators = page.locator("select").all()
-
-        for locator in locators:
-            try:
-                if not include_hidden and not locator.is_visible():
-                    continue
+    def _discover_all_js(self, page, include_hidden: bool = False) -> List[Dict[str, Any]]:
+        """
+        Describe every interactive element on the page in one evaluate call.
 
-                element = self._analyze_element(locator, "select")
-                if element:
-                    name = self._generate_name(element, "select")
-                    elements[name] = element
+        Args:
+            page: Playwright page object
+            include_hidden: Include hidden elements
 
-            except Exception as e:
-                logger.debug(f"Error analyzing select element: {e}")
+        Returns:
+            List of {kind, tag, text, selectorText, inShadow, box, attrs} dicts
+        """
+        self._install_helpers(page)
+        return page.evaluate(
+            _SCAN_CALL_JS,
+            {
+                "kinds": _DISCOVERY_KINDS if include_hidden else _DISCOVERY_KINDS_VISIBLE,
+                "attrNames": list(ANALYZED_ATTRIBUTES),
+                "includeHidden": include_hidden,
+            },
+        )
+
+    def _install_helpers(self, page) -> None:
+        """
+        Install the discovery script in a page the first time it is scanned.
 
-        return elements
+        The init script covers documents the page navigates to later; the
+        evaluate covers the document already loaded.
+        """
+        if page in _INSTALLED_PAGES:
+            return
+        page.add_init_script(script=_DC_JS_LIB)
+        page.evaluate(_DC_JS_LIB)
+        _INSTALLED_PAGES.add(page)
 
     def _analyze_element(
         self,
@@ -240,6 +421,9 @@ class SelectorDiscovery:
         """
         Analyze an element and generate the best selector.
 
+        For analyzing a single locator; discover_page reads the same details,
+        bounding box included, in its page scan.
+
         Args:
             locator: Playwright locator
             element_type: Type of element (button, input, link, select)
@@ -248,127 +432,263 @@ class SelectorDiscovery:
             DiscoveredElement or None if no good selector found
         """
         try:
-            # Get element attributes
-            tag = locator.evaluate("el => el.tagName.toLowerCase()")
-            text = locator.inner_text().strip()[:100]  # Limit text length
-            bounding_box = locator.bounding_box()
-
-            attributes = {}
-            for attr in ["data-testid", "aria-label", "name", "placeholder", "id", "class", "type"]:
-                value = locator.get_attribute(attr)
-                if value:
-                    attributes[attr] = value
-
-            # Generate best selector
-            selector, selector_type, priority = self._generate_selector(
-                tag, text, attributes, element_type
-            )
-
-            if not selector:
-                return None
-
-            return DiscoveredElement(
-                tag=tag,
-                text=text,
-                selector=selector,
-                selector_type=selector_type,
-                priority=priority,
-                attributes=attributes,
-                bounding_box=bounding_box,
-            )
+            # Tag, text (limited to 100 chars), box and attributes in one call
+            info = locator.evaluate(_ELEMENT_INFO_JS, list(ANALYZED_ATTRIBUTES))
+            return self._build_element(info, element_type)
 
         except Exception as e:
             logger.debug(f"Error analyzing element: {e}")
             return None
 
+    def _build_element(
+        self,
+        info: Dict[str, Any],
+        element_type: str,
+    ) -> Optional[DiscoveredElement]:
+        """
+        Build a DiscoveredElement from an element description read in the page.
+
+        Args:
+            info: Dict with the element's tag, text, selectorText, inShadow,
+                box and attrs
+            element_type: Type of element (button, input, link, select)
+
+        Returns:
+            DiscoveredElement or None if no good selector found
+        """
+        tag = info["tag"]
+        text = info["text"]
+        attributes = info["attrs"]
+
+        # Generate best selector
+        selector, selector_type, priority = self._generate_selector(
+            tag, info["selectorText"], attributes, element_type, info["inShadow"]
+        )
+
+        if not selector:
+            return None
+
+        return DiscoveredElement(
+            tag=tag,
+            text=text,
+            selector=selector,
+            selector_type=selector_type,
+            priority=priority,
+            attributes=attributes,
+            bounding_box=info["box"],
+        )
+
     def _generate_selector(
         self,
         tag: str,
         text: str,
         attributes: Dict[str, str],
         element_type: str,
+        in_shadow: bool = False,
     ) -> Tuple[Optional[str], str, int]:
         """
         Generate the best selector for an element.
 
+        Results are memoized, so repeated elements such as table-row buttons
+        only build their selector once.
+
         Returns:
             Tuple of (selector, selector_type, priority)
         """
-        # Priority 1: data-testid
-        if "data-testid" in attributes:
-            test_id = attributes["data-testid"]
-            return f"[data-testid='{test_id}']", "test-id", self.PRIORITY_TEST_ID
-
-        # Priority 2: aria-label
-        if "aria-label" in attributes:
-            aria = attributes["aria-label"]
-            return f"[aria-label='{aria}']", "aria-label", self.PRIORITY_ARIA_LABEL
-
-        # Priority 3: Text-based selector (for buttons and links)
-        if text and element_type in ("button", "link"):
-            # Clean and escape text
-            clean_text = text.replace("'", "\\'")
-            if len(clean_text) <= 50:  # Only use text if reasonably short
-                return f"{tag}:has-text('{clean_text}')", "text", self.PRIORITY_TEXT
-
-        # Priority 4: name attribute
-        if "name" in attributes:
-            name = attributes["name"]
-            return f"{tag}[name='{name}']", "name", self.PRIORITY_NAME
-
-        # Priority 5: placeholder (for inputs)
-        if "placeholder" in attributes and element_type == "input":
-            placeholder = attributes["placeholder"]
-            return f"{tag}[placeholder='{placeholder}']", "placeholder", self.PRIORITY_PLACEHOLDER
-
-        # Priority 6: Role-based with text
-        if text and element_type == "button":
-            clean_text = text.replace("'", "\\'")[:30]
-            return f"[role='button']:has-text('{clean_text}')", "role", self.PRIORITY_ROLE
-
-        # Priority 7: CSS class (last resort, fragile)
-        if "class" in attributes:
-            classes = attributes["class"].split()
-            # Filter out utility classes
-            meaningful_classes = [
-                c for c in classes
-                if not c.startswith(("p-", "m-", "text-", "bg-", "flex", "grid", "w-", "h-"))
-                and len(c) > 2
-            ]
-            if meaningful_classes:
-                selector = f"{tag}.{'.'.join(meaningful_classes[:2])}"
-                return selector, "css", self.PRIORITY_CSS_CLASS
-
-        return None, "", 999
+        return _generate_selector_cached(
+            tag,
+            element_type,
+            text,
+            in_shadow,
+            *[attributes.get(key) for key in SELECTOR_ATTRIBUTES],
+        )
+
+    @classmethod
+    def _choose_selector(
+        cls,
+        tag: str,
+        text: str,
+        attributes: Dict[str, str],
+        element_type: str,
+        in_shadow: bool = False,
+    ) -> Tuple[Optional[str], str, int]:
+        """Uncached body of _generate_selector."""
+        chooser = cls._choosers.get(element_type)
+        if chooser is None:
+            chooser = cls._choosers[element_type] = cls._build_chooser(element_type)
+        return chooser(tag, text, attributes, in_shadow)
+
+    @classmethod
+    def _build_chooser(
+        cls,
+        element_type: str,
+    ) -> Callable[[str, str, Dict[str, str], bool], Tuple[Optional[str], str, int]]:
+        """
+        Build a selector chooser specialized for one element type.
+
+        Strategies that never apply to the type, such as text selectors for
+        inputs, are left out of the returned function altogether.
+
+        Args:
+            element_type: Type of element (button, input, link, select)
+
+        Returns:
+            Function mapping (tag, text, attributes, in_shadow) to
+            (selector, selector_type, priority)
+        """
+        before_text = tuple(
+            (key, build, selector_type, priority)
+            for key, build, selector_type, priority, types in cls._STRATEGIES_BEFORE_TEXT
+            if types is None or element_type in types
+        )
+        after_text = tuple(
+            (key, build, selector_type, priority)
+            for key, build, selector_type, priority, types in cls._STRATEGIES_AFTER_TEXT
+            if types is None or element_type in types
+        )
+        use_text = element_type in ("button", "link")
+        use_role = element_type == "button"
+        priority_text = cls.PRIORITY_TEXT
+        priority_role = cls.PRIORITY_ROLE
+        priority_css = cls.PRIORITY_CSS_CLASS
+
+        def choose(
+            tag: str,
+            text: str,
+            attributes: Dict[str, str],
+            in_shadow: bool,
+        ) -> Tuple[Optional[str], str, int]:
+            # Priorities 1-2: data-testid, aria-label
+            for key, build, selector_type, priority in before_text:
+                value = attributes.get(key)
+                if value:
+                    return build(value, tag), selector_type, priority
+
+            # Text selectors are XPath over normalize-space(), which resolves in a
+            # single document.evaluate instead of a :has-text() subtree scan.
+            # The text is the element's selectorText, already normalized the
+            # same way, so it is used as is. XPath does not enter shadow roots,
+            # so elements inside one fall back to Playwright's piercing
+            # :text-is()/:has-text().
+            clean_text = text if use_text else ""
+
+            # Priority 3: Text-based selector (for buttons and links)
+            if clean_text and len(clean_text) <= 50:  # Only use text if reasonably short
+                if in_shadow:
+                    selector = f"{tag}:text-is({_css_string(clean_text)})"
+                    return selector, "text", priority_text
+                literal = _xpath_literal(clean_text)
+                return f"xpath=//{tag}[normalize-space(.)={literal}]", "text", priority_text
+
+            # Priorities 4-5: name attribute, placeholder (for inputs)
+            for key, build, selector_type, priority in after_text:
+                value = attributes.get(key)
+                if value:
+                    return build(value, tag), selector_type, priority
+
+            # Priority 6: Role-based with text
+            if use_role and clean_text:
+                if in_shadow:
+                    selector = f"[role='button']:has-text({_css_string(clean_text[:30])})"
+                    return selector, "role", priority_role
+                literal = _xpath_literal(clean_text[:30])
+                selector = f"xpath=//*[@role='button'][contains(normalize-space(.), {literal})]"
+                return selector, "role", priority_role
+
+            # Priority 7: CSS class (last resort, fragile)
+            css_class = attributes.get("class")
+            if css_class:
+                # Filter out utility classes
+                meaningful_classes = [
+                    c for c in css_class.split() if len(c) > 2 and not _UTILITY_CLASS_RE.match(c)
+                ]
+                if meaningful_classes:
+                    selector = f"{tag}.{'.'.join(meaningful_classes[:2])}"
+                    return selector, "css", priority_css
+
+            return None, "", 999
+
+        return choose
 
     def _generate_name(self, element: DiscoveredElement, element_type: str) -> str:
         """Generate a semantic name for an element."""
         # Use text content if available
         if element.text:
-            # Clean and format text
-            name = element.text.lower().strip()
-            name = name.replace(" ", "_").replace("-", "_")
-            name = "".join(c for c in name if c.isalnum() or c == "_")
-            name = name[:30]  # Limit length
-            return f"{element_type}_{name}"
+            return f"{element_type}_{_name_part(element.text)}"
 
         # Use attribute-based name
         if "aria-label" in element.attributes:
-            label = element.attributes["aria-label"].lower()[:30]
-            label = label.replace(" ", "_")
-            return f"{element_type}_{label}"
+            return f"{element_type}_{_name_part(element.attributes['aria-label'])}"
 
         if "name" in element.attributes:
             return f"{element_type}_{element.attributes['name']}"
 
         if "placeholder" in element.attributes:
-            placeholder = element.attributes["placeholder"].lower()[:30]
-            placeholder = placeholder.replace(" ", "_")
-            return f"input_{placeholder}"
+            return f"input_{_name_part(element.attributes['placeholder'])}"
 
         # Fallback to hash
-        hash_str = hashlib.md5(element.selector.encode()).hexdigest()[:8]
-        return f"{element_type}_{hash_str}"
+        return f"{element_type}_{zlib.crc32(element.selector.encode()):08x}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _generate_selector_cached(
+    tag: str,
+    element_type: str,
+    text: str,
+    in_shadow: bool,
+    test_id: Optional[str],
+    aria_label: Optional[str],
+    name: Optional[str],
+    placeholder: Optional[str],
+    css_class: Optional[str],
+) -> Tuple[Optional[str], str, int]:
+    """Memoized SelectorDiscovery._choose_selector, keyed on SELECTOR_ATTRIBUTES values."""
+    values = (test_id, aria_label, name, placeholder, css_class)
+    attributes = {
+        key: value for key, value in zip(SELECTOR_ATTRIBUTES, values, strict=True) if value
+    }
+    return SelectorDiscovery._choose_selector(tag, text, attributes, element_type, in_shadow)
+
+
+# Most suggestions returned by suggest_alternative_selectors
+MAX_ALTERNATIVES = 5
+
+# Finds visible elements, open shadow roots included, whose accessible name
+# contains the description in one pass, returning up to limit distinct
+# {kind, value} candidates: test-ids first, then aria-labels, then roles
+_ALTERNATIVES_JS = "({description, limit}) => {" + _QUERY_DEEP_JS + """
+    const implicitRoles = {button: "button", a: "link", textarea: "textbox", select: "combobox"};
+    const roleOf = (el) => {
+        const role = el.getAttribute("role");
+        if (role) return role;
+        const tag = el.tagName.toLowerCase();
+        if (tag === "input") {
+            return ["button", "submit", "reset"].includes(el.type) ? "button" : "textbox";
+        }
+        return implicitRoles[tag] || null;
+    };
+    const found = {"test-id": new Set(), "aria-label": new Set(), "role": new Set()};
+    const candidates = queryDeep(
+        "[data-testid], [aria-label], [role], button, a, input, textarea, select"
+    );
+    for (const el of candidates) {
+        if (!el.getClientRects().length) continue;
+        const aria = el.getAttribute("aria-label");
+        const name = aria || el.innerText || el.getAttribute("placeholder") || el.value || "";
+        if (!name.toLowerCase().includes(description)) continue;
+        const testId = el.getAttribute("data-testid");
+        if (testId) found["test-id"].add(testId);
+        if (aria) found["aria-label"].add(aria);
+        const role = roleOf(el);
+        if (role) found["role"].add(role);
+    }
+    const result = [];
+    for (const [kind, values] of Object.entries(found)) {
+        for (const value of values) result.push({kind: kind, value: value});
+    }
+    return result.slice(0, limit);
+}
+"""
 
 
 def discover_selectors(
@@ -415,6 +735,34 @@ def discover_selectors_with_metadata(
     return {name: elem.to_dict() for name, elem in elements.items()}
 
 
+def discover_selectors_compiled(
+    page,
+    url: Optional[str] = None,
+    include_hidden: bool = False,
+) -> Dict[str, CompiledSelector]:
+    """
+    Discover selectors along with reusable locators.
+
+    Useful for replay or verification loops that look the same elements up
+    repeatedly, instead of passing selector strings to page.locator() each time.
+
+    Args:
+        page: Playwright page object
+        url: Optional URL to navigate to
+        include_hidden: Include hidden elements
+
+    Returns:
+        Dict mapping semantic names to CompiledSelector objects
+    """
+    discovery = SelectorDiscovery(base_url=page.url if not url else url)
+    elements = discovery.discover_page(page, url, include_hidden)
+
+    return {
+        name: CompiledSelector(selector=elem.selector, locator=elem.get_locator(page))
+        for name, elem in elements.items()
+    }
+
+
 def validate_selector(page, selector: str, timeout: int = 5000) -> bool:
     """
     Validate that a selector works on the current page.
@@ -451,30 +799,23 @@ def suggest_alternative_selectors(
     Returns:
         List of alternative selector suggestions
     """
-    alternatives = []
-
-    # Try text-based search
     try:
-        locators = page.get_by_text(element_description, exact=False).all()
-        for loc in locators[:3]:
-            if loc.is_visible():
-                # Get attributes to build selector
-                test_id = loc.get_attribute("data-testid")
-                if test_id:
-                    alternatives.append(f"[data-testid='{test_id}']")
-                aria = loc.get_attribute("aria-label")
-                if aria:
-                    alternatives.append(f"[aria-label='{aria}']")
-    except Exception:
-        pass
-
-    # Try role-based search
-    for role in ["button", "link", "textbox", "combobox"]:
-        try:
-            locators = page.get_by_role(role, name=element_description).all()
-            if locators:
-                alternatives.append(f"[role='{role}']:has-text('{element_description}')")
-        except Exception:
-            pass
+        candidates = page.evaluate(
+            _ALTERNATIVES_JS,
+            {"description": element_description.lower(), "limit": MAX_ALTERNATIVES},
+        )
+    except Exception as e:
+        logger.debug(f"Error finding alternative selectors: {e}")
+        return []
 
-    return alternatives[:5]  # Return top 5 alternatives
+    alternatives = []
+    for candidate in candidates:
+        kind, value = candidate["kind"], candidate["value"]
+        if kind == "test-id":
+            alternatives.append(f"[data-testid={_css_string(value)}]")
+        elif kind == "aria-label":
+            alternatives.append(f"[aria-label={_css_string(value)}]")
+        else:
+            alternatives.append(f"role={value}[name={json.dumps(element_description)}]")
+
+    return alternatives[:MAX_ALTERNATIVES]
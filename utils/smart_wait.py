@@ -5,6 +5,7 @@ Provides intelligent waiting that adapts to actual page conditions
 rather than using fixed delays.
 """
 
+import asyncio
 import logging
 from typing import List, Optional
 
@@ -23,6 +24,92 @@ DEFAULT_LOADING_SELECTORS = [
     ".chakra-spinner",  # Chakra UI
 ]
 
+_DEFAULT_SELECTOR_STRING = ", ".join(DEFAULT_LOADING_SELECTORS)
+
+# The selectors are passed as the argument, so the source never changes and
+# the browser can reuse its compiled form across calls
+_NO_LOADING_INDICATOR_JS = "(selector) => !document.querySelector(selector)"
+
+
+# Resolves once the element has gone stabilityMs without moving or resizing.
+# Reads the element's bounding box once per frame, which catches every kind of
+# movement (layout shifts, transforms, script-driven style changes) that
+# resize and intersection observers miss, at the cost of one layout read.
+_ELEMENT_STABLE_JS = """
+([selector, stabilityMs]) => {
+    const el = document.querySelector(selector);
+    if (!el) return false;
+
+    return new Promise((resolve) => {
+        let lastChange = performance.now();
+        let last = null;
+
+        const tick = () => {
+            const rect = el.getBoundingClientRect();
+            if (!last || rect.x !== last.x || rect.y !== last.y
+                    || rect.width !== last.width || rect.height !== last.height) {
+                last = rect;
+                lastChange = performance.now();
+            }
+            if (performance.now() - lastChange >= stabilityMs) {
+                resolve(true);
+                return;
+            }
+            requestAnimationFrame(tick);
+        };
+        requestAnimationFrame(tick);
+    });
+}
+"""
+
+
+# Resolves once the DOM has gone idleTime without mutating. Checks run in
+# idle callbacks, so they don't wake a busy main thread, and each batch of
+# mutation records updates the activity time once.
+_IDLE_JS = """
+(idleTime) => {
+    return new Promise((resolve) => {
+        let lastActivity = performance.now();
+        let pending = false;
+        const whenIdle = window.requestIdleCallback
+            || ((callback) => setTimeout(callback, 100));
+
+        // Watch for DOM mutations
+        const observer = new MutationObserver(() => {
+            if (pending) return;
+            pending = true;
+            queueMicrotask(() => {
+                pending = false;
+                lastActivity = performance.now();
+            });
+        });
+        observer.observe(document.body, {
+            childList: true,
+            subtree: true,
+            attributes: true,
+        });
+
+        const check = () => {
+            if (performance.now() - lastActivity >= idleTime) {
+                observer.disconnect();
+                resolve(true);
+            } else {
+                whenIdle(check, {timeout: 100});
+            }
+        };
+
+        whenIdle(check, {timeout: 100});
+    });
+}
+"""
+
+
+def _loading_selector_string(loading_selectors: Optional[List[str]]) -> str:
+    """Join loading selectors into one CSS selector list."""
+    if not loading_selectors:
+        return _DEFAULT_SELECTOR_STRING
+    return ", ".join(loading_selectors)
+
 
 async def smart_wait_async(
     page,
@@ -34,9 +121,8 @@ async def smart_wait_async(
     Wait for page to be fully ready (async version).
 
     Instead of fixed delays, waits for actual conditions:
-    1. Network requests to complete
-    2. Loading indicators to disappear
-    3. Brief pause for CSS animations
+    1. Network requests to complete, while loading indicators disappear
+    2. Brief pause for CSS animations
 
     Args:
         page: Playwright page object
@@ -44,24 +130,20 @@ async def smart_wait_async(
         animation_settle_ms: Time to wait for animations (ms)
         network_idle_timeout: Timeout for network idle (ms)
     """
-    selectors = loading_selectors or DEFAULT_LOADING_SELECTORS
-
-    # Wait for network to settle
-    try:
-        await page.wait_for_load_state("networkidle", timeout=network_idle_timeout)
-    except Exception:
-        logger.debug("Network idle timeout, continuing anyway")
-
-    # Wait for loading indicators to disappear
-    selector_string = ", ".join(selectors)
-    try:
-        await page.wait_for_function(
-            f"""
-            () => !document.querySelector('{selector_string}')
-            """,
+    # Wait for network to settle and loading indicators to disappear; the
+    # two are independent, so they are awaited together
+    network_idle, no_loading_indicator = await asyncio.gather(
+        page.wait_for_load_state("networkidle", timeout=network_idle_timeout),
+        page.wait_for_function(
+            _NO_LOADING_INDICATOR_JS,
+            arg=_loading_selector_string(loading_selectors),
             timeout=5000,
-        )
-    except Exception:
+        ),
+        return_exceptions=True,
+    )
+    if isinstance(network_idle, Exception):
+        logger.debug("Network idle timeout, continuing anyway")
+    if isinstance(no_loading_indicator, Exception):
         logger.debug("Loading indicator wait timeout, continuing anyway")
 
     # Brief pause for CSS animations to settle
@@ -88,8 +170,6 @@ def smart_wait(
         animation_settle_ms: Time to wait for animations (ms)
         network_idle_timeout: Timeout for network idle (ms)
     """
-    selectors = loading_selectors or DEFAULT_LOADING_SELECTORS
-
     # Wait for network to settle
     try:
         page.wait_for_load_state("networkidle", timeout=network_idle_timeout)
@@ -97,12 +177,10 @@ def smart_wait(
         logger.debug("Network idle timeout, continuing anyway")
 
     # Wait for loading indicators to disappear
-    selector_string = ", ".join(selectors)
     try:
         page.wait_for_function(
-            f"""
-            () => !document.querySelector('{selector_string}')
-            """,
+            _NO_LOADING_INDICATOR_JS,
+            arg=_loading_selector_string(loading_selectors),
             timeout=5000,
         )
     except Exception:
@@ -134,44 +212,8 @@ def wait_for_element_stable(
     """
     try:
         page.wait_for_function(
-            f"""
-            (selector, stabilityMs) => {{
-                const el = document.querySelector(selector);
-                if (!el) return false;
-
-                return new Promise((resolve) => {{
-                    let lastRect = el.getBoundingClientRect();
-                    let stableTime = 0;
-                    const checkInterval = 50;
-
-                    const check = () => {{
-                        const rect = el.getBoundingClientRect();
-                        const same = (
-                            rect.x === lastRect.x &&
-                            rect.y === lastRect.y &&
-                            rect.width === lastRect.width &&
-                            rect.height === lastRect.height
-                        );
-
-                        if (same) {{
-                            stableTime += checkInterval;
-                            if (stableTime >= stabilityMs) {{
-                                resolve(true);
-                                return;
-                            }}
-                        }} else {{
-                            stableTime = 0;
-                            lastRect = rect;
-                        }}
-
-                        setTimeout(check, checkInterval);
-                    }};
-
-                    check();
-                }});
-            }}
-            """,
-            [selector, stability_ms],
+            _ELEMENT_STABLE_JS,
+            arg=[selector, stability_ms],
             timeout=timeout,
         )
         return True
@@ -228,40 +270,8 @@ def wait_for_idle(
     """
     try:
         page.wait_for_function(
-            f"""
-            (idleTime) => {{
-                return new Promise((resolve) => {{
-                    let lastActivity = Date.now();
-                    let resolved = false;
-
-                    // Watch for DOM mutations
-                    const observer = new MutationObserver(() => {{
-                        lastActivity = Date.now();
-                    }});
-                    observer.observe(document.body, {{
-                        childList: true,
-                        subtree: true,
-                        attributes: true,
-                    }});
-
-                    // Check periodically
-                    const check = () => {{
-                        if (resolved) return;
-
-                        if (Date.now() - lastActivity >= idleTime) {{
-                            resolved = true;
-                            observer.disconnect();
-                            resolve(true);
-                        }} else {{
-                            setTimeout(check, 100);
-                        }}
-                    }};
-
-                    setTimeout(check, 100);
-                }});
-            }}
-            """,
-            idle_time_ms,
+            _IDLE_JS,
+            arg=idle_time_ms,
             timeout=timeout,
         )
         return True
@@ -5,16 +5,170 @@ Tracks stage inputs and outputs to skip re-running stages
 when their inputs haven't changed.
 """
 
+import contextlib
+import functools
 import hashlib
 import json
 import logging
-from dataclasses import dataclass, field
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, is_dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Hex characters kept from each fingerprint digest
+FINGERPRINT_LENGTH = 16
+
+# Read buffer sizes for streaming file fingerprints
+SMALL_FILE_CHUNK_SIZE = 64 * 1024
+LARGE_FILE_CHUNK_SIZE = 1024 * 1024
+
+# Upper bound on threads used to fingerprint a stage's input files
+MAX_HASH_WORKERS = 8
+
+# Stored output sets kept per stage, most recently used first; older input
+# hashes are pruned from the output store
+MAX_STORED_RUNS = 4
+
+# Bump when get_stage_inputs or input hashing changes shape; signatures
+# written under another version are dropped on load
+SCHEMA_VERSION = 2
+
+
+def _new_hasher(parallel: bool = False) -> Any:
+    """
+    Create a hasher for change-detection fingerprints.
+
+    Uses BLAKE3 when installed and falls back to SHA-256.
+
+    Args:
+        parallel: Let BLAKE3 hash on multiple threads (for large files)
+
+    Returns:
+        Hasher object with update() and hexdigest()
+    """
+    if BLAKE3_AVAILABLE:
+        if parallel:
+            return blake3(max_threads=blake3.AUTO)
+        return blake3()
+    return hashlib.sha256()
+
+
+def _fingerprint(data: bytes, parallel: bool = False) -> str:
+    """Return a short hex fingerprint of data."""
+    hasher = _new_hasher(parallel)
+    hasher.update(data)
+    return hasher.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def _serializer_name() -> str:
+    """Name the serializer _dumps_canonical uses in this process."""
+    return "orjson" if ORJSON_AVAILABLE else "json"
+
+
+@functools.lru_cache(maxsize=64)
+def _stage_key(stage_name: str, serializer: str) -> bytes:
+    """Derive the 32-byte hashing key for a stage, schema and serializer."""
+    return hashlib.blake2b(
+        f"{stage_name}:{SCHEMA_VERSION}:{serializer}".encode(), digest_size=32
+    ).digest()
+
+
+def _keyed_fingerprint(data: bytes, key: bytes) -> str:
+    """
+    Return a short hex fingerprint of data under a 32-byte key.
+
+    Uses BLAKE3's keyed mode when installed and keyed BLAKE2b otherwise.
+    """
+    if BLAKE3_AVAILABLE:
+        return blake3(data, key=key).hexdigest()[:FINGERPRINT_LENGTH]
+    return hashlib.blake2b(
+        data, key=key, digest_size=FINGERPRINT_LENGTH // 2
+    ).hexdigest()
+
+
+def _hash_file(path: Path, chunk_size: int = SMALL_FILE_CHUNK_SIZE) -> str:
+    """
+    Fingerprint a file by streaming it through the hasher.
+
+    Reads into one reusable buffer so large recordings are never held
+    in memory whole.
+
+    Args:
+        path: File to hash
+        chunk_size: Size of the read buffer in bytes
+
+    Returns:
+        Short hex fingerprint of the file contents
+    """
+    hasher = _new_hasher(parallel=path.stat().st_size > LARGE_FILE_CHUNK_SIZE)
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
+    return hasher.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclasses for stdlib json, as orjson does natively."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_pretty(data: Any) -> bytes:
+    """Serialize data (dataclasses included) as indented JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, default=_json_default).encode()
+
+
+def _dumps_canonical(data: Any) -> bytes:
+    """
+    Serialize data deterministically for hashing.
+
+    orjson and the stdlib format some values differently (floats,
+    datetimes, dataclasses), so hashes are keyed by serializer name and
+    never compared across the two.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+    return json.dumps(
+        data,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode()
+
 
 @dataclass
 class StageSignature:
@@ -24,6 +178,8 @@ class StageSignature:
     input_hash: str
     output_files: List[str] = field(default_factory=list)
     timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    schema_version: int = SCHEMA_VERSION
+    input_len: int = 0  # Serialized input length; 0 if unknown
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -31,6 +187,8 @@ class StageSignature:
             "input_hash": self.input_hash,
             "output_files": self.output_files,
             "timestamp": self.timestamp,
+            "schema_version": self.schema_version,
+            "input_len": self.input_len,
         }
 
     @classmethod
@@ -40,6 +198,8 @@ class StageSignature:
             input_hash=data["input_hash"],
             output_files=data.get("output_files", []),
             timestamp=data.get("timestamp", ""),
+            schema_version=data.get("schema_version", 1),
+            input_len=data.get("input_len", 0),
         )
 
 
@@ -62,16 +222,24 @@ class StageCache:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_file = self.cache_dir / "stage_signatures.json"
         self._signatures: Dict[str, StageSignature] = {}
+        # (id(inputs), stage) -> (inputs, serialized, hash); only set
+        # inside _hash_memo_scope()
+        self._hash_memo: Optional[Dict[Tuple[int, str], Tuple[Any, bytes, str]]] = None
         self._load()
 
     def _load(self) -> None:
         """Load signatures from cache file."""
         if self.cache_file.exists():
             try:
-                data = json.loads(self.cache_file.read_text())
+                data = _loads(self.cache_file.read_bytes())
+                signatures = (
+                    StageSignature.from_dict(sig)
+                    for sig in data.get("signatures", {}).values()
+                )
                 self._signatures = {
-                    name: StageSignature.from_dict(sig)
-                    for name, sig in data.get("signatures", {}).items()
+                    sig.stage_name: sig
+                    for sig in signatures
+                    if sig.schema_version == SCHEMA_VERSION
                 }
             except Exception as e:
                 logger.warning(f"Failed to load stage cache: {e}")
@@ -80,29 +248,79 @@ class StageCache:
     def _save(self) -> None:
         """Save signatures to cache file."""
         try:
-            data = {
-                "signatures": {
-                    name: sig.to_dict()
-                    for name, sig in self._signatures.items()
-                },
-            }
-            self.cache_file.write_text(json.dumps(data, indent=2))
+            # Signatures are dataclasses and serialize field by field
+            data = {"signatures": self._signatures}
+            tmp_file = self.cache_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(_dumps_pretty(data))
+            os.replace(tmp_file, self.cache_file)
         except Exception as e:
             logger.warning(f"Failed to save stage cache: {e}")
 
-    def compute_hash(self, inputs: Dict[str, Any]) -> str:
+    def compute_hash(self, inputs: Dict[str, Any], stage_name: str = "") -> str:
         """
         Compute a hash of stage inputs.
 
+        The hash is keyed by stage name and SCHEMA_VERSION, so bumping
+        the version invalidates every signature without a clear().
+
         Args:
             inputs: Dict of input values
+            stage_name: Name of the stage the inputs belong to
 
         Returns:
             Hash string
         """
+        return self._hash_inputs(inputs, stage_name)[1]
+
+    def _hash_inputs(self, inputs: Dict[str, Any], stage_name: str) -> Tuple[bytes, str]:
+        """
+        Serialize and hash inputs, reusing the result inside a memo scope.
+
+        Args:
+            inputs: Dict of input values
+            stage_name: Name of the stage the inputs belong to
+
+        Returns:
+            Tuple of (serialized inputs, input hash)
+        """
+        memo = self._hash_memo
+        key = (id(inputs), stage_name)
+        if memo is not None:
+            entry = memo.get(key)
+            # The entry holds inputs alive, so its id cannot be reused
+            if entry is not None and entry[0] is inputs:
+                return entry[1], entry[2]
+
         # Serialize inputs deterministically
-        serialized = json.dumps(inputs, sort_keys=True, default=str)
-        return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+        serialized = _dumps_canonical(inputs)
+        input_hash = _keyed_fingerprint(serialized, _stage_key(stage_name, _serializer_name()))
+        if memo is not None:
+            memo[key] = (inputs, serialized, input_hash)
+        return serialized, input_hash
+
+    @contextlib.contextmanager
+    def _hash_memo_scope(self) -> Iterator[None]:
+        """Reuse input hashes for the same inputs dict within the block."""
+        self._hash_memo = {}
+        try:
+            yield
+        finally:
+            self._hash_memo = None
+
+    def _matches(
+        self,
+        cached: StageSignature,
+        serialized: bytes,
+        input_hash: Optional[str] = None,
+    ) -> bool:
+        """Check serialized inputs against a signature, length first."""
+        if cached.input_len and cached.input_len != len(serialized):
+            return False
+        if input_hash is None:
+            input_hash = _keyed_fingerprint(
+                serialized, _stage_key(cached.stage_name, _serializer_name())
+            )
+        return cached.input_hash == input_hash
 
     def should_skip(
         self,
@@ -121,26 +339,43 @@ class StageCache:
         Returns:
             True if stage can be skipped
         """
-        input_hash = self.compute_hash(inputs)
-
-        # Check if we have a cached signature
-        if stage_name not in self._signatures:
-            logger.debug(f"Stage {stage_name}: No cached signature, must run")
-            return False
-
-        cached = self._signatures[stage_name]
-
-        # Check if inputs changed
-        if cached.input_hash != input_hash:
-            logger.debug(f"Stage {stage_name}: Input hash changed, must run")
+        if self._hash_memo is not None:
+            # The hash will be reused by record_completion, so take it now
+            serialized, input_hash = self._hash_inputs(inputs, stage_name)
+        else:
+            serialized, input_hash = _dumps_canonical(inputs), None
+        cached = self._signatures.get(stage_name)
+
+        # Check if we have a cached signature for these inputs
+        if cached is None or not self._matches(cached, serialized, input_hash):
+            # An earlier run may have produced outputs for these inputs
+            if output_files and input_hash is None:
+                input_hash = _keyed_fingerprint(
+                    serialized, _stage_key(stage_name, _serializer_name())
+                )
+            if output_files and self._restore_outputs(stage_name, input_hash, output_files):
+                logger.info(f"Stage {stage_name}: Restored outputs from cache, skipping")
+                self._signatures[stage_name] = StageSignature(
+                    stage_name=stage_name,
+                    input_hash=input_hash,
+                    output_files=[str(f) for f in output_files],
+                    input_len=len(serialized),
+                )
+                self._save()
+                return True
+
+            if cached is None:
+                logger.debug(f"Stage {stage_name}: No cached signature, must run")
+            else:
+                logger.debug(f"Stage {stage_name}: Input hash changed, must run")
             return False
 
         # Check if output files exist
         if output_files:
-            for output_file in output_files:
-                if not Path(output_file).exists():
-                    logger.debug(f"Stage {stage_name}: Output file missing: {output_file}")
-                    return False
+            missing = [f for f in output_files if not os.path.exists(f)]
+            if missing and not self._restore_outputs(stage_name, cached.input_hash, missing):
+                logger.debug(f"Stage {stage_name}: Output file missing: {missing[0]}")
+                return False
 
         logger.info(f"Stage {stage_name}: Inputs unchanged, skipping")
         return True
@@ -159,15 +394,153 @@ class StageCache:
             inputs: Input values used
             output_files: Output files created
         """
-        input_hash = self.compute_hash(inputs)
+        serialized, input_hash = self._hash_inputs(inputs, stage_name)
         output_list = [str(f) for f in (output_files or [])]
 
         self._signatures[stage_name] = StageSignature(
             stage_name=stage_name,
             input_hash=input_hash,
             output_files=output_list,
+            input_len=len(serialized),
         )
         self._save()
+        self._store_outputs(stage_name, input_hash, output_files or [])
+
+    def _output_store(self, stage_name: str, input_hash: str) -> Path:
+        """Get the content-addressed store directory for a stage run."""
+        return self.cache_dir / "cas" / stage_name / input_hash
+
+    @staticmethod
+    def _stored_name(output_file: Path) -> str:
+        """
+        Name an output inside a store entry.
+
+        Keyed by the output's absolute path, so outputs sharing a basename
+        in different directories don't overwrite each other.
+        """
+        path = os.path.abspath(output_file)
+        return f"{_fingerprint(os.fsencode(path))}-{os.path.basename(path)}"
+
+    def _prune_store(self, stage_name: str, keep: Path) -> None:
+        """
+        Drop all but the MAX_STORED_RUNS most recently used entries for a stage.
+
+        Args:
+            stage_name: Name of the stage
+            keep: Entry just written, kept regardless of timestamps
+        """
+        stage_dir = self.cache_dir / "cas" / stage_name
+
+        def last_used(entry: Path) -> int:
+            try:
+                return (entry / "outputs.json").stat().st_mtime_ns
+            except OSError:
+                return 0
+
+        try:
+            entries = sorted(
+                (entry for entry in stage_dir.iterdir() if entry != keep),
+                key=last_used,
+                reverse=True,
+            )
+        except OSError:
+            return
+        for entry in entries[MAX_STORED_RUNS - 1:]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def _store_outputs(
+        self,
+        stage_name: str,
+        input_hash: str,
+        output_files: List[Path],
+    ) -> None:
+        """
+        Keep a stage's outputs under its input hash for later restores.
+
+        Outputs are hard-linked into the store when possible. Their
+        mtime and size are recorded so that an output later rewritten
+        in place (which also changes the linked copy) is detected and
+        not restored. Only the MAX_STORED_RUNS most recently used
+        entries are kept per stage.
+
+        Args:
+            stage_name: Name of the stage
+            input_hash: Hash of the inputs that produced the outputs
+            output_files: Output files created
+        """
+        if not output_files:
+            return
+
+        store = self._output_store(stage_name, input_hash)
+        files_dir = store / "files"
+        stats = {}
+        try:
+            files_dir.mkdir(parents=True, exist_ok=True)
+            for output_file in output_files:
+                src = Path(output_file)
+                if not src.is_file():
+                    return
+                name = self._stored_name(src)
+                dst = files_dir / name
+                dst.unlink(missing_ok=True)
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    shutil.copy2(src, dst)
+                st = dst.stat()
+                stats[name] = [st.st_mtime_ns, st.st_size]
+            (store / "outputs.json").write_bytes(_dumps_pretty(stats))
+        except OSError as e:
+            logger.warning(f"Failed to store outputs for {stage_name}: {e}")
+            return
+
+        self._prune_store(stage_name, store)
+
+    def _restore_outputs(
+        self,
+        stage_name: str,
+        input_hash: str,
+        output_files: List[Path],
+    ) -> bool:
+        """
+        Copy stored outputs for an input hash back into place.
+
+        Args:
+            stage_name: Name of the stage
+            input_hash: Hash of the current inputs
+            output_files: Output files to restore
+
+        Returns:
+            True if every output was restored
+        """
+        store = self._output_store(stage_name, input_hash)
+        try:
+            stats = _loads((store / "outputs.json").read_bytes())
+        except (OSError, ValueError):
+            return False
+
+        names = [self._stored_name(output_file) for output_file in output_files]
+        try:
+            for name in names:
+                st = (store / "files" / name).stat()
+                if stats.get(name) != [st.st_mtime_ns, st.st_size]:
+                    logger.debug(f"Stage {stage_name}: Stored output changed: {name}")
+                    shutil.rmtree(store, ignore_errors=True)
+                    return False
+
+            for output_file, name in zip(output_files, names, strict=True):
+                dst = Path(output_file)
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                # Unlink first: dst may be a hard link into another store entry
+                dst.unlink(missing_ok=True)
+                shutil.copy2(store / "files" / name, dst)
+            # Mark the entry as recently used for _prune_store
+            os.utime(store / "outputs.json")
+        except OSError as e:
+            logger.debug(f"Stage {stage_name}: Could not restore outputs: {e}")
+            return False
+
+        return True
 
     def invalidate(self, stage_name: str) -> None:
         """
@@ -176,14 +549,26 @@ class StageCache:
         Args:
             stage_name: Name of the stage
         """
-        if stage_name in self._signatures:
-            del self._signatures[stage_name]
+        if self._invalidate_no_save(stage_name):
             self._save()
 
+    def _invalidate_no_save(self, stage_name: str) -> bool:
+        """
+        Drop a stage's signature without writing the cache file.
+
+        Args:
+            stage_name: Name of the stage
+
+        Returns:
+            True if a signature was removed
+        """
+        return self._signatures.pop(stage_name, None) is not None
+
     def invalidate_downstream(
         self,
         stage_name: str,
         stage_order: List[str],
+        stage_index: Optional[Dict[str, int]] = None,
     ) -> None:
         """
         Invalidate a stage and all downstream stages.
@@ -191,24 +576,98 @@ class StageCache:
         Args:
             stage_name: Name of the stage to invalidate
             stage_order: Ordered list of all stage names
+            stage_index: Precomputed position of each name in stage_order
         """
-        if stage_name not in stage_order:
+        if stage_index is None:
+            stage_index = {name: i for i, name in enumerate(stage_order)}
+
+        start_idx = stage_index.get(stage_name)
+        if start_idx is None:
             return
 
-        start_idx = stage_order.index(stage_name)
+        removed = False
         for stage in stage_order[start_idx:]:
-            self.invalidate(stage)
+            removed |= self._invalidate_no_save(stage)
+        if removed:
+            self._save()
 
     def clear(self) -> None:
-        """Clear all cached signatures."""
+        """Clear all cached signatures and stored outputs."""
         self._signatures = {}
         self._save()
+        shutil.rmtree(self.cache_dir / "cas", ignore_errors=True)
 
     def get_cached_stages(self) -> Set[str]:
         """Get set of cached stage names."""
         return set(self._signatures.keys())
 
 
+class _FileHashCache:
+    """
+    Remembers file fingerprints keyed by path, mtime and size.
+
+    A file whose stat matches the recorded entry is not re-read, so
+    unchanged recordings cost one stat() instead of a full hash.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize file hash cache.
+
+        Args:
+            cache_dir: Directory holding file_fingerprints.json
+        """
+        self.cache_file = Path(cache_dir) / "file_fingerprints.json"
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if self.cache_file.exists():
+            try:
+                self._entries = _loads(self.cache_file.read_bytes())
+            except Exception as e:
+                logger.warning(f"Failed to load file fingerprint cache: {e}")
+
+    def fingerprint(self, path: Path, chunk_size: int = SMALL_FILE_CHUNK_SIZE) -> str:
+        """
+        Get a file's fingerprint, hashing only if it changed.
+
+        Args:
+            path: File to fingerprint
+            chunk_size: Read buffer size used when hashing
+
+        Returns:
+            Short hex fingerprint of the file contents
+        """
+        st = path.stat()
+        key = str(path)
+        entry = self._entries.get(key)
+        if (
+            entry is not None
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("size") == st.st_size
+        ):
+            return entry["hash"]
+
+        file_hash = _hash_file(path, chunk_size=chunk_size)
+        self._entries[key] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "hash": file_hash,
+        }
+        self._dirty = True
+        return file_hash
+
+    def save(self) -> None:
+        """Write the cache to disk if any entry changed."""
+        if not self._dirty:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_bytes(_dumps_pretty(self._entries))
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Failed to save file fingerprint cache: {e}")
+
+
 class CachedStageRunner:
     """
     Runs stages with caching support.
@@ -231,6 +690,9 @@ class CachedStageRunner:
         "composite",
         "upload",
     ]
+    STAGE_INDEX: ClassVar[Dict[str, int]] = {
+        name: i for i, name in enumerate(STAGE_ORDER)
+    }
 
     def __init__(self, demo_dir: Path):
         """
@@ -263,24 +725,28 @@ class CachedStageRunner:
         Returns:
             Result of the runner
         """
-        # Check cache
-        if not force and self.cache.should_skip(stage_name, inputs, output_files):
-            logger.info(f"Skipping {stage_name} (cached)")
-            return {"status": "skipped", "cached": True}
-
-        # Run the stage
-        try:
-            result = runner()
+        # Hash the inputs once for both the skip check and the record
+        with self.cache._hash_memo_scope():
+            # Check cache
+            if not force and self.cache.should_skip(stage_name, inputs, output_files):
+                logger.info(f"Skipping {stage_name} (cached)")
+                return {"status": "skipped", "cached": True}
+
+            # Run the stage
+            try:
+                result = runner()
 
-            # Record completion
-            self.cache.record_completion(stage_name, inputs, output_files)
+                # Record completion
+                self.cache.record_completion(stage_name, inputs, output_files)
 
-            return result
+                return result
 
-        except Exception as e:
-            # Invalidate downstream stages on failure
-            self.cache.invalidate_downstream(stage_name, self.STAGE_ORDER)
-            raise
+            except Exception as e:
+                # Invalidate downstream stages on failure
+                self.cache.invalidate_downstream(
+                    stage_name, self.STAGE_ORDER, self.STAGE_INDEX
+                )
+                raise
 
     def should_run(
         self,
@@ -336,43 +802,36 @@ def get_stage_inputs(demo_dir: Path, stage_name: str) -> Dict[str, Any]:
     demo_dir = Path(demo_dir)
     manifest_path = demo_dir / "manifest.json"
 
-    if not manifest_path.exists():
+    try:
+        manifest = _loads(manifest_path.read_bytes())
+    except FileNotFoundError:
         return {}
 
-    manifest = json.loads(manifest_path.read_text())
     inputs = {}
+    # (input key, path, read buffer size) for each file to fingerprint;
+    # files that turn out not to exist are left out of the inputs
+    files: List[Tuple[str, Path, int]] = []
 
     # Stage-specific input extraction
     if stage_name == "script":
         # Script depends on outline
         outline_path = demo_dir / "outline.md"
-        if outline_path.exists():
-            inputs["outline_hash"] = hashlib.sha256(
-                outline_path.read_bytes()
-            ).hexdigest()[:16]
+        files.append(("outline_hash", outline_path, SMALL_FILE_CHUNK_SIZE))
 
         selectors_path = demo_dir / "selectors.json"
-        if selectors_path.exists():
-            inputs["selectors_hash"] = hashlib.sha256(
-                selectors_path.read_bytes()
-            ).hexdigest()[:16]
+        files.append(("selectors_hash", selectors_path, SMALL_FILE_CHUNK_SIZE))
 
     elif stage_name == "audio":
         # Audio depends on narration
         narration_path = demo_dir / "narration.json"
-        if narration_path.exists():
-            inputs["narration_hash"] = hashlib.sha256(
-                narration_path.read_bytes()
-            ).hexdigest()[:16]
+        files.append(("narration_hash", narration_path, SMALL_FILE_CHUNK_SIZE))
 
     elif stage_name == "composite":
         # Composite depends on video and audio
         for f in ["demo_recording.webm", "demo_recording.mp4"]:
             video_path = demo_dir / f
             if video_path.exists():
-                inputs["video_hash"] = hashlib.sha256(
-                    video_path.read_bytes()
-                ).hexdigest()[:16]
+                files.append(("video_hash", video_path, LARGE_FILE_CHUNK_SIZE))
                 break
 
         audio_dir = demo_dir / "audio"
@@ -380,4 +839,44 @@ def get_stage_inputs(demo_dir: Path, stage_name: str) -> Dict[str, Any]:
             audio_files = sorted(audio_dir.glob("*.mp3"))
             inputs["audio_count"] = len(audio_files)
 
+    if files:
+        file_hashes = _FileHashCache(demo_dir / ".cache")
+        inputs.update(_fingerprint_files(file_hashes, files))
+        file_hashes.save()
+
     return inputs
+
+
+def _fingerprint_files(
+    file_hashes: _FileHashCache,
+    files: List[Tuple[str, Path, int]],
+) -> Dict[str, str]:
+    """
+    Fingerprint several files, hashing them on worker threads.
+
+    Hashing releases the GIL, so reads and digests overlap.
+
+    Args:
+        file_hashes: Fingerprint cache to consult and update
+        files: (input key, path, read buffer size) tuples
+
+    Returns:
+        Dict mapping each existing file's input key to its fingerprint
+    """
+    def fingerprint(task: Tuple[str, Path, int]) -> Optional[str]:
+        try:
+            return file_hashes.fingerprint(task[1], task[2])
+        except FileNotFoundError:
+            return None
+
+    if len(files) == 1:
+        hashes = [fingerprint(files[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_HASH_WORKERS, len(files))) as executor:
+            hashes = list(executor.map(fingerprint, files))
+
+    return {
+        key: file_hash
+        for (key, _, _), file_hash in zip(files, hashes, strict=True)
+        if file_hash is not None
+    }
@@ -9,6 +9,8 @@ import json
 import logging
 import os
 import pty
+import random
+import re
 import select
 import subprocess
 import sys
@@ -17,8 +19,43 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Union
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Write buffer for .cast files, so per-keystroke events coalesce
+CAST_WRITE_BUFFER_SIZE = 64 * 1024
+
+# Bytes requested per read from the PTY
+PTY_READ_SIZE = 64 * 1024
+
+# Seconds to wait for a full PTY input buffer to drain before giving up
+PTY_WRITE_TIMEOUT = 5.0
+
+# Keystroke delay multipliers for a longer pause after punctuation
+_PAUSE_MULTIPLIERS = {
+    ".": 3.0, "!": 3.0, "?": 3.0,
+    ",": 2.0, ";": 2.0, ":": 2.0,
+    " ": 1.5,
+}
+
+_TYPO_CHARS = "qwertyuiopasdfghjklzxcvbnm"
+
+# Keystrokes simulated between sleeps; cast events carry each
+# keystroke's own scheduled time, so replay timing is unaffected
+KEYSTROKES_PER_SLEEP = 5
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize one asciicast line (header or event) as JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj) + "\n").encode()
+
 
 @dataclass
 class TerminalConfig:
@@ -43,6 +80,24 @@ class TerminalAction:
     pattern: Optional[str] = None
     delay_after: int = 1000  # ms
     typing_delay: Optional[int] = None  # Override typing speed
+    _compiled_pattern: Optional[re.Pattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def get_compiled_pattern(self) -> re.Pattern:
+        """
+        Return the compiled wait_for pattern.
+
+        The pattern is compiled on first use and reused afterwards, so an
+        invalid regex fails the recording it is used in instead of raising
+        while the script is parsed.
+
+        Raises:
+            re.error: If the pattern is not a valid regular expression
+        """
+        if self._compiled_pattern is None:
+            self._compiled_pattern = re.compile(self.pattern)
+        return self._compiled_pattern
 
 
 @dataclass
@@ -87,9 +142,13 @@ class AsciicastWriter:
         self.height = height
         self.start_time = None
         self._file = None
+        self._pending: List[str] = []
+        self._pending_len = 0
+        self._pending_start = 0.0
+        self._pending_last = 0.0
 
     def __enter__(self):
-        self._file = open(self.path, "w")
+        self._file = open(self.path, "wb", buffering=CAST_WRITE_BUFFER_SIZE)
 
         # Write header
         header = {
@@ -102,27 +161,73 @@ class AsciicastWriter:
                 "TERM": os.environ.get("TERM", "xterm-256color"),
             },
         }
-        self._file.write(json.dumps(header) + "\n")
+        self._file.write(_dumps_line(header))
         self.start_time = time.time()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self._file:
+            self.flush_pending()
             self._file.close()
 
     def write_output(self, text: str) -> None:
         """Write output event."""
         if self._file and self.start_time:
+            self.flush_pending()
             elapsed = time.time() - self.start_time
-            event = [elapsed, "o", text]
-            self._file.write(json.dumps(event) + "\n")
+            self._file.write(_dumps_line([elapsed, "o", text]))
 
     def write_input(self, text: str) -> None:
         """Write input event (optional, for replay accuracy)."""
         if self._file and self.start_time:
+            self.flush_pending()
             elapsed = time.time() - self.start_time
-            event = [elapsed, "i", text]
-            self._file.write(json.dumps(event) + "\n")
+            self._file.write(_dumps_line([elapsed, "i", text]))
+
+    def write_output_batched(
+        self,
+        text: str,
+        flush_ms: float = 50,
+        max_chars: int = 16,
+        at: Optional[float] = None,
+    ) -> None:
+        """
+        Queue output to be written as part of a combined event.
+
+        Used for simulated keystrokes: the queued text is written as one
+        event stamped with the time of the last keystroke, once max_chars
+        have queued or flush_ms have passed since the first.
+
+        Args:
+            text: Output text
+            flush_ms: Longest time to hold queued text (milliseconds)
+            max_chars: Number of queued characters that forces a flush
+            at: Wall-clock time to stamp the text with (default: now)
+        """
+        if not (self._file and self.start_time):
+            return
+
+        now = time.time() if at is None else at
+        if not self._pending:
+            self._pending_start = now
+        self._pending.append(text)
+        self._pending_len += len(text)
+        self._pending_last = now
+
+        if (
+            self._pending_len >= max_chars
+            or (now - self._pending_start) * 1000 >= flush_ms
+        ):
+            self.flush_pending()
+
+    def flush_pending(self) -> None:
+        """Write any output queued by write_output_batched."""
+        if not self._pending:
+            return
+        elapsed = self._pending_last - self.start_time
+        self._file.write(_dumps_line([elapsed, "o", "".join(self._pending)]))
+        self._pending = []
+        self._pending_len = 0
 
 
 class TerminalRecorder:
@@ -139,6 +244,7 @@ class TerminalRecorder:
         self._master_fd = None
         self._slave_fd = None
         self._child_pid = None
+        self._rng = random.Random()
 
     def record_script(
         self,
@@ -240,6 +346,11 @@ class TerminalRecorder:
             # Parent process
             os.close(self._slave_fd)
 
+            # Non-blocking reads let _read_output drain bursts without
+            # a select() per chunk
+            flags = fcntl.fcntl(self._master_fd, fcntl.F_GETFL)
+            fcntl.fcntl(self._master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
     def _stop_shell(self) -> None:
         """Stop the shell session."""
         if self._child_pid:
@@ -260,29 +371,68 @@ class TerminalRecorder:
     def _send_input(self, text: str) -> None:
         """Send input to the shell."""
         if self._master_fd:
-            os.write(self._master_fd, text.encode())
+            self._write_all(text.encode())
+
+    def _send_input_parts(self, parts: List[bytes]) -> None:
+        """Send several pieces of input to the shell, in one syscall when the PTY has room."""
+        if self._master_fd and parts:
+            try:
+                written = os.writev(self._master_fd, parts)
+            except BlockingIOError:
+                written = 0
+            if written < sum(map(len, parts)):
+                self._write_all(b"".join(parts)[written:])
+
+    def _write_all(self, data: bytes) -> None:
+        """
+        Write all of data to the PTY.
+
+        The master fd is non-blocking, so a full input buffer gives short
+        writes or BlockingIOError; wait for it to drain and carry on.
+
+        Raises:
+            TimeoutError: If the shell stops reading input
+        """
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self._master_fd, view)
+            except BlockingIOError:
+                _, ready, _ = select.select([], [self._master_fd], [], PTY_WRITE_TIMEOUT)
+                if not ready:
+                    raise TimeoutError(
+                        f"Shell did not read input within {PTY_WRITE_TIMEOUT}s"
+                    ) from None
+                continue
+            view = view[written:]
 
     def _read_output(self, timeout: float = 0.1) -> str:
-        """Read output from the shell."""
+        """
+        Read output from the shell.
+
+        Drains everything already buffered, then waits up to timeout
+        for more; returns once the shell has been quiet that long.
+        """
         if not self._master_fd:
             return ""
 
-        output = []
+        chunks = []
         while True:
-            ready, _, _ = select.select([self._master_fd], [], [], timeout)
-            if not ready:
-                break
-
             try:
-                data = os.read(self._master_fd, 4096)
-                if data:
-                    output.append(data.decode("utf-8", errors="replace"))
-                else:
+                data = os.read(self._master_fd, PTY_READ_SIZE)
+            except BlockingIOError:
+                ready, _, _ = select.select([self._master_fd], [], [], timeout)
+                if not ready:
                     break
+                continue
             except OSError:
                 break
 
-        return "".join(output)
+            if not data:
+                break
+            chunks.append(data)
+
+        return b"".join(chunks).decode("utf-8", errors="replace")
 
     def _execute_action(self, action: TerminalAction, writer: AsciicastWriter) -> None:
         """Execute a terminal action."""
@@ -325,9 +475,7 @@ class TerminalRecorder:
 
         elif action.action_type == "wait_for":
             # Wait for specific output pattern
-            import re
-
-            pattern = re.compile(action.pattern)
+            pattern = action.get_compiled_pattern()
             timeout = action.delay_after / 1000 if action.delay_after else 30
             start = time.time()
 
@@ -336,6 +484,8 @@ class TerminalRecorder:
                 output = self._read_output(timeout=0.5)
                 if output:
                     writer.write_output(output)
+                    # Search everything read so far, so matches of any length
+                    # across reads are found and ^ keeps its usual meaning
                     accumulated += output
 
                     if pattern.search(accumulated):
@@ -351,65 +501,99 @@ class TerminalRecorder:
 
     def _type_with_simulation(self, text: str, writer: AsciicastWriter) -> None:
         """Type text with realistic human-like simulation."""
-        import random
+        rng = self._rng
+        uniform = rng.uniform
+        rand = rng.random
+        choice = rng.choice
+        # Keystrokes are queued and sent together each time the clock
+        # catches up
+        keystrokes: List[bytes] = []
+        send = keystrokes.append
+        write = writer.write_output_batched
+        sleep = time.sleep
+        speed_min = self.config.typing_speed_min
+        speed_max = self.config.typing_speed_max
+        mistake_probability = self.config.mistake_probability
+        last = len(text) - 1
+
+        # Variable delay between keystrokes, longer after punctuation
+        delays = [
+            uniform(speed_min, speed_max) * _PAUSE_MULTIPLIERS.get(char, 1.0)
+            for char in text
+        ]
+
+        # Keystrokes are stamped on a schedule and the real clock is
+        # caught up every few keystrokes instead of after each one
+        clock = time.time()
+
+        def catch_up() -> None:
+            self._send_input_parts(keystrokes)
+            keystrokes.clear()
+            remaining = clock - time.time()
+            if remaining > 0:
+                sleep(remaining)
 
         for i, char in enumerate(text):
             # Occasionally make a typo and correct it
-            if (
-                random.random() < self.config.mistake_probability
-                and char.isalpha()
-                and i < len(text) - 1
-            ):
+            if rand() < mistake_probability and char.isalpha() and i < last:
                 # Type wrong character
-                wrong_char = random.choice("qwertyuiopasdfghjklzxcvbnm")
-                self._send_input(wrong_char)
-                writer.write_output(wrong_char)
-
-                time.sleep(random.uniform(0.1, 0.3))
+                wrong_char = choice(_TYPO_CHARS)
+                send(wrong_char.encode())
+                write(wrong_char, at=clock)
+                clock += uniform(0.1, 0.3)
 
                 # Backspace
-                self._send_input("\x7f")
-                writer.write_output("\b \b")
-
-                time.sleep(random.uniform(0.05, 0.15))
+                send(b"\x7f")
+                write("\b \b", at=clock)
+                clock += uniform(0.05, 0.15)
 
             # Type actual character
-            self._send_input(char)
-            writer.write_output(char)
-
-            # Variable delay between keystrokes
-            delay = random.uniform(
-                self.config.typing_speed_min,
-                self.config.typing_speed_max,
-            )
+            send(char.encode())
+            write(char, at=clock)
+            clock += delays[i]
 
-            # Longer pause after punctuation
-            if char in ".!?":
-                delay *= 3
-            elif char in ",;:":
-                delay *= 2
-            elif char == " ":
-                delay *= 1.5
+            if (i + 1) % KEYSTROKES_PER_SLEEP == 0:
+                catch_up()
 
-            time.sleep(delay)
+        catch_up()
 
     def _get_cast_duration(self, cast_path: Path) -> float:
         """Get duration from cast file."""
         try:
-            with open(cast_path) as f:
-                lines = f.readlines()
+            last = _read_last_line(cast_path)
 
-            if len(lines) < 2:
+            # Last line has final timestamp; the header is a dict
+            last_event = orjson.loads(last) if ORJSON_AVAILABLE else json.loads(last)
+            if not isinstance(last_event, list):
                 return 0
-
-            # Last line has final timestamp
-            last_event = json.loads(lines[-1])
             return last_event[0]
 
         except Exception:
             return 0
 
 
+def _read_last_line(path: Path, block_size: int = 4096) -> bytes:
+    """
+    Read the last non-empty line of a file by seeking back from the end.
+
+    Args:
+        path: File to read
+        block_size: Bytes read per backward step
+
+    Returns:
+        Last line without its trailing newline
+    """
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        while pos > 0 and b"\n" not in buf.rstrip(b"\n"):
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    return buf.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+
+
 def convert_cast_to_video(
     cast_path: Path,
     output_path: Path,
@@ -514,6 +698,27 @@ def record_terminal_demo(
     )
 
 
+def _load_script_data(script_yaml: str) -> Any:
+    """
+    Load a terminal script, parsing JSON scripts without YAML.
+
+    Falls back to YAML (libyaml's CSafeLoader when available) for
+    anything that is not strict JSON.
+    """
+    if script_yaml.lstrip()[:1] in ("{", "["):
+        try:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(script_yaml)
+            return json.loads(script_yaml)
+        except ValueError:
+            pass  # YAML flow style that is not valid JSON
+
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(script_yaml, Loader=loader)
+
+
 def parse_terminal_script(script_yaml: str) -> List[TerminalScene]:
     """
     Parse a YAML terminal script into scenes.
@@ -524,9 +729,7 @@ def parse_terminal_script(script_yaml: str) -> List[TerminalScene]:
     Returns:
         List of TerminalScene objects
     """
-    import yaml
-
-    data = yaml.safe_load(script_yaml)
+    data = _load_script_data(script_yaml)
     scenes = []
 
     for scene_data in data.get("scenes", []):
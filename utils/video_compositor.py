@@ -4,9 +4,14 @@ Video compositing utilities for merging video and audio.
 Handles combining raw screen recordings with generated narration audio.
 """
 
+import os
 import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import pairwise
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 try:
     from moviepy.editor import VideoFileClip, AudioFileClip, CompositeAudioClip
@@ -14,21 +19,119 @@ try:
 except ImportError:
     MOVIEPY_AVAILABLE = False
 
+# H.264 encoders as (name, preset, extra ffmpeg params). Hardware
+# encoders are tried in order; settings roughly match libx264 at CRF 18.
+HW_ENCODERS = [
+    ("h264_nvenc", "p5", ["-rc", "vbr", "-cq", "19"]),
+    ("h264_qsv", "medium", ["-global_quality", "19"]),
+    ("h264_videotoolbox", "medium", ["-q:v", "65"]),
+]
+SOFTWARE_ENCODER = ("libx264", "veryfast", ["-crf", "18"])
+
+# libx264 stops scaling at about this many threads, so larger hosts
+# encode several chunks in parallel with this many threads each
+THREADS_PER_CHUNK = 8
+
+# Shorter silences between sequential narration clips are dropped
+MIN_SILENCE_GAP = 0.001
+
+# ffmpeg stderr lines kept for the error raised when it fails
+FFMPEG_ERROR_LINES = 50
+
+# Chunk-encoded video whose duration drifts further than this from the
+# recording is discarded and encoded in one pass instead
+CHUNK_DURATION_TOLERANCE = 0.1
+
+
+def _encoder_threads() -> int:
+    """Get the thread count to give the video encoder."""
+    return os.cpu_count() or 4
+
+
+def _run_ffmpeg(cmd: List[str]) -> None:
+    """
+    Run an ffmpeg command, draining its stderr as it goes.
+
+    Only the last FFMPEG_ERROR_LINES lines are kept, so long encodes do
+    not fill the pipe or buffer the whole log.
+
+    Args:
+        cmd: ffmpeg command line
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails; stderr holds the
+            last lines it printed
+    """
+    proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True, errors="replace")
+    tail = deque(proc.stderr, maxlen=FFMPEG_ERROR_LINES)
+    proc.stderr.close()
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr="".join(tail))
+
+
+def _silence_gaps(clips: List[Tuple[float, Optional[float]]]) -> Optional[List[float]]:
+    """
+    Get the silence before each clip when clips play back to back.
+
+    Args:
+        clips: (start, duration) of each clip, sorted by start
+
+    Returns:
+        Seconds of silence before each clip, or None if a duration is
+        unknown or clips overlap
+    """
+    gaps = []
+    position = 0.0
+    for start, duration in clips:
+        if not duration or start < position:
+            return None
+        gaps.append(start - position)
+        position = start + duration
+    return gaps
+
+
+def _chunk_boundaries(scene_timings: List[Dict[str, Any]], chunks: int) -> List[float]:
+    """
+    Pick scene starts that split the video into roughly equal chunks.
+
+    Args:
+        scene_timings: Scene timing data
+        chunks: Number of chunks wanted
+
+    Returns:
+        Sorted cut points in seconds, at most chunks - 1 of them
+    """
+    starts = {float(s["start"]) for s in scene_timings if s["start"] > 0}
+    total = max((s["end"] for s in scene_timings), default=0)
+
+    cuts = set()
+    for i in range(1, chunks):
+        target = total * i / chunks
+        if starts:
+            cuts.add(min(starts, key=lambda t: abs(t - target)))
+    return sorted(cuts)
+
 
 class VideoCompositor:
     """
     Handles compositing video and audio tracks.
 
-    Supports both moviepy (preferred) and ffmpeg CLI (fallback).
+    Uses the ffmpeg CLI by default, which muxes without passing frames
+    through Python; moviepy is available as an opt-in.
     """
 
-    def __init__(self, use_moviepy: bool = True):
+    # Encoder chosen by _detect_encoder, shared by all instances
+    _encoder: Optional[tuple] = None
+
+    def __init__(self, use_moviepy: bool = False):
         """
         Initialize compositor.
 
         Args:
-            use_moviepy: Use moviepy if available (default True)
+            use_moviepy: Use moviepy if available (default False; the
+                FORCE_MOVIEPY env var also enables it)
         """
+        use_moviepy = use_moviepy or bool(os.getenv("FORCE_MOVIEPY"))
         self.use_moviepy = use_moviepy and MOVIEPY_AVAILABLE
 
     def composite(
@@ -90,29 +193,36 @@ class VideoCompositor:
         demo_dir = Path(video_path).parent
 
         # Load and position audio clips
+        timing_by_scene = {s["scene"]: s for s in scene_timings}
+        clips_to_load = []
         audio_elements = []
         for clip_meta in audio_clips:
             scene_id = clip_meta["scene"]
 
             # Find matching scene timing
-            scene_timing = next(
-                (s for s in scene_timings if s["scene"] == scene_id),
-                None
-            )
+            scene_timing = timing_by_scene.get(scene_id)
 
             if scene_timing is None:
                 print(f"Warning: No timing found for scene {scene_id}, skipping audio")
                 continue
 
-            # Load audio and set start time
+            # Queue audio with its start time
             audio_path = demo_dir / clip_meta["path"]
             if not audio_path.exists():
                 print(f"Warning: Audio file not found: {audio_path}, skipping")
                 continue
 
-            audio = AudioFileClip(str(audio_path))
-            audio = audio.set_start(scene_timing["start"])
-            audio_elements.append(audio)
+            clips_to_load.append((audio_path, scene_timing["start"]))
+
+        # Each AudioFileClip probes its file with an ffmpeg subprocess,
+        # so load them concurrently
+        if clips_to_load:
+            workers = min(len(clips_to_load), os.cpu_count() or 4)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                audio_elements = list(executor.map(
+                    lambda pair: AudioFileClip(str(pair[0])).set_start(pair[1]),
+                    clips_to_load,
+                ))
 
         # Create composite audio
         if audio_elements:
@@ -125,13 +235,15 @@ class VideoCompositor:
             final = video
 
         # Export with high quality settings
+        codec, preset, params = self._detect_encoder()
         final.write_videofile(
             output_path,
-            codec="libx264",
+            codec=codec,
             audio_codec="aac",
             audio_bitrate="192k",
-            preset="slow",
-            ffmpeg_params=["-crf", "18"],
+            preset=preset,
+            threads=_encoder_threads(),
+            ffmpeg_params=list(params),
         )
 
         # Cleanup
@@ -143,6 +255,180 @@ class VideoCompositor:
 
         return output_path
 
+    @classmethod
+    def _detect_encoder(cls) -> tuple:
+        """
+        Pick the fastest working H.264 encoder, checking once per process.
+
+        A hardware encoder must be listed by ffmpeg and also encode a
+        short test clip, since builds often include encoders whose
+        hardware is missing.
+
+        Returns:
+            (name, preset, extra ffmpeg params) tuple
+        """
+        if cls._encoder is not None:
+            return cls._encoder
+
+        cls._encoder = SOFTWARE_ENCODER
+        try:
+            listing = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-encoders"],
+                capture_output=True,
+                text=True,
+            ).stdout
+        except Exception:
+            return cls._encoder
+
+        for encoder in HW_ENCODERS:
+            name = encoder[0]
+            if name not in listing:
+                continue
+            try:
+                subprocess.run(
+                    [
+                        "ffmpeg", "-hide_banner", "-v", "error",
+                        "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+                        "-c:v", name,
+                        "-f", "null", "-",
+                    ],
+                    check=True,
+                    capture_output=True,
+                )
+            except Exception:
+                continue
+            cls._encoder = encoder
+            break
+
+        return cls._encoder
+
+    def _encoder_args(self, threads: Optional[int] = None) -> List[str]:
+        """Get ffmpeg video encoding arguments for the detected encoder."""
+        name, preset, params = self._detect_encoder()
+        return [
+            "-c:v", name,
+            "-threads", str(threads or _encoder_threads()),
+            "-preset", preset,
+            *params,
+        ]
+
+    def _probe_video_codec(self, video_path: str) -> Optional[str]:
+        """Get the codec name of the first video stream using ffprobe."""
+        try:
+            result = subprocess.run(
+                [
+                    "ffprobe",
+                    "-v", "error",
+                    "-select_streams", "v:0",
+                    "-show_entries", "stream=codec_name",
+                    "-of", "default=noprint_wrappers=1:nokey=1",
+                    video_path,
+                ],
+                capture_output=True,
+                text=True,
+            )
+            return result.stdout.strip() or None
+        except Exception:
+            return None
+
+    def _probe_duration(self, video_path: str) -> Optional[float]:
+        """Get the container duration in seconds using ffprobe."""
+        try:
+            result = subprocess.run(
+                [
+                    "ffprobe",
+                    "-v", "error",
+                    "-show_entries", "format=duration",
+                    "-of", "default=noprint_wrappers=1:nokey=1",
+                    video_path,
+                ],
+                capture_output=True,
+                text=True,
+            )
+            return float(result.stdout.strip())
+        except Exception:
+            return None
+
+    def _encode_chunks_parallel(
+        self,
+        video_path: str,
+        scene_timings: List[Dict[str, Any]],
+        work_dir: Path,
+    ) -> Optional[str]:
+        """
+        Encode the video as chunks split at scene starts, in parallel.
+
+        Each chunk gets its own libx264 process with THREADS_PER_CHUNK
+        threads, and the chunks are joined without re-encoding. Only used
+        with the software encoder on hosts with room for two or more chunks.
+
+        Chunks seek on the output side, so each one decodes from the start
+        and keeps exactly the frames in [start, end); no frame at a cut is
+        duplicated or dropped. The joined video is still checked against
+        the recording's duration and discarded if it drifted.
+
+        Args:
+            video_path: Path to video
+            scene_timings: Scene timing data
+            work_dir: Directory for the chunks and joined video
+
+        Returns:
+            Path to the encoded video (no audio), or None if not chunked
+            or the joined chunks do not match the recording's duration
+        """
+        chunks = _encoder_threads() // THREADS_PER_CHUNK
+        if chunks < 2 or self._detect_encoder()[0] != SOFTWARE_ENCODER[0]:
+            return None
+
+        cuts = _chunk_boundaries(scene_timings, chunks)
+        if not cuts:
+            return None
+
+        bounds = list(zip([0.0, *cuts], [*cuts, None], strict=True))
+        chunk_paths = [work_dir / f"chunk_{i}.mp4" for i in range(len(bounds))]
+
+        def encode(i: int) -> None:
+            start, end = bounds[i]
+            # -ss/-to after -i trim decoded frames rather than seeking
+            # the demuxer, which can only land on keyframes
+            cmd = ["ffmpeg", "-y", "-i", video_path, "-ss", str(start)]
+            if end is not None:
+                cmd.extend(["-to", str(end)])
+            cmd.extend([
+                "-an",
+                *self._encoder_args(THREADS_PER_CHUNK),
+                str(chunk_paths[i]),
+            ])
+            _run_ffmpeg(cmd)
+
+        with ThreadPoolExecutor(max_workers=len(bounds)) as executor:
+            list(executor.map(encode, range(len(bounds))))
+
+        list_path = work_dir / "chunks.txt"
+        list_path.write_text("".join(
+            "file '{}'\n".format(str(p).replace("'", "'\\''")) for p in chunk_paths
+        ))
+        joined_path = work_dir / "video.mp4"
+        _run_ffmpeg([
+            "ffmpeg", "-y",
+            "-f", "concat", "-safe", "0",
+            "-i", str(list_path),
+            "-c", "copy",
+            str(joined_path),
+        ])
+
+        expected = self._probe_duration(video_path)
+        actual = self._probe_duration(str(joined_path))
+        if expected is not None and (
+            actual is None or abs(actual - expected) > CHUNK_DURATION_TOLERANCE
+        ):
+            print(
+                f"Warning: Chunked encode lasts {actual}s, expected {expected}s; "
+                "encoding in one pass"
+            )
+            return None
+        return str(joined_path)
+
     def _composite_ffmpeg(
         self,
         video_path: str,
@@ -167,53 +453,100 @@ class VideoCompositor:
         # Build ffmpeg command
         cmd = ["ffmpeg", "-i", video_path]
 
-        # Add audio inputs
+        # Find audio inputs and their scene starts, in playback order
+        timing_by_scene = {s["scene"]: s for s in scene_timings}
         audio_inputs = []
         for clip_meta in audio_clips:
             audio_path = demo_dir / clip_meta["path"]
-            if audio_path.exists():
-                cmd.extend(["-i", str(audio_path)])
-                audio_inputs.append(clip_meta)
+            scene_timing = timing_by_scene.get(clip_meta["scene"])
+            if scene_timing and audio_path.exists():
+                audio_inputs.append(
+                    (audio_path, scene_timing["start"], clip_meta.get("duration"))
+                )
+        audio_inputs.sort(key=lambda a: a[1])
+
+        # Clips that never overlap (by their metadata durations) can be
+        # joined end to end rather than mixed
+        gaps = None
+        if len(audio_inputs) > 1:
+            gaps = _silence_gaps([(start, duration) for _, start, duration in audio_inputs])
+
+        for audio_path, start, _ in audio_inputs:
+            if gaps is None:
+                # Shift the clip to its scene start at the demuxer
+                cmd.extend(["-itsoffset", f"{start}"])
+            cmd.extend(["-i", str(audio_path)])
 
         if not audio_inputs:
             # No audio, just copy video
             cmd.extend(["-c", "copy", output_path])
-            subprocess.run(cmd, check=True)
+            _run_ffmpeg(cmd)
             return output_path
 
-        # Build filter_complex for audio delays and mixing
-        filter_parts = []
-        for i, clip_meta in enumerate(audio_inputs):
-            scene_id = clip_meta["scene"]
-            scene_timing = next(
-                (s for s in scene_timings if s["scene"] == scene_id),
-                None
-            )
-
-            if scene_timing:
-                # Delay in milliseconds
-                delay_ms = int(scene_timing["start"] * 1000)
-                filter_parts.append(f"[{i+1}:a]adelay={delay_ms}[a{i+1}]")
-
-        # Mix all audio tracks
-        audio_refs = "".join(f"[a{i+1}]" for i in range(len(audio_inputs)))
-        filter_parts.append(f"{audio_refs}amix={len(audio_inputs)}[a]")
-
-        filter_complex = ";".join(filter_parts)
-
-        cmd.extend([
-            "-filter_complex", filter_complex,
-            "-map", "0:v",
-            "-map", "[a]",
-            "-c:v", "libx264",
-            "-crf", "18",
-            "-preset", "slow",
-            "-c:a", "aac",
-            "-b:a", "192k",
-            output_path,
-        ])
-
-        subprocess.run(cmd, check=True)
+        # Pad the leading timestamp gap from -itsoffset with silence,
+        # since amix and the muxer go by sample order
+        pad = "aresample=async=1:first_pts=0"
+        if len(audio_inputs) == 1:
+            # A single track needs no mix
+            filter_complex = f"[1:a]{pad}[a]"
+        elif gaps is not None:
+            filter_parts = []
+            segments = []
+            if gaps[0] >= MIN_SILENCE_GAP:
+                filter_parts.append(f"anullsrc=d={gaps[0]:.6f}[lead]")
+                segments.append("[lead]")
+
+            # Pad or cut each clip to end exactly at the next scene start,
+            # so every clip keeps its absolute start even when a metadata
+            # duration differs from the decoded length
+            starts = [start for _, start, _ in audio_inputs]
+            for i, (start, next_start) in enumerate(pairwise(starts)):
+                slot = next_start - start
+                filter_parts.append(
+                    f"[{i+1}:a]apad=whole_dur={slot:.6f},atrim=end={slot:.6f}[c{i+1}]"
+                )
+                segments.append(f"[c{i+1}]")
+            segments.append(f"[{len(starts)}:a]")
+
+            filter_parts.append(f"{''.join(segments)}concat=n={len(segments)}:v=0:a=1[a]")
+            filter_complex = ";".join(filter_parts)
+        else:
+            filter_parts = [
+                f"[{i+1}:a]{pad}[a{i+1}]" for i in range(len(audio_inputs))
+            ]
+
+            # Mix all audio tracks
+            audio_refs = "".join([f"[a{i}]" for i in range(1, len(audio_inputs) + 1)])
+            filter_parts.append(f"{audio_refs}amix=inputs={len(audio_inputs)}[a]")
+            filter_complex = ";".join(filter_parts)
+
+        with tempfile.TemporaryDirectory(dir=demo_dir) as work_dir:
+            # The filter graph only touches audio, so H.264 video can be
+            # copied through instead of re-encoded
+            if self._probe_video_codec(video_path) == "h264":
+                video_args = ["-c:v", "copy"]
+            else:
+                encoded = self._encode_chunks_parallel(
+                    video_path, scene_timings, Path(work_dir)
+                )
+                if encoded:
+                    # Mux the chunk-encoded video in place of the recording
+                    cmd[2] = encoded
+                    video_args = ["-c:v", "copy"]
+                else:
+                    video_args = self._encoder_args()
+
+            cmd.extend([
+                "-filter_complex", filter_complex,
+                "-map", "0:v",
+                "-map", "[a]",
+                *video_args,
+                "-c:a", "aac",
+                "-b:a", "192k",
+                output_path,
+            ])
+
+            _run_ffmpeg(cmd)
 
         return output_path
 
@@ -223,7 +556,7 @@ def composite_demo_video(
     audio_clips: List[Dict[str, Any]],
     scene_timings: List[Dict[str, Any]],
     output_path: str,
-    use_moviepy: bool = True,
+    use_moviepy: bool = False,
 ) -> str:
     """
     Convenience function to composite a demo video.
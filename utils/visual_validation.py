@@ -5,18 +5,133 @@ Validates that page states match expected descriptions using
 multimodal LLM capabilities.
 """
 
-import base64
+import asyncio
+import functools
+import io
 import json
 import logging
+import mmap
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import requests
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+MEDIA_TYPES: Mapping[str, str] = MappingProxyType({
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+})
+
+# The vision model downsamples anything larger than this on its long edge
+MAX_IMAGE_EDGE = 1568
+
+# Images within MAX_IMAGE_EDGE and under this size are sent unchanged
+MAX_PASSTHROUGH_BYTES = 1024 * 1024
+
+JPEG_QUALITY = 85
+
+# Beta header for uploading images once and referencing them by file_id
+FILES_API_BETA = "files-api-2025-04-14"
+
+# Concurrent API calls in a batch; matches the session's connection pool
+MAX_CONCURRENT_VALIDATIONS = 10
+
+
+def _loads(data: Any) -> Any:
+    """Parse JSON text or bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _prepare_image(path: Path) -> Tuple[str, str]:
+    """
+    Get an image's base64 data and media type, shrunk for the API.
+
+    Results are cached by path, mtime and size, so re-validating the
+    same screenshot does not re-encode it.
+
+    Args:
+        path: Image file
+
+    Returns:
+        Tuple of (base64 data, media type)
+    """
+    st = path.stat()
+    return _prepare_image_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=64)
+def _prepare_image_cached(path: str, mtime_ns: int, size: int) -> Tuple[str, str]:
+    """Read, shrink and encode an image; see _prepare_image."""
+    media_type = MEDIA_TYPES.get(Path(path).suffix.lower(), "image/png")
+    if not size:
+        # mmap cannot map an empty file
+        return "", media_type
+
+    # Encode straight from the page cache rather than a bytes copy
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm
+        if PIL_AVAILABLE and media_type != "image/gif":
+            try:
+                data, media_type = _shrink_image(mm, media_type)
+            except Exception as e:
+                logger.debug(f"Could not shrink {path}, sending as is: {e}")
+
+        return base64.b64encode(data).decode("ascii"), media_type
+
+
+def _shrink_image(data: mmap.mmap, media_type: str) -> Tuple[Any, str]:
+    """
+    Downscale an image to MAX_IMAGE_EDGE and re-encode it compactly.
+
+    Opaque images become JPEG; images with transparency stay PNG.
+
+    Args:
+        data: Memory-mapped image file
+        media_type: Media type of data
+
+    Returns:
+        Tuple of (image bytes or data unchanged, media type)
+    """
+    with Image.open(data) as img:
+        if max(img.size) <= MAX_IMAGE_EDGE and len(data) <= MAX_PASSTHROUGH_BYTES:
+            return data, media_type
+
+        img.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+        out = io.BytesIO()
+        if "A" in img.getbands() or "transparency" in img.info:
+            img.save(out, format="PNG", optimize=True)
+            return out.getvalue(), "image/png"
+
+        img.convert("RGB").save(out, format="JPEG", quality=JPEG_QUALITY)
+        return out.getvalue(), "image/jpeg"
+
 
 @dataclass
 class ValidationResult:
@@ -46,15 +161,32 @@ class VisualValidator:
     and verify they match expected states.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, use_files_api: bool = False):
         """
         Initialize visual validator.
 
         Args:
             api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
+            use_files_api: Upload screenshots through the Files API and
+                reference them by file_id instead of sending base64
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         self.base_url = "https://api.anthropic.com/v1"
+        self.use_files_api = use_files_api
+
+        # Uploaded file ids by (path, mtime_ns, size)
+        self._file_ids: Dict[Tuple[str, int, int], str] = {}
+
+        # One session for all calls so keep-alive reuses the TLS connection
+        self._session = requests.Session()
+        self._session.headers.update({
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        })
+        if self.api_key:
+            self._session.headers["x-api-key"] = self.api_key
+        if use_files_api:
+            self._session.headers["anthropic-beta"] = FILES_API_BETA
 
     def validate_screenshot(
         self,
@@ -94,14 +226,12 @@ class VisualValidator:
                 screenshot_path=screenshot_path,
             )
 
-        image_data = base64.b64encode(screenshot_path.read_bytes()).decode("utf-8")
-        media_type = self._get_media_type(screenshot_path)
-
         # Build prompt
         prompt = self._build_validation_prompt(expected_state, context)
 
         try:
-            response = self._call_vision_api(image_data, media_type, prompt)
+            source = self._image_source(screenshot_path)
+            response = self._call_vision_api(source, prompt)
             return self._parse_validation_response(response, screenshot_path)
         except Exception as e:
             logger.exception("Visual validation failed")
@@ -155,16 +285,16 @@ class VisualValidator:
                 screenshot_path=after_path,
             )
 
-        before_data = base64.b64encode(before_path.read_bytes()).decode("utf-8")
-        after_data = base64.b64encode(after_path.read_bytes()).decode("utf-8")
-        media_type = self._get_media_type(after_path)
-
         prompt = self._build_comparison_prompt(action_description, expected_change)
 
         try:
-            response = self._call_comparison_api(
-                before_data, after_data, media_type, prompt
-            )
+            # Prepare both screenshots at once; encoding and uploads release the GIL
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                before_source, after_source = executor.map(
+                    self._image_source, [before_path, after_path]
+                )
+
+            response = self._call_comparison_api(before_source, after_source, prompt)
             return self._parse_validation_response(response, after_path)
         except Exception as e:
             logger.exception("Visual comparison failed")
@@ -176,6 +306,39 @@ class VisualValidator:
                 screenshot_path=after_path,
             )
 
+    def validate_batch(self, jobs: List[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Validate many screenshots concurrently.
+
+        Args:
+            jobs: Keyword arguments for validate_screenshot, one dict per screenshot
+
+        Returns:
+            ValidationResults in the same order as jobs
+        """
+        return asyncio.run(self.validate_batch_async(jobs))
+
+    async def validate_batch_async(
+        self,
+        jobs: List[Dict[str, Any]],
+    ) -> List[ValidationResult]:
+        """
+        Validate many screenshots concurrently.
+
+        Args:
+            jobs: Keyword arguments for validate_screenshot, one dict per screenshot
+
+        Returns:
+            ValidationResults in the same order as jobs
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_VALIDATIONS)
+
+        async def run(job: Dict[str, Any]) -> ValidationResult:
+            async with semaphore:
+                return await asyncio.to_thread(self.validate_screenshot, **job)
+
+        return list(await asyncio.gather(*(run(job) for job in jobs)))
+
     def _build_validation_prompt(
         self,
         expected_state: str,
@@ -221,20 +384,59 @@ Respond with a JSON object containing:
 
 Only respond with the JSON object, no other text."""
 
+    def _image_source(self, path: Path) -> Dict[str, Any]:
+        """
+        Build the image source block for a screenshot.
+
+        Args:
+            path: Screenshot path
+
+        Returns:
+            A file reference when using the Files API, else inline base64
+        """
+        if self.use_files_api:
+            return {"type": "file", "file_id": self._upload_image(path)}
+
+        image_data, media_type = _prepare_image(path)
+        return {"type": "base64", "media_type": media_type, "data": image_data}
+
+    def _upload_image(self, path: Path) -> str:
+        """
+        Upload a screenshot through the Files API, once per file version.
+
+        The raw bytes are streamed as multipart, skipping base64 entirely.
+
+        Args:
+            path: Screenshot path
+
+        Returns:
+            Uploaded file id
+        """
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        file_id = self._file_ids.get(key)
+        if file_id is None:
+            with open(path, "rb") as f:
+                response = self._session.post(
+                    f"{self.base_url}/files",
+                    # Drop the session's JSON content type so requests
+                    # sets the multipart boundary
+                    headers={"content-type": None},
+                    files={"file": (path.name, f, self._get_media_type(path))},
+                    timeout=60,
+                )
+            response.raise_for_status()
+            file_id = self._file_ids[key] = response.json()["id"]
+        return file_id
+
     def _call_vision_api(
         self,
-        image_data: str,
-        media_type: str,
+        source: Dict[str, Any],
         prompt: str,
     ) -> str:
         """Call the vision API with a single image."""
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/messages",
-            headers={
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json",
-            },
             json={
                 "model": "claude-sonnet-4-20250514",
                 "max_tokens": 1024,
@@ -242,14 +444,7 @@ Only respond with the JSON object, no other text."""
                     {
                         "role": "user",
                         "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": image_data,
-                                },
-                            },
+                            {"type": "image", "source": source},
                             {
                                 "type": "text",
                                 "text": prompt,
@@ -265,19 +460,13 @@ Only respond with the JSON object, no other text."""
 
     def _call_comparison_api(
         self,
-        before_data: str,
-        after_data: str,
-        media_type: str,
+        before_source: Dict[str, Any],
+        after_source: Dict[str, Any],
         prompt: str,
     ) -> str:
         """Call the vision API with two images."""
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/messages",
-            headers={
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json",
-            },
             json={
                 "model": "claude-sonnet-4-20250514",
                 "max_tokens": 1024,
@@ -285,22 +474,8 @@ Only respond with the JSON object, no other text."""
                     {
                         "role": "user",
                         "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": before_data,
-                                },
-                            },
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": after_data,
-                                },
-                            },
+                            {"type": "image", "source": before_source},
+                            {"type": "image", "source": after_source},
                             {
                                 "type": "text",
                                 "text": prompt,
@@ -322,7 +497,7 @@ Only respond with the JSON object, no other text."""
         """Parse the LLM response into a ValidationResult."""
         try:
             # Try to parse as JSON
-            data = json.loads(response)
+            data = _loads(response)
             return ValidationResult(
                 passed=data.get("passed", False),
                 confidence=float(data.get("confidence", 0.5)),
@@ -343,14 +518,7 @@ Only respond with the JSON object, no other text."""
 
     def _get_media_type(self, path: Path) -> str:
         """Get MIME type for an image file."""
-        suffix = path.suffix.lower()
-        return {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }.get(suffix, "image/png")
+        return MEDIA_TYPES.get(path.suffix.lower(), "image/png")
 
 
 def validate_page_state(